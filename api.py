@@ -25,10 +25,23 @@ import uvicorn
     type=int,
     default=1,
 )
-def main(env: str, host: str, port: int, workers: int) -> None:
+@click.option(
+    "--preload/--no-preload",
+    default=False,
+    help="Load the NLP models once in a master process before forking the workers, "
+    "so the model memory is shared copy-on-write. Disables auto-reload.",
+)
+def main(env: str, host: str, port: int, workers: int, preload: bool) -> None:
     print(f"Serving on {host}:{port} with {workers} workers in {env} mode.")
     # set environment variable with SERVER_MODE
     environ["UVICORN_SERVER_MODE"] = env
+    log_level = "warning" if env == "production" else "info"
+
+    if preload:
+        from src.api.prefork import serve_preforked
+
+        serve_preforked(host=host, port=port, workers=workers, log_level=log_level)
+        return
 
     uvicorn.run(
         app="src.api.main:app",
@@ -36,7 +49,7 @@ def main(env: str, host: str, port: int, workers: int) -> None:
         port=port,
         reload=True if env != "production" else False,
         workers=workers,
-        log_level="warning" if env == "production" else "info",
+        log_level=log_level,
         loop="asyncio",
     )
 
@@ -0,0 +1,189 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import click
+
+if TYPE_CHECKING:
+    from src.api.services.batch import (
+        BatchOptions,
+        BatchResult,
+        BatchSummary,
+        StreamSummary,
+    )
+
+
+@click.group()
+def cli() -> None:
+    """Offline tools for OpenAnonymiser (no HTTP server needed)."""
+
+
+@cli.command()
+@click.argument(
+    "input_dir", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.argument("output_dir", type=click.Path(file_okay=False, path_type=Path))
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Worker processes; each loads the models once. 0 runs in this process.",
+)
+@click.option(
+    "--nlp-engine", type=str, default=None, help="Defaults to DEFAULT_NLP_ENGINE."
+)
+@click.option(
+    "--entities",
+    type=str,
+    default=None,
+    help="Comma-separated entity types to anonymize. "
+    "Defaults to SUPPORTED_PII_ENTITIES_TO_ANONYMIZE.",
+)
+@click.option(
+    "--strategy",
+    type=click.Choice(["replace", "mask", "redact", "hash"]),
+    default="replace",
+    show_default=True,
+    help="Anonymization strategy for text files.",
+)
+@click.option(
+    "--retry-failed/--no-retry-failed",
+    default=False,
+    help="Also retry files that failed in an earlier run.",
+)
+def batch(
+    input_dir: Path,
+    output_dir: Path,
+    workers: int,
+    nlp_engine: Optional[str],
+    entities: Optional[str],
+    strategy: str,
+    retry_failed: bool,
+) -> None:
+    """Anonymize all PDF and .txt files in INPUT_DIR into OUTPUT_DIR.
+
+    Progress is recorded in OUTPUT_DIR/manifest.jsonl; running the same command
+    again resumes where the previous run stopped.
+    """
+    from src.api.services.batch import run_batch
+
+    options = _batch_options(nlp_engine, entities, strategy)
+
+    def progress(result: "BatchResult", summary: "BatchSummary") -> None:
+        status = "ok" if result.status == "ok" else f"FAILED: {result.error}"
+        click.echo(
+            f"[{summary.processed + summary.failed}] {result.path} "
+            f"({result.pages} pages, {result.seconds:.2f}s) {status}",
+            err=True,
+        )
+
+    summary = run_batch(
+        input_dir,
+        output_dir,
+        options,
+        workers=workers,
+        retry_failed=retry_failed,
+        progress=progress,
+    )
+    click.echo(
+        f"Processed {summary.processed} files ({summary.pages} pages) in "
+        f"{summary.seconds:.1f}s: {summary.docs_per_second:.2f} docs/sec, "
+        f"{summary.pages_per_second:.2f} pages/sec. "
+        f"Failed: {summary.failed}, skipped (already done): {summary.skipped}."
+    )
+    if summary.failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.option(
+    "--workers",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Worker processes; each loads the models once. 0 runs in this process.",
+)
+@click.option(
+    "--batch-size",
+    type=int,
+    default=64,
+    show_default=True,
+    help="Records per nlp.pipe batch.",
+)
+@click.option(
+    "--nlp-engine", type=str, default=None, help="Defaults to DEFAULT_NLP_ENGINE."
+)
+@click.option(
+    "--entities",
+    type=str,
+    default=None,
+    help="Comma-separated entity types to anonymize. "
+    "Defaults to SUPPORTED_PII_ENTITIES_TO_ANONYMIZE.",
+)
+@click.option(
+    "--strategy",
+    type=click.Choice(["replace", "mask", "redact", "hash"]),
+    default="replace",
+    show_default=True,
+)
+def stream(
+    workers: int,
+    batch_size: int,
+    nlp_engine: Optional[str],
+    entities: Optional[str],
+    strategy: str,
+) -> None:
+    """Anonymize JSON Lines ({"id": .., "text": ..}) from stdin to stdout.
+
+    Output lines are written in input order, one per input record. Throughput is
+    reported on stderr.
+    """
+    import sys
+    import time
+
+    from src.api.services.batch import stream_jsonl
+
+    options = _batch_options(nlp_engine, entities, strategy)
+    last_report = time.monotonic()
+
+    def progress(summary: "StreamSummary") -> None:
+        nonlocal last_report
+        if time.monotonic() - last_report >= 5:
+            last_report = time.monotonic()
+            click.echo(
+                f"{summary.records} records, "
+                f"{summary.records_per_second:.1f} records/sec",
+                err=True,
+            )
+
+    summary = stream_jsonl(
+        sys.stdin,
+        sys.stdout,
+        options,
+        batch_size=batch_size,
+        workers=workers,
+        progress=progress,
+    )
+    click.echo(
+        f"Processed {summary.records} records ({summary.chars} chars) in "
+        f"{summary.seconds:.1f}s: {summary.records_per_second:.1f} records/sec. "
+        f"Failed: {summary.failed}.",
+        err=True,
+    )
+
+
+def _batch_options(
+    nlp_engine: Optional[str], entities: Optional[str], strategy: str
+) -> "BatchOptions":
+    from src.api.services.batch import BatchOptions
+
+    options = BatchOptions(strategy=strategy)
+    if nlp_engine:
+        options.nlp_engine = nlp_engine.lower()
+    if entities:
+        options.entities = [e.strip() for e in entities.split(",") if e.strip()]
+    return options
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark the cascade NER engine against plain spaCy and transformers.
+
+Runs the same documents through ``spacy``, ``cascade`` and ``transformers`` and
+reports per-document latency, the fraction of the text the cascade escalated to
+the transformer model, and entity-level precision/recall/F1. Without ``--gold``
+the transformers output is the reference, so the cascade recall shows how close
+it gets to the transformer model.
+
+Examples:
+    python scripts/benchmark_cascade.py
+    python scripts/benchmark_cascade.py --gold annotated.jsonl --json-out cascade.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_onnx_ner import _load_gold, f1_score, run_engine  # noqa: E402
+
+from src.api.config import settings  # noqa: E402
+from src.api.utils.metrics import metrics  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--model", default=settings.DEFAULT_TRANSFORMERS_MODEL)
+    parser.add_argument("--gold", help="JSONL file with annotated documents")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json-out", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    texts, gold = _load_gold(args.gold)
+    results = []
+    for engine in ("spacy", "cascade", "transformers"):
+        model = settings.DEFAULT_SPACY_MODEL if engine == "spacy" else args.model
+        metrics.reset()
+        result = run_engine(engine, model, texts, args.repeat)
+        if engine == "cascade":
+            counters = metrics.snapshot()["counters"]
+            total = counters.get("cascade_chars_total", 0)
+            escalated = counters.get("cascade_escalated_chars_total", 0)
+            result["escalated_fraction"] = round(escalated / total, 3) if total else 0
+        results.append(result)
+
+    reference = gold if gold is not None else results[-1]["outputs"]
+    for result in results:
+        result.update(f1_score(result.pop("outputs"), reference))
+
+    print(f"Reference: {'gold' if gold else 'transformers'}")
+    header = (
+        f"{'engine':<13} {'mean ms':>8} {'p95 ms':>7} {'escalated':>9} "
+        f"{'prec':>6} {'recall':>6} {'F1':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        escalated = r.get("escalated_fraction", "-")
+        print(
+            f"{r['engine']:<13} {r['mean_ms']:>8} {r['p95_ms']:>7} {escalated:>9} "
+            f"{r['precision']:>6} {r['recall']:>6} {r['f1']:>6}"
+        )
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
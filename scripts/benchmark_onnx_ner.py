@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+r"""Benchmark the ONNX Runtime NER backend against the PyTorch transformers engine.
+
+Loads ``TransformersEngine`` (PyTorch) and ``OnnxTransformersEngine`` (ONNX
+Runtime, int8 by default) for the same model and reports load time, per-document
+latency and entity-level F1 (exact start/end/type match).
+
+With ``--gold`` the F1 is computed against annotated documents, a JSONL file with
+one ``{"text": ..., "entities": [{"start": 0, "end": 3, "entity_type": "PER"}]}``
+per line. Without it the PyTorch output is the reference, so the ONNX F1 shows
+how much the quantized model deviates.
+
+Examples:
+    python scripts/benchmark_onnx_ner.py
+    python scripts/benchmark_onnx_ner.py --model pdelobelle/robbert-v2-dutch-base \
+        --gold annotated.jsonl --repeat 3 --json-out onnx.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.api.config import settings  # noqa: E402
+
+DEFAULT_TEXTS = [
+    (
+        "Op 12 januari 2024 bezocht Jan Jansen het kantoor op Kerkstraat 10, "
+        "1234 AB Amsterdam."
+    ),
+    "Mevrouw Fatima el Amrani werkt bij de gemeente Utrecht en woont in Nieuwegein.",
+    (
+        "Het college van burgemeester en wethouders van Rotterdam heeft het "
+        "verzoek van Pieter de Vries afgewezen."
+    ),
+    (
+        "In de bijlage vindt u de brief van advocatenkantoor Van Dijk & Partners "
+        "namens de heer K. Bakker uit Groningen."
+    ),
+]
+
+Span = tuple[int, int, str]
+
+
+def _spans(entities: list[dict]) -> set[Span]:
+    return {(e["start"], e["end"], e["entity_type"]) for e in entities}
+
+
+def f1_score(predicted: list[set[Span]], reference: list[set[Span]]) -> dict:
+    """Micro-gemiddelde precision/recall/F1 over alle documenten."""
+    tp = sum(len(p & r) for p, r in zip(predicted, reference))
+    n_pred = sum(len(p) for p in predicted)
+    n_ref = sum(len(r) for r in reference)
+    precision = tp / n_pred if n_pred else 1.0
+    recall = tp / n_ref if n_ref else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+    }
+
+
+def run_engine(engine_type: str, model: str, texts: list[str], repeat: int) -> dict:
+    from src.api.utils.nlp.loader import load_nlp_engine
+
+    start = time.perf_counter()
+    engine = load_nlp_engine({"nlp_engine": engine_type, "model_name": model})
+    load_seconds = time.perf_counter() - start
+
+    engine.analyze(texts[0])  # warmup
+    latencies_ms = []
+    outputs: list[set[Span]] = []
+    for _ in range(repeat):
+        for text in texts:
+            t0 = time.perf_counter()
+            entities = engine.analyze(text)
+            latencies_ms.append((time.perf_counter() - t0) * 1000)
+            if len(outputs) < len(texts):
+                outputs.append(_spans(entities))
+    latencies_ms.sort()
+    return {
+        "engine": engine_type,
+        "load_seconds": round(load_seconds, 2),
+        "mean_ms": round(statistics.mean(latencies_ms), 2),
+        "p95_ms": round(latencies_ms[int(0.95 * (len(latencies_ms) - 1))], 2),
+        "outputs": outputs,
+    }
+
+
+def _load_gold(path: Optional[str]) -> tuple[list[str], Optional[list[set[Span]]]]:
+    if not path:
+        return DEFAULT_TEXTS, None
+    texts, gold = [], []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            doc = json.loads(line)
+            texts.append(doc["text"])
+            gold.append(_spans(doc["entities"]))
+    return texts, gold
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--model", default=settings.DEFAULT_TRANSFORMERS_MODEL)
+    parser.add_argument("--gold", help="JSONL file with annotated documents")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json-out", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    texts, gold = _load_gold(args.gold)
+    results = [
+        run_engine(engine, args.model, texts, args.repeat)
+        for engine in ("transformers", "onnx")
+    ]
+    reference = gold if gold is not None else results[0]["outputs"]
+    for result in results:
+        result.update(f1_score(result.pop("outputs"), reference))
+
+    print(f"Model: {args.model}  (reference: {'gold' if gold else 'transformers'})")
+    header = (
+        f"{'engine':<13} {'load s':>7} {'mean ms':>8} {'p95 ms':>7} "
+        f"{'prec':>6} {'recall':>6} {'F1':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['engine']:<13} {r['load_seconds']:>7} {r['mean_ms']:>8} "
+            f"{r['p95_ms']:>7} {r['precision']:>6} {r['recall']:>6} {r['f1']:>6}"
+        )
+    speedup = (
+        results[0]["mean_ms"] / results[1]["mean_ms"] if results[1]["mean_ms"] else 0
+    )
+    print(f"ONNX speedup: {speedup:.1f}x")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+r"""Benchmark spaCy pipeline profiles for PII detection.
+
+Loads each model with each component profile (see ``SPACY_PIPELINE_PROFILE``)
+in a fresh subprocess and reports load time, resident memory added by the model,
+per-document latency and whether the entities are identical to the full
+pipeline. The NER engine only reads ``doc.ents``, so a trimmed profile should
+give the same entities at lower cost.
+
+Examples:
+    python scripts/benchmark_spacy_profiles.py
+    python scripts/benchmark_spacy_profiles.py --models nl_core_news_lg \
+        --profiles full,ner-only --texts-file corpus.txt --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DEFAULT_MODELS = "nl_core_news_md,nl_core_news_lg"
+DEFAULT_PROFILES = "full,ner+lemma,ner-only"
+DEFAULT_TEXTS = [
+    "Op 12 januari 2024 bezocht Jan Jansen het kantoor op Kerkstraat 10, "
+    "1234 AB Amsterdam. Zijn telefoon is 06-12345678.",
+    "Mevrouw Fatima el Amrani werkt bij de gemeente Utrecht en woont in "
+    "Nieuwegein. Zij is te bereiken via f.elamrani@example.nl.",
+    "Het college van burgemeester en wethouders van Rotterdam heeft op "
+    "3 maart besloten het verzoek van Pieter de Vries af te wijzen.",
+    "In de bijlage vindt u de brief van advocatenkantoor Van Dijk & Partners "
+    "namens de heer K. Bakker uit Groningen.",
+]
+
+
+def _rss_bytes() -> int:
+    from src.api.utils.memory import current_rss_bytes
+
+    return current_rss_bytes()
+
+
+def run_profile(model: str, profile: str, texts: list[str], repeat: int) -> dict:
+    """Meet één (model, profiel)-combinatie; draait in een eigen proces."""
+    import spacy  # noqa: F401  (import niet meetellen in de laadtijd/het geheugen)
+
+    from src.api.utils.nlp.spacy_engine import load_spacy_pipeline
+
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    nlp = load_spacy_pipeline(model, profile)
+    load_seconds = time.perf_counter() - start
+    model_rss = _rss_bytes() - rss_before
+
+    nlp(texts[0])  # warmup
+    latencies_ms = []
+    entities = []
+    for _ in range(repeat):
+        for text in texts:
+            t0 = time.perf_counter()
+            doc = nlp(text)
+            latencies_ms.append((time.perf_counter() - t0) * 1000)
+            if len(entities) < len(texts):
+                entities.append(
+                    [(e.start_char, e.end_char, e.label_) for e in doc.ents]
+                )
+
+    latencies_ms.sort()
+    return {
+        "model": model,
+        "profile": profile,
+        "components": nlp.pipe_names,
+        "load_seconds": round(load_seconds, 2),
+        "model_rss_mb": round(model_rss / 1024 / 1024, 1),
+        "mean_ms": round(statistics.mean(latencies_ms), 2),
+        "p95_ms": round(latencies_ms[int(0.95 * (len(latencies_ms) - 1))], 2),
+        "peak_rss_mb": round(_rss_bytes() / 1024 / 1024, 1),
+        "entities": entities,
+    }
+
+
+def _run_in_subprocess(model: str, profile: str, args: argparse.Namespace) -> dict:
+    cmd = [
+        sys.executable,
+        __file__,
+        "--worker",
+        "--models",
+        model,
+        "--profiles",
+        profile,
+        "--repeat",
+        str(args.repeat),
+    ]
+    if args.texts_file:
+        cmd += ["--texts-file", args.texts_file]
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    proc = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        return {"model": model, "profile": profile, "error": proc.stderr.strip()}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _load_texts(path: str | None) -> list[str]:
+    if not path:
+        return DEFAULT_TEXTS
+    content = Path(path).read_text(encoding="utf-8")
+    return [p.strip() for p in content.split("\n\n") if p.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--models", default=DEFAULT_MODELS)
+    parser.add_argument("--profiles", default=DEFAULT_PROFILES)
+    parser.add_argument(
+        "--texts-file", help="Text file with documents separated by blank lines"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json-out", help="Write the results as JSON to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    texts = _load_texts(args.texts_file)
+    if args.worker:
+        print(json.dumps(run_profile(args.models, args.profiles, texts, args.repeat)))
+        return 0
+
+    results = []
+    for model in args.models.split(","):
+        baseline = None
+        for profile in args.profiles.split(","):
+            result = _run_in_subprocess(model, profile, args)
+            if "error" not in result:
+                if profile == "full":
+                    baseline = result["entities"]
+                result["same_entities_as_full"] = (
+                    None if baseline is None else result["entities"] == baseline
+                )
+            results.append(result)
+
+    header = (
+        f"{'model':<18} {'profile':<10} {'load s':>7} {'model MB':>9} "
+        f"{'mean ms':>8} {'p95 ms':>7} {'same ents':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['model']:<18} {r['profile']:<10} ERROR: {r['error'][-200:]}")
+            continue
+        print(
+            f"{r['model']:<18} {r['profile']:<10} {r['load_seconds']:>7} "
+            f"{r['model_rss_mb']:>9} {r['mean_ms']:>8} {r['p95_ms']:>7} "
+            f"{str(r['same_entities_as_full']):>9}"
+        )
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""HTTP load generator for OpenAnonymiser.
+
+Drives the text and document endpoints of a (locally started) API with a
+configurable concurrency and request mix, and reports throughput, tail latency,
+error rates and the resident memory of the server process over time. Used to
+size replicas (CPU/memory requests in ``charts/openanonymiser/values.yaml``).
+
+Examples:
+    # API already running on localhost:8080, server pid known
+    python scripts/load_test.py --concurrency 8 --duration 60 --server-pid 12345
+
+    # Start the API ourselves, mostly text with some document traffic
+    python scripts/load_test.py --spawn-server --workers 2 \
+        --mix analyze=6,anonymize=3,upload=1,document_anonymize=1,download=1
+
+Operations in ``--mix``:
+    analyze             POST /api/v1/analyze
+    anonymize           POST /api/v1/anonymize
+    upload              POST /api/v1/documents/upload
+    document_anonymize  POST /api/v1/documents/{id}/anonymize
+    download            GET  /api/v1/documents/{id}/download?keep_on_server=true
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Optional
+
+import httpx
+
+DEFAULT_TEXT = (
+    "Op 12 januari 2024 bezocht Jan Jansen het kantoor op Kerkstraat 10, "
+    "1234 AB Amsterdam. Zijn telefoon is 06-12345678 en e-mail "
+    "jan.jansen@example.com. IBAN NL91 ABNA 0417 1643 00. BSN 123456782."
+)
+DEFAULT_PDF = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "test.pdf"
+DEFAULT_MIX = "analyze=5,anonymize=3,upload=1,document_anonymize=1,download=1"
+OPERATIONS = ("analyze", "anonymize", "upload", "document_anonymize", "download")
+API_PREFIX = "/api/v1"
+
+
+@dataclass
+class OperationStats:
+    """Latency samples and error counts for a single operation."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+    def record(self, latency_ms: float, status_code: Optional[int]) -> None:
+        self.latencies_ms.append(latency_ms)
+        if status_code is None or status_code >= 400:
+            self.errors += 1
+        key = status_code if status_code is not None else 0
+        self.status_codes[key] = self.status_codes.get(key, 0) + 1
+
+
+@dataclass
+class LoadTestState:
+    """Shared state between the worker coroutines."""
+
+    stats: dict[str, OperationStats] = field(
+        default_factory=lambda: {op: OperationStats() for op in OPERATIONS}
+    )
+    # Uploaded document ids, and the subset that has been anonymized.
+    uploaded: list[str] = field(default_factory=list)
+    anonymized: list[str] = field(default_factory=list)
+    rss_samples: list[dict] = field(default_factory=list)
+    max_pool: int = 200
+
+    def remember(self, pool: list[str], file_id: str) -> None:
+        pool.append(file_id)
+        if len(pool) > self.max_pool:
+            pool.pop(0)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of *samples* (0 for an empty list)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    """Parse ``op=weight,op=weight`` into a weight mapping."""
+    weights: dict[str, int] = {}
+    for part in mix.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown operation '{name}'. Supported: {', '.join(OPERATIONS)}"
+            )
+        weights[name] = int(weight or 1)
+    if not weights or sum(weights.values()) <= 0:
+        raise argparse.ArgumentTypeError("Mix must contain at least one weight > 0")
+    return weights
+
+
+def process_tree_rss_kb(pid: int) -> dict[int, int]:
+    """Return the RSS (kB) of *pid* and all of its descendants, read from /proc."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Field 4 (ppid) follows the parenthesised command name.
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    result: dict[int, int] = {}
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        result[current] = int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        stack.extend(children.get(current, []))
+    return result
+
+
+async def sample_rss(
+    state: LoadTestState, pid: int, interval: float, started: float
+) -> None:
+    """Sample the server's process tree RSS every *interval* seconds."""
+    while True:
+        per_process = process_tree_rss_kb(pid)
+        state.rss_samples.append(
+            {
+                "t": round(time.perf_counter() - started, 2),
+                "total_mb": round(sum(per_process.values()) / 1024, 1),
+                "processes": {
+                    str(p): round(kb / 1024, 1) for p, kb in per_process.items()
+                },
+            }
+        )
+        await asyncio.sleep(interval)
+
+
+async def timed(
+    state: LoadTestState, op: str, call: Awaitable[httpx.Response]
+) -> Optional[httpx.Response]:
+    start = time.perf_counter()
+    response: Optional[httpx.Response] = None
+    try:
+        response = await call
+    except httpx.HTTPError:
+        response = None
+    latency_ms = (time.perf_counter() - start) * 1000
+    state.stats[op].record(latency_ms, response.status_code if response else None)
+    return response
+
+
+async def do_upload(
+    client: httpx.AsyncClient, state: LoadTestState, pdf: bytes
+) -> Optional[str]:
+    files = {"files": ("loadtest.pdf", pdf, "application/pdf")}
+    response = await timed(
+        state, "upload", client.post(f"{API_PREFIX}/documents/upload", files=files)
+    )
+    if response is None or response.status_code != 200:
+        return None
+    file_id: str = response.json()["files"][0]["id"]
+    state.remember(state.uploaded, file_id)
+    return file_id
+
+
+async def do_document_anonymize(
+    client: httpx.AsyncClient, state: LoadTestState, file_id: str, entities: list[str]
+) -> None:
+    response = await timed(
+        state,
+        "document_anonymize",
+        client.post(
+            f"{API_PREFIX}/documents/{file_id}/anonymize",
+            json={"pii_entities_to_anonymize": entities},
+        ),
+    )
+    if response is not None and response.status_code == 200:
+        state.remember(state.anonymized, file_id)
+
+
+async def run_operation(
+    op: str,
+    client: httpx.AsyncClient,
+    state: LoadTestState,
+    args: argparse.Namespace,
+    text: str,
+    pdf: bytes,
+) -> None:
+    if op == "analyze":
+        await timed(
+            state,
+            op,
+            client.post(f"{API_PREFIX}/analyze", json={"text": text, "language": "nl"}),
+        )
+    elif op == "anonymize":
+        await timed(
+            state,
+            op,
+            client.post(
+                f"{API_PREFIX}/anonymize", json={"text": text, "language": "nl"}
+            ),
+        )
+    elif op == "upload":
+        await do_upload(client, state, pdf)
+    elif op == "document_anonymize":
+        file_id = random.choice(state.uploaded) if state.uploaded else None
+        if file_id is None:
+            file_id = await do_upload(client, state, pdf)
+        if file_id is not None:
+            await do_document_anonymize(client, state, file_id, args.pdf_entities)
+    elif op == "download":
+        file_id = random.choice(state.anonymized) if state.anonymized else None
+        if file_id is None:
+            # Nothing to download yet: yield so other workers can make progress.
+            await asyncio.sleep(0)
+            return
+        await timed(
+            state,
+            op,
+            client.get(
+                f"{API_PREFIX}/documents/{file_id}/download",
+                params={"keep_on_server": True},
+            ),
+        )
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    state: LoadTestState,
+    args: argparse.Namespace,
+    weights: dict[str, int],
+    deadline: float,
+    remaining: list[int],
+    text: str,
+    pdf: bytes,
+) -> None:
+    ops = list(weights)
+    op_weights = [weights[op] for op in ops]
+    while time.perf_counter() < deadline:
+        if args.requests is not None:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+        op = random.choices(ops, weights=op_weights)[0]
+        await run_operation(op, client, state, args, text, pdf)
+
+
+async def seed_documents(
+    client: httpx.AsyncClient,
+    state: LoadTestState,
+    args: argparse.Namespace,
+    pdf: bytes,
+) -> None:
+    """Upload and anonymize a few documents so document operations have targets."""
+    for _ in range(args.seed_documents):
+        file_id = await do_upload(client, state, pdf)
+        if file_id is not None:
+            await do_document_anonymize(client, state, file_id, args.pdf_entities)
+    # Seeding is setup work; start the measurement with clean statistics.
+    state.stats = {op: OperationStats() for op in OPERATIONS}
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float) -> bool:
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        try:
+            response = await client.get(f"{API_PREFIX}/health")
+            if response.status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(1)
+    return False
+
+
+def build_report(
+    state: LoadTestState, elapsed: float, args: argparse.Namespace
+) -> dict:
+    operations = {}
+    all_latencies: list[float] = []
+    total_errors = 0
+    for op, stats in state.stats.items():
+        if not stats.latencies_ms:
+            continue
+        count = len(stats.latencies_ms)
+        all_latencies.extend(stats.latencies_ms)
+        total_errors += stats.errors
+        operations[op] = {
+            "requests": count,
+            "rps": round(count / elapsed, 2),
+            "error_rate": round(stats.errors / count, 4),
+            "p50_ms": round(percentile(stats.latencies_ms, 50), 1),
+            "p95_ms": round(percentile(stats.latencies_ms, 95), 1),
+            "p99_ms": round(percentile(stats.latencies_ms, 99), 1),
+            "max_ms": round(max(stats.latencies_ms), 1),
+            "status_codes": {str(k): v for k, v in sorted(stats.status_codes.items())},
+        }
+    total = len(all_latencies)
+    rss_totals = [s["total_mb"] for s in state.rss_samples]
+    return {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "total": {
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(total_errors / total, 4) if total else 0.0,
+            "p50_ms": round(percentile(all_latencies, 50), 1),
+            "p95_ms": round(percentile(all_latencies, 95), 1),
+            "p99_ms": round(percentile(all_latencies, 99), 1),
+        },
+        "operations": operations,
+        "rss": {
+            "peak_mb": max(rss_totals) if rss_totals else None,
+            "samples": state.rss_samples,
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print()
+    print(
+        f"Load test against {report['base_url']} "
+        f"(concurrency={report['concurrency']}, {report['elapsed_s']}s)"
+    )
+    header = (
+        f"{'operation':<20}{'reqs':>8}{'rps':>9}{'err%':>8}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    rows = list(report["operations"].items()) + [("TOTAL", report["total"])]
+    for name, row in rows:
+        print(
+            f"{name:<20}{row['requests']:>8}{row['rps']:>9.2f}"
+            f"{row['error_rate'] * 100:>7.1f}%"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+        )
+    samples = report["rss"]["samples"]
+    if samples:
+        print()
+        print(f"Server RSS (peak {report['rss']['peak_mb']} MB):")
+        step = max(1, len(samples) // 20)
+        for sample in samples[::step]:
+            print(
+                f"  t={sample['t']:>7.1f}s  total={sample['total_mb']:>8.1f} MB  "
+                f"({len(sample['processes'])} processes)"
+            )
+
+
+async def run(args: argparse.Namespace) -> dict:
+    weights = parse_mix(args.mix)
+    text = Path(args.text_file).read_text() if args.text_file else DEFAULT_TEXT
+    pdf = Path(args.pdf).read_bytes()
+    state = LoadTestState()
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        if not await wait_until_ready(client, args.startup_timeout):
+            raise SystemExit(f"API at {args.base_url} did not become healthy")
+
+        needs_documents = any(
+            op in weights for op in ("document_anonymize", "download")
+        )
+        if needs_documents:
+            await seed_documents(client, state, args, pdf)
+        if (
+            "download" in weights
+            and not state.anonymized
+            and "document_anonymize" not in weights
+        ):
+            raise SystemExit(
+                "No anonymized documents to download: seeding failed and the mix "
+                "has no document_anonymize operation"
+            )
+
+        started = time.perf_counter()
+        sampler = None
+        if args.server_pid:
+            sampler = asyncio.create_task(
+                sample_rss(state, args.server_pid, args.rss_interval, started)
+            )
+
+        deadline = started + (args.duration if args.requests is None else 10**9)
+        remaining = [args.requests if args.requests is not None else 0]
+        await asyncio.gather(
+            *(
+                worker(client, state, args, weights, deadline, remaining, text, pdf)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+        if sampler is not None:
+            sampler.cancel()
+            # Take a final sample after the load has been applied.
+            per_process = process_tree_rss_kb(args.server_pid)
+            state.rss_samples.append(
+                {
+                    "t": round(elapsed, 2),
+                    "total_mb": round(sum(per_process.values()) / 1024, 1),
+                    "processes": {
+                        str(p): round(kb / 1024, 1) for p, kb in per_process.items()
+                    },
+                }
+            )
+
+    return build_report(state, elapsed, args)
+
+
+def spawn_server(args: argparse.Namespace) -> subprocess.Popen:
+    """Start ``api.py`` in production mode (no reload) for the duration of the run."""
+    root = Path(__file__).resolve().parent.parent
+    port = httpx.URL(args.base_url).port or 8080
+    cmd = [
+        sys.executable,
+        str(root / "api.py"),
+        "--env",
+        "production",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(args.workers),
+    ]
+    print(f"Starting server: {' '.join(cmd)}")
+    return subprocess.Popen(cmd, cwd=root)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenAnonymiser HTTP load test")
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="Test duration in seconds"
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=None,
+        help="Stop after this many requests instead of after --duration",
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="op=weight,...")
+    parser.add_argument("--text-file", default=None, help="Text payload file")
+    parser.add_argument("--pdf", default=str(DEFAULT_PDF), help="PDF to upload")
+    parser.add_argument(
+        "--pdf-entities",
+        type=lambda s: [e.strip() for e in s.split(",") if e.strip()],
+        default=["PERSON", "EMAIL", "IBAN", "PHONE_NUMBER"],
+    )
+    parser.add_argument("--seed-documents", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    parser.add_argument(
+        "--server-pid",
+        type=int,
+        default=None,
+        help="PID of the server (master) process to sample RSS from",
+    )
+    parser.add_argument("--rss-interval", type=float, default=1.0)
+    parser.add_argument(
+        "--spawn-server",
+        action="store_true",
+        help="Start api.py locally and sample its RSS",
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--json-out", default=None, help="Write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    server: Optional[subprocess.Popen] = None
+    if args.spawn_server:
+        server = spawn_server(args)
+        args.server_pid = server.pid
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print_report(report)
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json_out}")
+    return 1 if report["total"]["error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
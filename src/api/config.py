@@ -31,6 +31,142 @@ class Settings:
     DEFAULT_TRANSFORMERS_MODEL = os.getenv(
         "DEFAULT_TRANSFORMERS_MODEL", "pdelobelle/robbert-v2-dutch-base"
     )
+    # ONNX Runtime-backend (DEFAULT_NLP_ENGINE=onnx) voor het transformers-model:
+    # de export wordt eenmalig in ONNX_CACHE_DIR gezet, standaard int8-gequantiseerd.
+    ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", os.path.join("data", "onnx"))
+    ONNX_QUANTIZE = os.getenv("ONNX_QUANTIZE", "true").lower() == "true"
+    # Instructieset voor de quantisatie: avx2, avx512, avx512_vnni of arm64
+    ONNX_QUANTIZATION_ARCH = os.getenv("ONNX_QUANTIZATION_ARCH", "avx2").lower()
+    # Engine voor de onzekere zinnen bij DEFAULT_NLP_ENGINE=cascade: transformers
+    # of onnx
+    CASCADE_ESCALATION_ENGINE = os.getenv(
+        "CASCADE_ESCALATION_ENGINE", "transformers"
+    ).lower()
+    # Welke spaCy-componenten geladen worden: "full", "ner-only" of "ner+lemma".
+    # SPACY_PIPELINE_PROFILE geldt voor de spaCy NER-engine, de tweede voor het
+    # spaCy-model onder Presidio's pattern recognizers (context enhancer: lemma's).
+    SPACY_PIPELINE_PROFILE = os.getenv("SPACY_PIPELINE_PROFILE", "ner-only").lower()
+    PATTERN_SPACY_PIPELINE_PROFILE = os.getenv(
+        "PATTERN_SPACY_PIPELINE_PROFILE", "ner+lemma"
+    ).lower()
+    # Oplossen van overlappende entiteiten: "score" (hoogste score), "length"
+    # (langste span) of "priority" (volgorde van SPAN_TYPE_PRIORITY, belangrijkste
+    # eerst; hits met een vast formaat winnen van NER-labels)
+    SPAN_MERGE_POLICY = os.getenv("SPAN_MERGE_POLICY", "priority").lower()
+    SPAN_TYPE_PRIORITY = [
+        t.strip().upper()
+        for t in os.getenv(
+            "SPAN_TYPE_PRIORITY",
+            "EMAIL,IBAN,BSN,PHONE_NUMBER,ID_NO,DRIVERS_LICENSE,CASE_NO,DATE_TIME,"
+            "ADDRESS,PERSON,PER,ORGANIZATION,ORG,LOCATION,LOC,GPE",
+        ).split(",")
+        if t.strip()
+    ]
+    # Gazetteer met vaste namen, straten en organisaties die altijd gevonden moeten
+    # worden (één term per regel, optioneel "ENTITEITSTYPE<TAB>term"); leeg = uit.
+    # De gebouwde Aho-Corasick-automaat wordt in GAZETTEER_CACHE_DIR bewaard.
+    GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", "")
+    GAZETTEER_CACHE_DIR = os.getenv(
+        "GAZETTEER_CACHE_DIR", os.path.join("data", "gazetteer")
+    )
+    GAZETTEER_DEFAULT_ENTITY = os.getenv("GAZETTEER_DEFAULT_ENTITY", "PERSON").upper()
+    GAZETTEER_SCORE = float(os.getenv("GAZETTEER_SCORE", "0.85"))
+    # Treffers met een ongeldig controlegetal (BSN-elfproef, IBAN mod-97, ...):
+    # "drop" laat ze weg, "downscore" behoudt ze met score CHECKSUM_INVALID_SCORE
+    CHECKSUM_INVALID_ACTION = os.getenv("CHECKSUM_INVALID_ACTION", "drop").lower()
+    CHECKSUM_INVALID_SCORE = float(os.getenv("CHECKSUM_INVALID_SCORE", "0.1"))
+    # Allow-list met bekende niet-PII waarden (bijv. vaste KvK- of zaaknummers van
+    # de eigen organisatie) die nooit als entiteit gerapporteerd worden; regels als
+    # "[ENTITEITSTYPE<TAB>]exact|prefix|regex:waarde". Leeg = uit.
+    ALLOW_LIST_PATH = os.getenv("ALLOW_LIST_PATH", "")
+    # Pseudoniem-sessies (strategie "pseudonymize", in de database zodat alle
+    # workers ze delen): maximaal aantal sessies (LRU) en de tijd (seconden)
+    # waarna een ongebruikte sessie vervalt
+    PSEUDONYM_MAX_SESSIONS = int(os.getenv("PSEUDONYM_MAX_SESSIONS", "10000"))
+    PSEUDONYM_SESSION_TTL_SECONDS = float(
+        os.getenv("PSEUDONYM_SESSION_TTL_SECONDS", "3600")
+    )
+    # Engines die vóór het forken van de workers geladen worden (api.py --preload)
+    PRELOAD_NLP_ENGINES = [
+        e.strip().lower()
+        for e in os.getenv("PRELOAD_NLP_ENGINES", DEFAULT_NLP_ENGINE).split(",")
+        if e.strip()
+    ]
+    # Interval (seconden) waarop de master het geheugen per worker logt
+    WORKER_MEMORY_REPORT_INTERVAL = int(
+        os.getenv("WORKER_MEMORY_REPORT_INTERVAL", "60")
+    )
+    # Geheugenbudget (MB) voor geladen NLP-modellen; 0 = onbeperkt. Bij
+    # overschrijding worden de minst recent gebruikte modellen ontladen.
+    # De standaardmodellen van DEFAULT_NLP_ENGINE en PRELOAD_NLP_ENGINES blijven
+    # altijd geladen (budget en idle TTL)
+    MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+    # Ontlaad modellen die langer dan dit aantal seconden niet gebruikt zijn; 0 = nooit
+    MODEL_IDLE_TTL_SECONDS = float(os.getenv("MODEL_IDLE_TTL_SECONDS", "0"))
+    # Micro-batching van NER-verzoeken: wacht na het eerste verzoek maximaal
+    # INFERENCE_MAX_WAIT_MS op meer verzoeken, tot INFERENCE_MAX_BATCH_SIZE teksten.
+    # Een batchgrootte van 1 schakelt de scheduler uit.
+    INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "16"))
+    INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))
+    # Threads waarop de pattern recognizers parallel aan de NER draaien; 0 = na elkaar
+    ANALYSIS_STAGE_THREADS = int(os.getenv("ANALYSIS_STAGE_THREADS", "4"))
+    # NER-resultaten per alinea (te lange alinea's: per zin) in een LRU-cache op
+    # basis van een hash van de tekst; alleen nieuwe segmenten gaan door het model.
+    # Standaard uit (0): met de cache ziet het model per segment minder context,
+    # zodat de gevonden entiteiten kunnen afwijken van een analyse van de hele tekst
+    ANALYSIS_CACHE_MAX_SEGMENTS = int(os.getenv("ANALYSIS_CACHE_MAX_SEGMENTS", "0"))
+    ANALYSIS_CACHE_SEGMENT_MAX_CHARS = int(
+        os.getenv("ANALYSIS_CACHE_SEGMENT_MAX_CHARS", "2000")
+    )
+    # Prioriteitslanes: vaste threads voor interactieve tekstverzoeken en een eigen,
+    # kleiner werkbudget voor PDF-verwerking; PDF's kunnen de tekst-threads niet
+    # bezetten
+    LANE_INTERACTIVE_WORKERS = int(os.getenv("LANE_INTERACTIVE_WORKERS", "8"))
+    LANE_BULK_WORKERS = int(os.getenv("LANE_BULK_WORKERS", "2"))
+    # Maximale duur (seconden) van een tekstverzoek en van een documentverzoek
+    # (upload/anonimiseren); daarna stopt het werk en volgt een 504. 0 = geen limiet.
+    # Bij een verbroken verbinding stopt het werk ook.
+    TEXT_REQUEST_TIMEOUT_SECONDS = float(
+        os.getenv("TEXT_REQUEST_TIMEOUT_SECONDS", "30")
+    )
+    DOCUMENT_REQUEST_TIMEOUT_SECONDS = float(
+        os.getenv("DOCUMENT_REQUEST_TIMEOUT_SECONDS", "600")
+    )
+    # Admission control: maximaal aantal gelijktijdige verzoeken en wachtende
+    # verzoeken per lane ("text": /analyze en /anonymize, "document": upload en
+    # (de)anonimiseren van PDF's). Daarboven volgt direct een 429 met Retry-After.
+    # Een limiet van 0 schakelt admission control voor die lane uit.
+    ADMISSION_TEXT_MAX_CONCURRENT = int(
+        os.getenv("ADMISSION_TEXT_MAX_CONCURRENT", "32")
+    )
+    ADMISSION_TEXT_MAX_QUEUE = int(os.getenv("ADMISSION_TEXT_MAX_QUEUE", "64"))
+    ADMISSION_DOCUMENT_MAX_CONCURRENT = int(
+        os.getenv("ADMISSION_DOCUMENT_MAX_CONCURRENT", "2")
+    )
+    ADMISSION_DOCUMENT_MAX_QUEUE = int(os.getenv("ADMISSION_DOCUMENT_MAX_QUEUE", "8"))
+    # Maximale wachttijd (seconden) in de wachtrij; daarna ook een 429. 0 = geen limiet
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = float(
+        os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "30")
+    )
+    # PDF's met minstens PDF_PARALLEL_PAGE_THRESHOLD pagina's worden in stukken van
+    # PDF_PARALLEL_RANGE_PAGES pagina's over PDF_PARALLEL_WORKERS processen verdeeld
+    # (extractie, analyse en redactie). Standaard uit (0 of 1 worker): elke API-worker
+    # start deze processen en elk proces laadt de modellen, buiten
+    # MODEL_MEMORY_BUDGET_MB en de gedeelde modellen van --preload om
+    PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "100"))
+    PDF_PARALLEL_RANGE_PAGES = int(os.getenv("PDF_PARALLEL_RANGE_PAGES", "25"))
+    PDF_PARALLEL_WORKERS = int(os.getenv("PDF_PARALLEL_WORKERS", "0"))
+    # Bewaar per pagina een hash en de gevonden entiteiten; pagina's die al eerder
+    # (in dit of een ander document) geanalyseerd zijn, worden niet opnieuw geanalyseerd
+    # (alleen met dezelfde modellen, span-instellingen, allow-list en gazetteer)
+    PAGE_ANALYSIS_REUSE = os.getenv("PAGE_ANALYSIS_REUSE", "true").lower() == "true"
+    # Laad de modellen en draai een dummy-inferentie bij het opstarten
+    WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+    # Aantal pogingen voor de warmup en de wachttijd (seconden) voor de eerste
+    # herhaling, daarna steeds verdubbeld; mislukken alle pogingen, dan faalt ook
+    # /health/live zodat de container herstart wordt
+    WARMUP_MAX_ATTEMPTS = int(os.getenv("WARMUP_MAX_ATTEMPTS", "3"))
+    WARMUP_RETRY_BACKOFF_SECONDS = float(os.getenv("WARMUP_RETRY_BACKOFF_SECONDS", "5"))
     ALLOWED_ORIGINS = ["*"]
     SUPPORTED_UPLOAD_EXTENSIONS = [
         "pdf",
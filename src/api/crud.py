@@ -1,3 +1,4 @@
+import json
 from typing import Any, Optional, Protocol, TypeVar, Union, overload
 
 from sqlalchemy import UnaryExpression
@@ -7,6 +8,7 @@ from src.api.database import (
     AnonymizationEvent,
     Base,
     Document,
+    DocumentPage,
     Tag,
 )
 
@@ -177,3 +179,61 @@ def update_document_anonymized_path(
 def get_document(db: Session, document_id: str) -> Optional[Document]:
     """Get a document by ID."""
     return db.query(Document).filter(Document.id == document_id).first()
+
+
+def create_document_pages(
+    db: Session,
+    document_id: str,
+    nlp_engine: str,
+    analyzer_fingerprint: str,
+    pages: list[tuple[int, str, list[dict]]],
+) -> None:
+    """Store the per-page analysis of a document.
+
+    Args:
+        db: The database session.
+        document_id: The document the pages belong to.
+        nlp_engine: The NLP engine that analyzed the pages.
+        analyzer_fingerprint: Fingerprint of the analyzer configuration (see
+            ``text_analyzer.analyzer_fingerprint``).
+        pages: (page_number, content_hash, entities) per page; the entity offsets
+            are relative to the page text. The entity values are not stored.
+    """
+    for page_number, content_hash, entities in pages:
+        db.add(
+            DocumentPage(
+                document_id=document_id,
+                page_number=page_number,
+                content_hash=content_hash,
+                nlp_engine=nlp_engine,
+                analyzer_fingerprint=analyzer_fingerprint,
+                entities=json.dumps(
+                    [{k: v for k, v in e.items() if k != "text"} for e in entities]
+                ),
+            )
+        )
+    db.commit()
+
+
+def get_page_entities(
+    db: Session,
+    analyzer_fingerprint: str,
+    content_hashes: Optional[list[str]] = None,
+    document_id: Optional[str] = None,
+) -> dict[str, list[dict]]:
+    """Get stored page analyses by page hash, for the given hashes or document.
+
+    Only pages analyzed with the same analyzer configuration are returned, so a
+    changed model, allow-list or gazetteer never reuses an older analysis.
+
+    Returns:
+        dict: content hash -> entities (offsets relative to the page, no values).
+    """
+    query = db.query(DocumentPage).filter(
+        DocumentPage.analyzer_fingerprint == analyzer_fingerprint
+    )
+    if content_hashes is not None:
+        query = query.filter(DocumentPage.content_hash.in_(set(content_hashes)))
+    if document_id is not None:
+        query = query.filter(DocumentPage.document_id == document_id)
+    return {page.content_hash: json.loads(page.entities) for page in query.all()}
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from sqlalchemy import ForeignKey, String, Text, JSON, func
+from sqlalchemy import ForeignKey, String, Text, JSON, UniqueConstraint, func
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -36,6 +36,9 @@ class Document(Base):
     anonymization_events: Mapped[List["AnonymizationEvent"]] = relationship(
         back_populates="document", cascade="all, delete-orphan"
     )
+    pages: Mapped[List["DocumentPage"]] = relationship(
+        back_populates="document", cascade="all, delete-orphan"
+    )
 
     # Store entities as JSON in memory (not in database) - DEPRECATED: use pii_entities field instead
     _entities: Optional[List[Dict[str, str]]] = None
@@ -54,6 +57,30 @@ class Tag(Base):
     document: Mapped["Document"] = relationship(back_populates="tags")
 
 
+class DocumentPage(Base):
+    """Analysis result of one page, keyed by a hash of the page text.
+
+    A new upload with a page of the same text, analyzed with the same analyzer
+    configuration (``analyzer_fingerprint``: models, span settings, allow-list and
+    gazetteer), reuses the stored entities instead of analyzing the page again.
+    Only the type, offsets and score are stored; the values themselves are read
+    back from the page text.
+    """
+
+    __tablename__ = "document_pages"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    document_id: Mapped[str] = mapped_column(String(32), ForeignKey("documents.id"))
+    page_number: Mapped[int] = mapped_column(nullable=False)  # 1-based
+    content_hash: Mapped[str] = mapped_column(String(64), index=True)  # sha256
+    nlp_engine: Mapped[str] = mapped_column(Text, nullable=False)
+    analyzer_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    entities: Mapped[str] = mapped_column(Text, nullable=False)  # JSON list
+
+    # Relationship
+    document: Mapped["Document"] = relationship(back_populates="pages")
+
+
 class AnonymizationEvent(Base):
     """AnonymizationEvent model based on the ERD."""
 
@@ -78,3 +105,44 @@ class AnonymizationEvent(Base):
     @pii_entities.setter
     def pii_entities(self, value: List[Dict[str, str]]) -> None:
         self._pii_entities = value
+
+
+class PseudonymSessionRecord(Base):
+    """Pseudonym session; shared by all workers through the database."""
+
+    __tablename__ = "pseudonym_sessions"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    last_used: Mapped[datetime] = mapped_column(nullable=False, index=True)
+
+    # Relationship
+    pseudonyms: Mapped[List["Pseudonym"]] = relationship(
+        back_populates="session", cascade="all, delete-orphan"
+    )
+
+
+class Pseudonym(Base):
+    """Pseudonym (e.g. ``PERSON_1``) of one value within a pseudonym session.
+
+    The value itself is not stored, only an HMAC of the normalized value.
+    """
+
+    __tablename__ = "pseudonyms"
+    __table_args__ = (
+        UniqueConstraint("session_id", "entity_type", "value_hash"),
+        UniqueConstraint("session_id", "entity_type", "number"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("pseudonym_sessions.id")
+    )
+    entity_type: Mapped[str] = mapped_column(Text, nullable=False)
+    value_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    number: Mapped[int] = mapped_column(nullable=False)
+
+    # Relationship
+    session: Mapped["PseudonymSessionRecord"] = relationship(
+        back_populates="pseudonyms"
+    )
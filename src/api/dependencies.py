@@ -69,3 +69,10 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# Dependency function for work that outlives the request (streaming responses):
+# get_db's session is closed before the response body is sent, so a generator
+# opens its own session from this factory (and closes it)
+def get_session_factory() -> sessionmaker[Session]:
+    return SessionLocal
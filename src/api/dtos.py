@@ -4,6 +4,7 @@ from typing import Optional, Union
 from pydantic import BaseModel, field_validator
 
 from src.api.config import settings
+from src.api.utils.anonymizer import ANONYMIZATION_STRATEGIES
 
 
 class DocumentTagDto(BaseModel):
@@ -33,6 +34,19 @@ AddDocumentResponse = AddDocumentResponseSuccess | AddDocumentResponseInvalid
 
 class DocumentAnonymizationRequest(BaseModel):
     pii_entities_to_anonymize: list[str]  # List of PII entities to anonymize
+    # "replace" ([PERSON]) or "pseudonymize" ([PERSON_1], [PERSON_2], ...)
+    anonymization_strategy: str = "replace"
+    # Pseudonym session shared with other documents/texts; defaults to the file id
+    session_id: Optional[str] = None
+
+    @field_validator("anonymization_strategy")
+    def validate_document_strategy(cls, value: str) -> str:
+        """Only replace and pseudonymize can be drawn as PDF redaction masks."""
+        if value not in ("replace", "pseudonymize"):
+            raise ValueError(
+                f"Unsupported strategy: {value}. Supported: replace, pseudonymize"
+            )
+        return value
 
     @field_validator("pii_entities_to_anonymize")
     def validate_pii_entities(cls, value: list[str]) -> list[str]:
@@ -134,7 +148,10 @@ class AnonymizeTextRequest(BaseModel):
     language: str = settings.DEFAULT_LANGUAGE
     entities: Optional[list[str]] = None  # Anonymize specific entity types only
     nlp_engine: Optional[str] = None  # Override default engine
-    anonymization_strategy: str = "replace"  # replace, mask, redact, etc.
+    anonymization_strategy: str = (
+        "replace"  # replace, mask, redact, hash or pseudonymize
+    )
+    session_id: Optional[str] = None  # Pseudonym session (pseudonymize only)
 
     @field_validator("text")
     def validate_text_not_empty(cls, value: str) -> str:
@@ -172,10 +189,10 @@ class AnonymizeTextRequest(BaseModel):
     @field_validator("anonymization_strategy")
     def validate_strategy(cls, value: str) -> str:
         """Validate anonymization strategy."""
-        supported_strategies = ["replace", "mask", "redact", "hash"]
-        if value not in supported_strategies:
+        if value not in ANONYMIZATION_STRATEGIES:
             raise ValueError(
-                f"Unsupported strategy: {value}. Supported: {', '.join(supported_strategies)}"
+                f"Unsupported strategy: {value}. "
+                f"Supported: {', '.join(ANONYMIZATION_STRATEGIES)}"
             )
         return value
 
@@ -190,3 +207,4 @@ class AnonymizeTextResponse(BaseModel):
     processing_time_ms: Optional[int] = None
     nlp_engine_used: Optional[str] = None
     anonymization_strategy: Optional[str] = None
+    session_id: Optional[str] = None  # Set for pseudonymize; reuse for related texts
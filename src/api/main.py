@@ -1,11 +1,26 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from src.api.config import settings, setup_logging
 from src.api.routers import router
+from src.api.services.warmup import start_warmup
+from src.api.utils.admission import Overloaded, admission_limiters, lane_for_request
+from src.api.utils.metrics import metrics
 
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Warmup draait op de achtergrond; /health/ready meldt wanneer die klaar is.
+    start_warmup()
+    yield
+
+
 app = FastAPI(
     title="Presidio-NL API",
     description="API voor Nederlandse tekst analyse en anonimisatie",
@@ -13,6 +28,7 @@ app = FastAPI(
     docs_url="/api/v1/docs",
     openapi_url="/api/v1/openapi.json",
     redoc_url="/api/v1/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,4 +39,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def track_in_flight_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Houd het aantal lopende verzoeken bij (gerapporteerd door /health/ready)."""
+    if request.url.path.startswith("/api/v1/health"):
+        return await call_next(request)
+    metrics.add_gauge("http_requests_in_flight", 1)
+    try:
+        return await call_next(request)
+    finally:
+        metrics.add_gauge("http_requests_in_flight", -1)
+
+
+@app.middleware("http")
+async def admission_control(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Laat verzoeken per lane (tekst/document) begrensd toe; anders direct 429.
+
+    Draait vóór het lezen van de body, zodat een afgewezen upload geen geheugen kost.
+    """
+    lane = lane_for_request(request.method, request.url.path)
+    if lane is None:
+        return await call_next(request)
+    try:
+        async with admission_limiters[lane].admit():
+            return await call_next(request)
+    except Overloaded as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
 app.include_router(router=router)
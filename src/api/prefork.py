@@ -0,0 +1,197 @@
+"""Pre-fork serving mode: laad modellen in de master en fork daarna de workers.
+
+Met ``uvicorn --workers N`` start elke worker als nieuw proces en importeert spaCy,
+transformers en torch en laadt de modellen opnieuw; het resident geheugen groeit
+daardoor lineair met het aantal workers. In deze modus laadt de master de
+geconfigureerde analyzers (spaCy-vocab, transformer-gewichten, Presidio) één keer,
+bevriest de objecten voor de garbage collector en forkt daarna de workers. De
+read-only pagina's van de modellen blijven zo copy-on-write gedeeld.
+
+De master bewaakt de workers, herstart workers die onverwacht stoppen en logt
+periodiek RSS/PSS per worker, zodat de besparing te controleren is: PSS telt
+gedeelde pagina's naar rato, dus de som van PSS is het werkelijke gebruik.
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Optional
+
+import uvicorn
+
+from src.api.config import settings
+from src.api.utils.memory import format_memory, read_process_memory_kb
+
+logger = logging.getLogger(__name__)
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket, log_level: str) -> None:
+    """Draai een uvicorn-server op de gedeelde socket (in het geforkte proces)."""
+    # De master heeft eigen handlers; de worker laat uvicorn de signalen afhandelen.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Database-connecties uit de pool van de master mogen niet gedeeld worden.
+    from src.api.dependencies import engine
+
+    engine.dispose(close=False)
+
+    from src.api.main import app
+
+    config = uvicorn.Config(app=app, log_level=log_level, loop="asyncio")
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+class PreforkMaster:
+    """Master-proces dat de modellen preloadt en de workers forkt en bewaakt."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        workers: int,
+        log_level: str = "info",
+        memory_report_interval: int = settings.WORKER_MEMORY_REPORT_INTERVAL,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.log_level = log_level
+        self.memory_report_interval = memory_report_interval
+        self.children: dict[int, int] = {}  # pid -> worker index
+        self.sock: Optional[socket.socket] = None
+        self._stopping = False
+
+    def preload(self) -> None:
+        """Importeer de app en laad de analyzers vóór het forken."""
+        # Tokenizers/torch-threadpools zijn niet fork-safe zodra ze gebruikt zijn.
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+        start = time.perf_counter()
+        import src.api.main  # noqa: F401  (importeert routers, engines en Presidio)
+        from src.api.services.text_analyzer import preload_analyzers
+
+        preload_analyzers()
+
+        # Verplaats alle bestaande objecten naar de permanente generatie zodat de
+        # GC van de workers hun refcount-pagina's niet aanraakt (en kopieert).
+        gc.collect()
+        gc.freeze()
+        logger.info(
+            f"Preloaded {settings.PRELOAD_NLP_ENGINES} in "
+            f"{time.perf_counter() - start:.1f}s "
+            f"(master memory: {format_memory(read_process_memory_kb())})"
+        )
+
+    def spawn_worker(self, index: int) -> None:
+        assert self.sock is not None
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                _run_worker(self.sock, self.log_level)
+            except Exception:
+                logger.exception(f"Worker {index} crashed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = index
+        logger.info(f"Started worker {index} (pid {pid})")
+
+    def report_memory(self) -> dict[int, dict[str, int]]:
+        """Log en retourneer het geheugengebruik van master en workers."""
+        report = {os.getpid(): read_process_memory_kb()}
+        for pid in self.children:
+            report[pid] = read_process_memory_kb(pid)
+        total_pss = sum(m.get("Pss", 0) for m in report.values())
+        total_rss = sum(m.get("Rss", 0) for m in report.values())
+        logger.info(
+            f"Memory: total RSS={total_rss / 1024:.1f}MB, "
+            f"total PSS={total_pss / 1024:.1f}MB"
+        )
+        for pid, memory in report.items():
+            role = (
+                "master" if pid == os.getpid() else f"worker {self.children.get(pid)}"
+            )
+            logger.info(f"  {role} (pid {pid}): {format_memory(memory)}")
+        return report
+
+    def _handle_stop(self, signum: int, frame: object) -> None:
+        self._stopping = True
+
+    def stop_workers(self, timeout: float = 30.0) -> None:
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+        deadline = time.monotonic() + timeout
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self.children):
+            logger.warning(f"Worker pid {pid} did not stop in time; killing")
+            os.kill(pid, signal.SIGKILL)
+            self.children.pop(pid, None)
+
+    def _reap(self) -> list[int]:
+        """Verwerk gestopte workers en geef de indices terug die herstart moeten."""
+        stopped = []
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            index = self.children.pop(pid, None)
+            if index is not None:
+                logger.warning(
+                    f"Worker {index} (pid {pid}) exited with status {status}"
+                )
+                stopped.append(index)
+        return stopped
+
+    def run(self) -> None:
+        self.preload()
+        self.sock = _bind_socket(self.host, self.port)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        for index in range(self.workers):
+            self.spawn_worker(index)
+
+        # Eerste rapportage kort na het opstarten, daarna periodiek.
+        next_report = time.monotonic() + min(10, self.memory_report_interval)
+        try:
+            while not self._stopping:
+                for index in self._reap():
+                    if not self._stopping:
+                        self.spawn_worker(index)
+                if self.memory_report_interval > 0 and time.monotonic() >= next_report:
+                    self.report_memory()
+                    next_report = time.monotonic() + self.memory_report_interval
+                time.sleep(0.5)
+        finally:
+            logger.info("Shutting down workers")
+            self.stop_workers()
+            self.sock.close()
+
+
+def serve_preforked(host: str, port: int, workers: int, log_level: str) -> None:
+    """Start de API in pre-fork modus (zie module-docstring)."""
+    PreforkMaster(host=host, port=port, workers=workers, log_level=log_level).run()
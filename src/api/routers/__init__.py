@@ -1,9 +1,17 @@
 import logging
+from typing import Any
 
+from fastapi import status
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRouter
 
 from src.api.routers.documents import documents_router
 from src.api.routers.text_analysis import text_analysis_router
+from src.api.services.warmup import warmup_state
+from src.api.utils.admission import admission_limiters
+from src.api.utils.lanes import lanes
+from src.api.utils.metrics import metrics
+from src.api.utils.nlp.manager import model_manager
 
 router = APIRouter(prefix="/api/v1")
 
@@ -17,6 +25,51 @@ def ping() -> dict[str, str]:
     return {"ping": "pong"}
 
 
+@router.get("/health/live")
+def liveness() -> JSONResponse:
+    """Liveness probe: het proces draait en de event loop reageert.
+
+    Geeft 503 als alle warmup-pogingen mislukt zijn, zodat het proces herstart
+    wordt in plaats van voorgoed niet-ready te blijven.
+    """
+    if warmup_state.failed:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warmup_failed", "error": warmup_state.error},
+        )
+    return JSONResponse(content={"status": "alive"})
+
+
+@router.get("/health/ready")
+def readiness() -> JSONResponse:
+    """Readiness probe: 200 zodra de warmup klaar is, anders 503.
+
+    Rapporteert de laadstatus per model, de duur van de warmup, het aantal
+    verzoeken dat op dit moment in behandeling is, de resident modellen met hun
+    geschatte geheugengebruik, per admission-lane de lopende en wachtende
+    verzoeken en de bezetting van de prioriteitslanes.
+    """
+    body: dict[str, Any] = warmup_state.to_dict()
+    body["queue_depth"] = int(metrics.get_gauge("http_requests_in_flight"))
+    body["resident_models"] = model_manager.stats()
+    body["admission"] = {
+        lane: limiter.stats() for lane, limiter in admission_limiters.items()
+    }
+    body["lanes"] = {name: lane.stats() for name, lane in lanes.items()}
+    return JSONResponse(
+        status_code=status.HTTP_200_OK
+        if warmup_state.ready
+        else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=body,
+    )
+
+
+@router.get("/metrics")
+def get_metrics() -> dict[str, Any]:
+    """Metrics van dit proces (counters, gauges en latency-summaries) als JSON."""
+    return metrics.snapshot()
+
+
 router.include_router(documents_router)
 logging.info("Documents API router included!")
 
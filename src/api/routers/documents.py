@@ -1,22 +1,24 @@
+import functools
 import logging
 import os
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from fastapi import (
     APIRouter,
     BackgroundTasks,
     Depends,
     HTTPException,
+    Request,
     UploadFile,
     status,
 )
 from fastapi import File as FastAPIFile
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
 
 from src.api.config import settings
 from src.api.crud import (
@@ -24,7 +26,7 @@ from src.api.crud import (
     get_document,
     update_document_anonymized_path,
 )
-from src.api.dependencies import get_db
+from src.api.dependencies import get_db, get_session_factory
 from src.api.dtos import (
     AddDocumentResponse,
     AddDocumentResponseSuccess,
@@ -33,7 +35,18 @@ from src.api.dtos import (
     DocumentDto,
     DocumentTagDto,
 )
+from src.api.services.pseudonyms import UnknownSessionError
 from src.api.utils import pdf_xmp
+from src.api.utils.admission import Overloaded, admission_limiters
+from src.api.utils.deadline import Deadline, OperationCancelled, cancel_on_disconnect
+from src.api.utils.lanes import BULK, run_in_lane
+from src.api.utils.progress import (
+    NDJSON_MEDIA_TYPE,
+    SSE_MEDIA_TYPE,
+    format_event,
+    stream_progress,
+    wants_sse,
+)
 
 logger = logging.getLogger(__name__)
 documents_router = APIRouter(prefix="/documents", tags=["documents"])
@@ -58,13 +71,37 @@ def validate_files_extensions(files: list[UploadFile]) -> None:
     "/upload",
 )
 async def upload_document(
+    http_request: Request,
     files: list[UploadFile] = FastAPIFile(...),
     tags: Optional[list[str]] = None,
     db: Session = Depends(get_db),
     # username: str = Depends(get_user),
 ) -> AddDocumentResponse:
+    """Upload and analyze documents.
+
+    Stops when DOCUMENT_REQUEST_TIMEOUT_SECONDS is exceeded (504) or the client
+    disconnects; the detail then lists the documents that were fully processed.
+    """
     validate_files_extensions(files)
-    docs = await pdf_xmp.upload_and_analyze_files(files=files, tags=tags, db=db)
+    deadline = Deadline(settings.DOCUMENT_REQUEST_TIMEOUT_SECONDS)
+    try:
+        async with cancel_on_disconnect(http_request, deadline):
+            docs = await pdf_xmp.upload_and_analyze_files(
+                files=files, tags=tags, db=db, deadline=deadline
+            )
+    except OperationCancelled as e:
+        processed = e.partial_result or []
+        logger.warning(
+            f"Upload stopped after {len(processed)} of {len(files)} files: {e}"
+        )
+        raise HTTPException(
+            status_code=e.status_code,
+            detail={
+                "message": str(e),
+                "stage": e.stage,
+                "processed_files": [d.model_dump(mode="json") for d in processed],
+            },
+        )
 
     return AddDocumentResponseSuccess(files=docs)
 
@@ -213,30 +250,63 @@ async def get_document_metadata(
 async def anonymize_document(
     file_id: str,
     request_body: DocumentAnonymizationRequest,
+    http_request: Request,
     db: Session = Depends(get_db),
     # username: str = Depends(get_user),
 ) -> DocumentAnonymizationResponse:
-    """Anonymize a specific document."""
+    """Anonymize a specific document.
+
+    Stops between pages when DOCUMENT_REQUEST_TIMEOUT_SECONDS is exceeded (504) or
+    the client disconnects; no partially redacted file is kept.
+    """
     start = time.perf_counter()
     file_id_check(file_id)
     doc = get_document(db, file_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
+    deadline = Deadline(settings.DOCUMENT_REQUEST_TIMEOUT_SECONDS)
     try:
-        result: pdf_xmp.AnalysisAnonymizationResponse = (
-            pdf_xmp.analyze_and_anonymize_document(
+        async with cancel_on_disconnect(http_request, deadline):
+            result: pdf_xmp.AnalysisAnonymizationResponse = await run_in_lane(
+                BULK,
+                pdf_xmp.analyze_and_anonymize_document,
                 file_id=file_id,
                 request_body=request_body,
                 doc=doc,
                 key=settings.CRYPTO_KEY.decode(),
+                deadline=deadline,
+                known_pages=pdf_xmp.document_known_pages(db, file_id),
             )
+    except OperationCancelled as e:
+        create_anonymization_event(
+            db,
+            document_id=file_id,
+            time_taken=int((time.perf_counter() - start) * 1000),
+            status=f"cancelled: {e}",
         )
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except UnknownSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred during document anonymization: {str(e)}",
         )
+    return finish_anonymization(db, file_id, result, start)
+
+
+def finish_anonymization(
+    db: Session,
+    file_id: str,
+    result: pdf_xmp.AnalysisAnonymizationResponse,
+    start: float,
+) -> DocumentAnonymizationResponse:
+    """Record the anonymization event and build the response.
+
+    Raises:
+        HTTPException: 500 when the anonymization failed; the output is removed.
+    """
     # unpack the result
     out_path = result.output_path
     selected = result.selected_entities
@@ -284,6 +354,229 @@ async def anonymize_document(
     )
 
 
+@documents_router.post("/upload/stream")
+async def upload_document_stream(
+    http_request: Request,
+    files: list[UploadFile] = FastAPIFile(...),
+    tags: Optional[list[str]] = None,
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+    # username: str = Depends(get_user),
+) -> StreamingResponse:
+    """Upload and analyze documents, streaming the progress page by page.
+
+    Responds with NDJSON, or Server-Sent Events for ``Accept: text/event-stream``.
+    Per file: a ``file`` event, an ``extract`` and an ``analyze`` event per page
+    (the latter with the entities found on that page), then a ``document`` event
+    with the same metadata as /upload. The stream ends with ``done``, or with an
+    ``error`` event when DOCUMENT_REQUEST_TIMEOUT_SECONDS is exceeded; errors are
+    reported in the stream because the 200 status has already been sent.
+    """
+    validate_files_extensions(files)
+    _check_document_capacity()
+    sse = wants_sse(http_request)
+    deadline = Deadline(settings.DOCUMENT_REQUEST_TIMEOUT_SECONDS)
+    # De uploads worden gesloten zodra de handler klaar is, dus vóór de stream
+    # begint: eerst alle bestanden opslaan
+    uploads = [(file, *await pdf_xmp.save_upload(file)) for file in files]
+    pending = [source_path for _, _, source_path in uploads]
+
+    def discard_pending() -> None:
+        # Niet (volledig) verwerkte bestanden worden niet bewaard, ook niet als de
+        # stream afgebroken wordt (client weg) of niet start (geen plek, 429)
+        for source_path in pending:
+            source_path.unlink(missing_ok=True)
+        pending.clear()
+
+    async def events() -> AsyncIterator[str]:
+        processed = 0
+        # Eigen sessie: die van get_db is al gesloten als de stream loopt
+        db = session_factory()
+        try:
+            for file, file_id, source_path in uploads:
+                yield format_event(
+                    {"stage": "file", "id": file_id, "filename": file.filename}, sse
+                )
+                analysis = pdf_xmp.PdfAnalysis("", [], [])
+                try:
+                    page_texts, known_pages = await pdf_xmp.find_known_pages(
+                        db, source_path, deadline
+                    )
+                    async for event in stream_progress(
+                        functools.partial(
+                            pdf_xmp.analyze_pdf_document,
+                            source_path,
+                            deadline,
+                            page_texts=page_texts,
+                            known_pages=known_pages,
+                        ),
+                        deadline,
+                    ):
+                        if event["stage"] == "result":
+                            analysis = event["result"]
+                        else:
+                            yield format_event({"id": file_id, **event}, sse)
+                except OperationCancelled as e:
+                    # Het onvolledig geanalyseerde bestand wordt niet bewaard
+                    source_path.unlink(missing_ok=True)
+                    logger.warning(
+                        f"Upload stream stopped after {processed} of {len(files)} "
+                        f"files: {e}"
+                    )
+                    yield format_event(
+                        _error_event(e.status_code, str(e), file_id), sse
+                    )
+                    return
+                except Exception as e:
+                    source_path.unlink(missing_ok=True)
+                    logger.error(
+                        f"Analysis of uploaded file {file.filename} failed: {e}"
+                    )
+                    yield format_event(
+                        _error_event(
+                            status.HTTP_422_UNPROCESSABLE_ENTITY, str(e), file_id
+                        ),
+                        sse,
+                    )
+                    continue
+
+                doc = pdf_xmp.store_document(
+                    db,
+                    file,
+                    file_id,
+                    source_path,
+                    analysis.entities,
+                    pdf_xmp.unique_entities(analysis.entities),
+                    tags,
+                    pages=analysis.pages,
+                )
+                pending.remove(source_path)
+                processed += 1
+                yield format_event(
+                    {"stage": "document", "document": doc.model_dump(mode="json")}, sse
+                )
+            yield format_event({"stage": "done", "processed_files": processed}, sse)
+        finally:
+            db.close()
+            discard_pending()
+
+    background = BackgroundTasks()
+    background.add_task(discard_pending)
+    return StreamingResponse(
+        _admitted(events(), sse),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+        background=background,
+    )
+
+
+@documents_router.post("/{file_id}/anonymize/stream")
+async def anonymize_document_stream(
+    file_id: str,
+    request_body: DocumentAnonymizationRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+    # username: str = Depends(get_user),
+) -> StreamingResponse:
+    """Anonymize a document, streaming the progress page by page.
+
+    Responds with NDJSON, or Server-Sent Events for ``Accept: text/event-stream``.
+    Events: ``extract`` and ``analyze`` per page (with that page's entities),
+    ``redact`` per page, ``embed``, and finally ``done`` with the same body as
+    /anonymize, or ``error``.
+    """
+    start = time.perf_counter()
+    file_id_check(file_id)
+    doc = get_document(db, file_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    _check_document_capacity()
+    sse = wants_sse(http_request)
+    deadline = Deadline(settings.DOCUMENT_REQUEST_TIMEOUT_SECONDS)
+
+    async def events() -> AsyncIterator[str]:
+        # Eigen sessie: die van get_db is al gesloten als de stream loopt
+        stream_db = session_factory()
+        try:
+            stream_doc = get_document(stream_db, file_id)
+            if not stream_doc:  # intussen verwijderd
+                raise HTTPException(status_code=404, detail="Document not found")
+            async for event in stream_progress(
+                functools.partial(
+                    pdf_xmp.analyze_and_anonymize_document,
+                    file_id=file_id,
+                    request_body=request_body,
+                    doc=stream_doc,
+                    key=settings.CRYPTO_KEY.decode(),
+                    deadline=deadline,
+                    known_pages=pdf_xmp.document_known_pages(stream_db, file_id),
+                ),
+                deadline,
+            ):
+                if event["stage"] != "result":
+                    yield format_event(event, sse)
+                    continue
+                response = finish_anonymization(
+                    stream_db, file_id, event["result"], start
+                )
+                yield format_event(
+                    {"stage": "done", "result": response.model_dump(mode="json")}, sse
+                )
+        except OperationCancelled as e:
+            create_anonymization_event(
+                stream_db,
+                document_id=file_id,
+                time_taken=int((time.perf_counter() - start) * 1000),
+                status=f"cancelled: {e}",
+            )
+            yield format_event(_error_event(e.status_code, str(e)), sse)
+        except UnknownSessionError as e:
+            yield format_event(_error_event(e.status_code, str(e)), sse)
+        except HTTPException as e:
+            yield format_event(_error_event(e.status_code, str(e.detail)), sse)
+        except Exception as e:
+            logger.error(f"Streaming anonymization of {file_id} failed: {e}")
+            yield format_event(
+                _error_event(status.HTTP_500_INTERNAL_SERVER_ERROR, str(e)), sse
+            )
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(
+        _admitted(events(), sse),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+    )
+
+
+def _check_document_capacity() -> None:
+    # De middleware laat /stream-verzoeken door; een volle lane geeft hier een 429
+    try:
+        admission_limiters["document"].check_capacity()
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def _admitted(events: AsyncIterator[str], sse: bool) -> AsyncIterator[str]:
+    """Houd een plek in de document-lane vast zolang de stream loopt."""
+    try:
+        async with admission_limiters["document"].admit():
+            async for chunk in events:
+                yield chunk
+    except Overloaded as e:
+        yield format_event(_error_event(status.HTTP_429_TOO_MANY_REQUESTS, str(e)), sse)
+
+
+def _error_event(status_code: int, message: str, file_id: Optional[str] = None) -> dict:
+    event = {"stage": "error", "status_code": status_code, "message": message}
+    if file_id is not None:
+        event["id"] = file_id
+    return event
+
+
 @documents_router.get("/{file_id}/download")
 async def download_document(
     file_id: str,
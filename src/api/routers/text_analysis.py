@@ -1,8 +1,8 @@
 import logging
 import time
-from typing import Optional
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 
 from src.api.config import settings
 from src.api.dtos import (
@@ -12,7 +12,10 @@ from src.api.dtos import (
     AnonymizeTextResponse,
     PIIEntity,
 )
-from src.api.services.text_analyzer import ModularTextAnalyzer
+from src.api.services.pseudonyms import UnknownSessionError, pseudonym_store
+from src.api.services.text_analyzer import get_text_analyzer
+from src.api.utils.deadline import Deadline, OperationCancelled, cancel_on_disconnect
+from src.api.utils.lanes import INTERACTIVE, run_in_lane
 
 logger = logging.getLogger(__name__)
 text_analysis_router = APIRouter(tags=["text-analysis"])
@@ -44,6 +47,7 @@ def create_pii_entities_from_results(results: list[dict]) -> list[PIIEntity]:
 @text_analysis_router.post("/analyze")
 async def analyze_text(
     request: AnalyzeTextRequest,
+    http_request: Request,
 ) -> AnalyzeTextResponse:
     """Analyze text for PII entities using the specified NLP engine.
 
@@ -52,27 +56,37 @@ async def analyze_text(
 
     Args:
         request: AnalyzeTextRequest containing text and analysis parameters
+        http_request: The HTTP request, used to stop when the client disconnects
 
     Returns:
         AnalyzeTextResponse with detected PII entities and metadata
 
     Raises:
-        HTTPException: On analysis failure or invalid parameters
+        HTTPException: On analysis failure or invalid parameters, 504 when
+            TEXT_REQUEST_TIMEOUT_SECONDS is exceeded
     """
     start_time = time.perf_counter()
 
     try:
-        # Initialize analyzer with specified engine or use default
+        # Use the shared analyzer for the specified engine or the default
         nlp_engine = request.nlp_engine or settings.DEFAULT_NLP_ENGINE
-        analyzer = ModularTextAnalyzer(nlp_engine=nlp_engine)
+        analyzer = get_text_analyzer(nlp_engine)
 
         # Perform analysis
         entities_to_analyze = request.entities or settings.DEFAULT_ENTITIES
-        results = analyzer.analyze_text(
-            text=request.text,
-            entities=entities_to_analyze,
-            language=request.language,
-        )
+        # Op de interactieve lane (gereserveerde threads), zodat gelijktijdige
+        # verzoeken samen gebatcht kunnen worden en de event loop een verbroken
+        # verbinding opmerkt
+        deadline = Deadline(settings.TEXT_REQUEST_TIMEOUT_SECONDS)
+        async with cancel_on_disconnect(http_request, deadline):
+            results = await run_in_lane(
+                INTERACTIVE,
+                analyzer.analyze_text,
+                text=request.text,
+                entities=entities_to_analyze,
+                language=request.language,
+                deadline=deadline,
+            )
 
         # Convert results to DTOs
         pii_entities = create_pii_entities_from_results(results)
@@ -92,6 +106,9 @@ async def analyze_text(
             nlp_engine_used=nlp_engine,
         )
 
+    except OperationCancelled as e:
+        logger.warning(f"Text analysis stopped: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         logger.error(f"Text analysis failed: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -100,9 +117,46 @@ async def analyze_text(
         )
 
 
+def _analyze_and_anonymize(
+    nlp_engine: str,
+    request: AnonymizeTextRequest,
+    deadline: Deadline,
+) -> Tuple[list[dict], str, Optional[str]]:
+    """Resolve the pseudonym session, analyze the text and anonymize it.
+
+    The session is resolved first, so an unknown session (404) costs no model
+    load or inference. The text is anonymized with the same results, without a
+    second analysis.
+
+    Returns:
+        Tuple[list[dict], str, Optional[str]]: the analysis results, the
+            anonymized text and the pseudonym session id (None without one).
+    """
+    session_id = None
+    if request.anonymization_strategy == "pseudonymize":
+        session_id = pseudonym_store.session(request.session_id).session_id
+
+    # Use the shared analyzer for the specified engine or the default
+    analyzer = get_text_analyzer(nlp_engine)
+    analysis_results = analyzer.analyze_text(
+        text=request.text,
+        entities=request.entities or settings.DEFAULT_ENTITIES,
+        language=request.language,
+        deadline=deadline,
+    )
+    anonymized_text = analyzer.anonymize_text(
+        text=request.text,
+        strategy=request.anonymization_strategy,
+        results=analysis_results,
+        session_id=session_id,
+    )
+    return analysis_results, anonymized_text, session_id
+
+
 @text_analysis_router.post("/anonymize")
 async def anonymize_text(
     request: AnonymizeTextRequest,
+    http_request: Request,
 ) -> AnonymizeTextResponse:
     """Anonymize PII entities in text using the specified strategy.
 
@@ -111,34 +165,27 @@ async def anonymize_text(
 
     Args:
         request: AnonymizeTextRequest containing text and anonymization parameters
+        http_request: The HTTP request, used to stop when the client disconnects
 
     Returns:
         AnonymizeTextResponse with original text, anonymized text, and entities found
 
     Raises:
-        HTTPException: On anonymization failure or invalid parameters
+        HTTPException: On anonymization failure or invalid parameters, 504 when
+            TEXT_REQUEST_TIMEOUT_SECONDS is exceeded
     """
     start_time = time.perf_counter()
 
     try:
-        # Initialize analyzer with specified engine or use default
         nlp_engine = request.nlp_engine or settings.DEFAULT_NLP_ENGINE
-        analyzer = ModularTextAnalyzer(nlp_engine=nlp_engine)
 
-        # First analyze to find entities
-        entities_to_analyze = request.entities or settings.DEFAULT_ENTITIES
-        analysis_results = analyzer.analyze_text(
-            text=request.text,
-            entities=entities_to_analyze,
-            language=request.language,
-        )
-
-        # Then anonymize the text
-        anonymized_text = analyzer.anonymize_text(
-            text=request.text,
-            entities=entities_to_analyze,
-            language=request.language,
-        )
+        # Session lookup, analysis and anonymization all run on the lane: the
+        # pseudonym session does database queries that must not block the loop
+        deadline = Deadline(settings.TEXT_REQUEST_TIMEOUT_SECONDS)
+        async with cancel_on_disconnect(http_request, deadline):
+            analysis_results, anonymized_text, session_id = await run_in_lane(
+                INTERACTIVE, _analyze_and_anonymize, nlp_engine, request, deadline
+            )
 
         # Convert analysis results to DTOs
         entities_found = create_pii_entities_from_results(analysis_results)
@@ -159,8 +206,14 @@ async def anonymize_text(
             processing_time_ms=processing_time_ms,
             nlp_engine_used=nlp_engine,
             anonymization_strategy=request.anonymization_strategy,
+            session_id=session_id,
         )
 
+    except OperationCancelled as e:
+        logger.warning(f"Text anonymization stopped: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except UnknownSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         logger.error(f"Text anonymization failed: {str(e)}", exc_info=True)
         raise HTTPException(
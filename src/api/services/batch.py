@@ -0,0 +1,458 @@
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from src.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+BATCH_EXTENSIONS = (".pdf", ".txt")
+MANIFEST_NAME = "manifest.jsonl"
+
+
+@dataclass
+class BatchOptions:
+    """Instellingen die naar elke worker gaan."""
+
+    nlp_engine: str = settings.DEFAULT_NLP_ENGINE
+    entities: List[str] = field(
+        default_factory=lambda: list(settings.SUPPORTED_PII_ENTITIES_TO_ANONYMIZE)
+    )
+    strategy: str = "replace"  # voor tekstbestanden; PDF's krijgen [ENTITY]-maskers
+
+
+@dataclass
+class BatchJob:
+    """Eén invoerbestand; ``size`` en ``mtime_ns`` bepalen of het gewijzigd is."""
+
+    relative_path: str
+    source: str
+    output: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class BatchResult:
+    """Eén regel van het manifest."""
+
+    path: str
+    status: str  # "ok" of "failed"
+    output: Optional[str] = None
+    size: int = 0
+    mtime_ns: int = 0
+    pages: int = 0
+    entities: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    processed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    pages: int = 0
+    seconds: float = 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.processed / self.seconds if self.seconds else 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+
+def discover_jobs(input_dir: Path, output_dir: Path) -> Iterator[BatchJob]:
+    """Geef de PDF- en tekstbestanden onder ``input_dir`` in een vaste volgorde.
+
+    De uitvoer krijgt dezelfde relatieve paden onder ``output_dir``.
+    """
+    for source in sorted(input_dir.rglob("*")):
+        if not source.is_file() or source.suffix.lower() not in BATCH_EXTENSIONS:
+            continue
+        relative = source.relative_to(input_dir)
+        stat = source.stat()
+        yield BatchJob(
+            relative_path=relative.as_posix(),
+            source=str(source),
+            output=str(output_dir / relative),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, BatchResult]:
+    """Lees het manifest; per pad telt de laatste regel.
+
+    Een half geschreven laatste regel (na een crash) wordt genegeerd.
+    """
+    results: Dict[str, BatchResult] = {}
+    if not manifest_path.exists():
+        return results
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = BatchResult(**json.loads(line))
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"Ignoring unreadable manifest line in {manifest_path}")
+                continue
+            results[result.path] = result
+    return results
+
+
+def is_done(job: BatchJob, previous: Optional[BatchResult]) -> bool:
+    """Is dit bestand al succesvol verwerkt en sindsdien niet gewijzigd?"""
+    return (
+        previous is not None
+        and previous.status == "ok"
+        and previous.size == job.size
+        and previous.mtime_ns == job.mtime_ns
+        and previous.output is not None
+        and os.path.exists(previous.output)
+    )
+
+
+# Per workerproces: de analyzer wordt één keer geladen (in ``_init_worker``)
+_worker_options: Optional[BatchOptions] = None
+
+
+def _init_worker(options: BatchOptions, subprocess: bool = False) -> None:
+    from src.api.services.text_analyzer import get_text_analyzer
+    from src.api.utils import pdf_parallel
+
+    global _worker_options
+    _worker_options = options
+    if subprocess:
+        # De batch-workers zijn al de parallelle processen; geen pool per worker
+        pdf_parallel.disable()
+    get_text_analyzer(options.nlp_engine)
+    logger.info(f"Batch worker {os.getpid()} loaded '{options.nlp_engine}'")
+
+
+def _write_atomically(path: Path, write: Callable[[str], object]) -> None:
+    # Eerst naar een tijdelijk bestand, zodat een crash geen half bestand achterlaat
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(str(tmp_path))
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def process_job(job: BatchJob) -> BatchResult:
+    """Anonimiseer één bestand (PDF of tekst) met de analyzer van deze worker."""
+    import pymupdf
+
+    from src.api.services.text_analyzer import get_text_analyzer
+    from src.api.utils.lanes import BULK
+    from src.api.utils.pdf_xmp import analyze_pdf, anonymize_pdf
+
+    options = _worker_options or BatchOptions()
+    analyzer = get_text_analyzer(options.nlp_engine)
+    started = time.perf_counter()
+    source, output = Path(job.source), Path(job.output)
+    result = BatchResult(
+        path=job.relative_path,
+        status="ok",
+        output=job.output,
+        size=job.size,
+        mtime_ns=job.mtime_ns,
+    )
+    try:
+        if source.suffix.lower() == ".pdf":
+            with pymupdf.open(job.source) as doc:
+                result.pages = doc.page_count
+            _, found = analyze_pdf(source, nlp_engine=options.nlp_engine)
+            mapping = {
+                e["text"]: e["entity_type"].lower()
+                for e in found
+                if e["entity_type"] in options.entities
+            }
+            _write_atomically(
+                output,
+                lambda tmp: anonymize_pdf(
+                    job.source, tmp, mapping, settings.CRYPTO_KEY.decode()
+                ),
+            )
+            result.entities = len(mapping)
+        else:
+            text = source.read_text(encoding="utf-8")
+            found = [
+                e
+                for e in analyzer.analyze_text(text, priority=BULK)
+                if e["entity_type"] in options.entities
+            ]
+            anonymized = analyzer.anonymize_text(
+                text, strategy=options.strategy, results=found
+            )
+            _write_atomically(
+                output, lambda tmp: Path(tmp).write_text(anonymized, encoding="utf-8")
+            )
+            result.entities = len(found)
+    except Exception as e:
+        logger.error(f"Batch processing of {job.relative_path} failed: {e}")
+        result.status, result.output, result.error = "failed", None, str(e)
+    result.seconds = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(
+    input_dir: Path,
+    output_dir: Path,
+    options: BatchOptions,
+    workers: int = 0,
+    retry_failed: bool = False,
+    progress: Optional[Callable[[BatchResult, BatchSummary], None]] = None,
+) -> BatchSummary:
+    """Anonimiseer alle PDF- en tekstbestanden in een map.
+
+    Elk resultaat wordt direct als regel aan ``manifest.jsonl`` in ``output_dir``
+    toegevoegd (en naar schijf geschreven). Dat manifest is ook het checkpoint: bij
+    een volgende run worden bestanden die al succesvol verwerkt en niet gewijzigd
+    zijn overgeslagen.
+
+    Args:
+        input_dir (Path): map met invoerbestanden (recursief).
+        output_dir (Path): map voor de uitvoer en het manifest.
+        options (BatchOptions): engine, entiteiten en strategie.
+        workers (int, optional): aantal workerprocessen, elk met een eigen
+            geladen model; 0 verwerkt alles in dit proces. Defaults to 0.
+        retry_failed (bool, optional): ook eerder mislukte bestanden opnieuw
+            proberen. Mislukte bestanden worden anders overgeslagen.
+        progress (Callable, optional): aangeroepen na elk bestand.
+
+    Returns:
+        BatchSummary: aantallen en doorvoer (docs/sec, pages/sec).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    previous = load_manifest(manifest_path)
+
+    summary = BatchSummary()
+    jobs: List[BatchJob] = []
+    for job in discover_jobs(input_dir, output_dir):
+        done = previous.get(job.relative_path)
+        if is_done(job, done) or (
+            done is not None and done.status == "failed" and not retry_failed
+        ):
+            summary.skipped += 1
+        else:
+            jobs.append(job)
+    logger.info(f"Batch: {len(jobs)} files to process, {summary.skipped} already done")
+
+    started = time.perf_counter()
+    with open(manifest_path, "a", encoding="utf-8") as manifest:
+        for result in _run_jobs(jobs, options, workers):
+            manifest.write(json.dumps(asdict(result)) + "\n")
+            manifest.flush()
+            os.fsync(manifest.fileno())
+            if result.status == "ok":
+                summary.processed += 1
+                summary.pages += result.pages
+            else:
+                summary.failed += 1
+            summary.seconds = time.perf_counter() - started
+            if progress is not None:
+                progress(result, summary)
+    summary.seconds = time.perf_counter() - started
+    return summary
+
+
+def _run_jobs(
+    jobs: Sequence[BatchJob], options: BatchOptions, workers: int
+) -> Iterator[BatchResult]:
+    if workers <= 0:
+        _init_worker(options)
+        for job in jobs:
+            yield process_job(job)
+        return
+
+    # "spawn": geen threads of modelstatus van dit proces in de workers
+    executor: Executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(options, True),
+    )
+    with executor:
+        futures = [executor.submit(process_job, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+@dataclass
+class StreamSummary:
+    records: int = 0
+    failed: int = 0
+    chars: int = 0
+    seconds: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+def process_records(lines: List[str]) -> Tuple[List[str], int]:
+    """Anonimiseer een batch JSONL-regels (``{"id": .., "text": ..}``).
+
+    De NER draait als één batch via ``analyze_batch``. Een ongeldige regel levert
+    een uitvoerregel met ``error`` op, zodat de uitvoer regel voor regel op de
+    invoer blijft aansluiten.
+
+    Returns:
+        tuple: de JSON-uitvoerregels (in dezelfde volgorde als ``lines``) en het
+            aantal mislukte records.
+    """
+    from src.api.services.text_analyzer import get_text_analyzer
+
+    options = _worker_options or BatchOptions()
+    analyzer = get_text_analyzer(options.nlp_engine)
+
+    records: List[Optional[dict]] = []
+    errors: Dict[int, str] = {}
+    for i, line in enumerate(lines):
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+                raise ValueError("expected an object with a string 'text'")
+            records.append(record)
+        except ValueError as e:
+            records.append(None)
+            errors[i] = f"invalid record: {e}"
+
+    texts = [r["text"] for r in records if r is not None]
+    try:
+        analyzed = iter(analyzer.analyze_batch(texts) if texts else [])
+    except Exception as e:
+        logger.error(f"Stream batch of {len(texts)} records failed: {e}")
+        analyzed = iter([])
+        errors.update({i: str(e) for i, r in enumerate(records) if r is not None})
+
+    output = []
+    for i, record in enumerate(records):
+        if i in errors:
+            record_id = record.get("id") if record is not None else None
+            output.append(json.dumps({"id": record_id, "error": errors[i]}))
+            continue
+        assert record is not None
+        found = [e for e in next(analyzed) if e["entity_type"] in options.entities]
+        output.append(
+            json.dumps(
+                {
+                    "id": record.get("id"),
+                    "text": analyzer.anonymize_text(
+                        record["text"], strategy=options.strategy, results=found
+                    ),
+                    # Zonder de gevonden waarden zelf: die zijn juist de PII
+                    "entities": [
+                        {k: e[k] for k in ("entity_type", "start", "end", "score")}
+                        for e in found
+                    ],
+                },
+                ensure_ascii=False,
+            )
+        )
+    return output, len(errors)
+
+
+def _read_batches(lines: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for line in lines:
+        if not line.strip():
+            continue
+        chunk.append(line)
+        if len(chunk) >= batch_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_jsonl(
+    source: TextIO,
+    sink: TextIO,
+    options: BatchOptions,
+    batch_size: int = 64,
+    workers: int = 0,
+    progress: Optional[Callable[[StreamSummary], None]] = None,
+) -> StreamSummary:
+    """Anonimiseer JSON Lines van ``source`` naar ``sink``.
+
+    De invoer wordt lui gelezen in batches van ``batch_size`` regels. Met workers
+    staan er hooguit ``2 * workers`` batches tegelijk uit; de uitvoer wordt in de
+    invoervolgorde geschreven (de oudste batch eerst). Het geheugengebruik hangt
+    zo af van de batchgrootte en het aantal workers, niet van de invoer.
+
+    Args:
+        source (TextIO): invoer, één JSON-object per regel.
+        sink (TextIO): uitvoer, één JSON-object per invoerregel.
+        options (BatchOptions): engine, entiteiten en strategie.
+        batch_size (int, optional): regels per ``nlp.pipe``-batch. Defaults to 64.
+        workers (int, optional): aantal workerprocessen; 0 verwerkt alles in dit
+            proces. Defaults to 0.
+        progress (Callable, optional): aangeroepen na elke geschreven batch.
+
+    Returns:
+        StreamSummary: aantallen en doorvoer.
+    """
+    summary = StreamSummary()
+    started = time.perf_counter()
+
+    def write(chunk: List[str], result: Tuple[List[str], int]) -> None:
+        output, failed = result
+        for line in output:
+            sink.write(line + "\n")
+        sink.flush()
+        summary.records += len(output)
+        summary.failed += failed
+        summary.chars += sum(len(line) for line in chunk)
+        summary.seconds = time.perf_counter() - started
+        if progress is not None:
+            progress(summary)
+
+    batches = _read_batches(source, max(1, batch_size))
+    if workers <= 0:
+        _init_worker(options)
+        for chunk in batches:
+            write(chunk, process_records(chunk))
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(options, True),
+        )
+        with executor:
+            pending: Deque[Tuple[List[str], Future]] = deque()
+            for chunk in batches:
+                pending.append((chunk, executor.submit(process_records, chunk)))
+                if len(pending) >= 2 * workers:
+                    done_chunk, future = pending.popleft()
+                    write(done_chunk, future.result())
+            while pending:
+                done_chunk, future = pending.popleft()
+                write(done_chunk, future.result())
+    summary.seconds = time.perf_counter() - started
+    return summary
@@ -0,0 +1,311 @@
+import hashlib
+import hmac
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.api.config import settings
+from src.api.database import Pseudonym, PseudonymSessionRecord
+from src.api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Sleutel voor de HMAC van de waarden in de database, afgeleid van CRYPTO_KEY
+_VALUE_KEY = hmac.new(settings.CRYPTO_KEY, b"pseudonym-value", hashlib.sha256).digest()
+
+SessionFactory = Callable[[], Session]
+
+
+def normalize_value(value: str) -> str:
+    """Normaliseer een waarde zodat varianten hetzelfde pseudoniem krijgen.
+
+    Hoofdletters en witruimte (ook regeleinden uit PDF-tekst) tellen niet mee.
+    """
+    return _WHITESPACE.sub(" ", value).strip().casefold()
+
+
+def _value_hash(entity_type: str, normalized: str) -> str:
+    message = f"{entity_type}\x00{normalized}".encode("utf-8")
+    return hmac.new(_VALUE_KEY, message, hashlib.sha256).hexdigest()
+
+
+def _default_session_factory() -> Session:
+    # Pas bij gebruik importeren: dependencies maakt bij import de database aan
+    from src.api.dependencies import SessionLocal
+
+    return SessionLocal()
+
+
+class UnknownSessionError(LookupError):
+    """De pseudoniem-sessie bestaat niet (meer); ``status_code`` voor de API."""
+
+    status_code = 404
+
+
+class PseudonymSession:
+    """Tabel van (entiteitstype, genormaliseerde waarde) naar pseudoniem.
+
+    Deze tabel staat alleen in het geheugen (bijv. voor één tekst zonder sessie);
+    sessies uit de ``PseudonymStore`` staan in de database.
+    """
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self._table: Dict[Tuple[str, str], str] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def pseudonym(self, entity_type: str, value: str) -> str:
+        """Geef het pseudoniem voor een waarde, bijv. ``PERSON_1`` (O(1))."""
+        key = (entity_type, normalize_value(value))
+        pseudonym = self._table.get(key)
+        if pseudonym is None:
+            with self._lock:
+                pseudonym = self._table.get(key)
+                if pseudonym is None:
+                    number = self._number(*key)
+                    pseudonym = self._table[key] = f"{entity_type}_{number}"
+        return pseudonym
+
+    def _number(self, entity_type: str, normalized: str) -> int:
+        number = self._counters.get(entity_type, 0) + 1
+        self._counters[entity_type] = number
+        return number
+
+
+class StoredPseudonymSession(PseudonymSession):
+    """Pseudoniem-sessie in de database, gedeeld door alle workers.
+
+    Van een waarde wordt alleen een HMAC opgeslagen. Een pseudoniem verandert
+    niet meer, dus opgezochte pseudoniemen blijven ook in dit object bewaard.
+    """
+
+    def __init__(self, session_id: str, session_factory: SessionFactory) -> None:
+        super().__init__(session_id)
+        self._session_factory = session_factory
+
+    def __len__(self) -> int:
+        with self._session_factory() as db:
+            return (
+                db.query(Pseudonym)
+                .filter(Pseudonym.session_id == self.session_id)
+                .count()
+            )
+
+    def _number(self, entity_type: str, normalized: str) -> int:
+        value_hash = _value_hash(entity_type, normalized)
+        with self._session_factory() as db:
+            while True:
+                existing: Optional[int] = (
+                    db.query(Pseudonym.number)
+                    .filter(
+                        Pseudonym.session_id == self.session_id,
+                        Pseudonym.entity_type == entity_type,
+                        Pseudonym.value_hash == value_hash,
+                    )
+                    .scalar()
+                )
+                if existing is not None:
+                    return existing
+                last = (
+                    db.query(func.max(Pseudonym.number))
+                    .filter(
+                        Pseudonym.session_id == self.session_id,
+                        Pseudonym.entity_type == entity_type,
+                    )
+                    .scalar()
+                )
+                number = (last or 0) + 1
+                db.add(
+                    Pseudonym(
+                        session_id=self.session_id,
+                        entity_type=entity_type,
+                        value_hash=value_hash,
+                        number=number,
+                    )
+                )
+                try:
+                    db.commit()
+                    return number
+                except IntegrityError:
+                    # Een andere worker was eerst (met deze waarde of dit nummer)
+                    db.rollback()
+
+
+class PseudonymStore:
+    """Begrensde opslag van pseudoniem-sessies in de database.
+
+    Sessies die langer dan ``ttl_seconds`` niet gebruikt zijn vervallen; boven
+    ``max_sessions`` wordt de minst recent gebruikte sessie verwijderd. Dat
+    opruimen (``evict``) gebeurt op een achtergrondthread, niet per verzoek.
+    Sessies worden alleen door de server gemaakt: een onbekend (of vervallen) id
+    van een client geeft een ``UnknownSessionError``, zodat nummers uit
+    verschillende sessies nooit door elkaar lopen.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = settings.PSEUDONYM_MAX_SESSIONS,
+        ttl_seconds: float = settings.PSEUDONYM_SESSION_TTL_SECONDS,
+        session_factory: SessionFactory = _default_session_factory,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._session_factory = session_factory
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_lock = threading.Lock()
+        # Threads overleven een fork (api.py --preload) niet.
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._reaper = None
+        self._reaper_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._session_factory() as db:
+            return db.query(PseudonymSessionRecord).count()
+
+    def session(
+        self, session_id: Optional[str] = None, create: bool = False
+    ) -> StoredPseudonymSession:
+        """Geef de sessie; zonder id wordt een nieuwe sessie gemaakt.
+
+        Args:
+            session_id (str, optional): id van een bestaande sessie.
+            create (bool, optional): maak de sessie met dit id als die nog niet
+                bestaat (voor ids die de server zelf kiest, zoals het document-id).
+
+        Raises:
+            UnknownSessionError: als de sessie niet bestaat en ``create`` False is.
+
+        Returns:
+            StoredPseudonymSession: de sessie.
+        """
+        if session_id is None:
+            session_id, create = uuid.uuid4().hex, True
+        self._ensure_reaper()
+        now = datetime.now()
+        with self._session_factory() as db:
+            record = db.get(PseudonymSessionRecord, session_id)
+            if record is not None and not create and self._expired(record, now):
+                record = None  # wordt door de reaper opgeruimd
+            if record is not None:
+                record.last_used = now
+                db.commit()
+            elif not create:
+                raise UnknownSessionError(
+                    f"Pseudonym session {session_id} not found or expired"
+                )
+            else:
+                db.add(PseudonymSessionRecord(id=session_id, last_used=now))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    db.rollback()  # tegelijk door een andere worker gemaakt
+        return StoredPseudonymSession(session_id, self._session_factory)
+
+    def pseudonym(self, session_id: str, entity_type: str, value: str) -> str:
+        return self.session(session_id).pseudonym(entity_type, value)
+
+    def drop(self, session_id: str) -> bool:
+        with self._session_factory() as db:
+            return self._delete(db, [session_id]) > 0
+
+    def evict(self) -> None:
+        """Verwijder vervallen sessies en de oudste sessies boven het maximum."""
+        with self._session_factory() as db:
+            self._evict_expired(db, datetime.now())
+            self._evict_over_capacity(db)
+            metrics.set_gauge(
+                "pseudonym_sessions", db.query(PseudonymSessionRecord).count()
+            )
+
+    def _ensure_reaper(self) -> None:
+        """Start (eenmalig) een achtergrondthread die ``evict`` periodiek draait."""
+        if self._reaper is not None:
+            return
+        with self._reaper_lock:
+            if self._reaper is not None:
+                return
+            ttl = self.ttl_seconds if self.ttl_seconds > 0 else 60.0
+            interval = max(1.0, min(ttl / 2, 60.0))
+
+            def reap() -> None:
+                while True:
+                    time.sleep(interval)
+                    try:
+                        self.evict()
+                    except Exception as e:  # pragma: no cover
+                        logger.warning(f"Pseudonym session eviction failed: {e}")
+
+            self._reaper = threading.Thread(
+                target=reap, name="pseudonym-reaper", daemon=True
+            )
+            self._reaper.start()
+
+    def _expired(self, record: PseudonymSessionRecord, now: datetime) -> bool:
+        return self.ttl_seconds > 0 and record.last_used < now - timedelta(
+            seconds=self.ttl_seconds
+        )
+
+    def _evict_expired(self, db: Session, now: datetime) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        cutoff = now - timedelta(seconds=self.ttl_seconds)
+        expired = [
+            session_id
+            for (session_id,) in db.query(PseudonymSessionRecord.id).filter(
+                PseudonymSessionRecord.last_used < cutoff
+            )
+        ]
+        evicted = self._delete(db, expired)
+        if evicted:
+            metrics.inc("pseudonym_sessions_evicted_total", evicted, reason="ttl")
+
+    def _evict_over_capacity(self, db: Session) -> None:
+        if self.max_sessions <= 0:
+            return
+        excess = db.query(PseudonymSessionRecord).count() - self.max_sessions
+        if excess <= 0:
+            return
+        oldest = [
+            session_id
+            for (session_id,) in db.query(PseudonymSessionRecord.id)
+            .order_by(PseudonymSessionRecord.last_used)
+            .limit(excess)
+        ]
+        evicted = self._delete(db, oldest)
+        if evicted:
+            metrics.inc("pseudonym_sessions_evicted_total", evicted, reason="capacity")
+
+    @staticmethod
+    def _delete(db: Session, session_ids: list) -> int:
+        if not session_ids:
+            return 0
+        db.query(Pseudonym).filter(Pseudonym.session_id.in_(session_ids)).delete(
+            synchronize_session=False
+        )
+        deleted = (
+            db.query(PseudonymSessionRecord)
+            .filter(PseudonymSessionRecord.id.in_(session_ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+
+
+pseudonym_store = PseudonymStore()
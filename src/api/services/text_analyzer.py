@@ -1,11 +1,40 @@
+import hashlib
+import importlib.metadata
+import json
 import logging
-from typing import List, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry, RecognizerResult
-from presidio_analyzer.nlp_engine import NlpEngineProvider
+from presidio_analyzer import (
+    AnalyzerEngine,
+    EntityRecognizer,
+    RecognizerRegistry,
+    RecognizerResult,
+)
+from presidio_analyzer.nlp_engine import SpacyNlpEngine
+from spacy.language import Language
 
 from src.api.config import settings
-from src.api.utils.nlp.loader import load_nlp_engine
+from src.api.services.pseudonyms import pseudonym_store
+from src.api.utils.allowlist import get_allow_list
+from src.api.utils.anonymizer import anonymize_text
+from src.api.utils.deadline import Deadline, check_deadline
+from src.api.utils.lanes import INTERACTIVE
+from src.api.utils.metrics import metrics
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.loader import default_model_name
+from src.api.utils.nlp.manager import model_manager
+from src.api.utils.nlp.scheduler import get_scheduler
+from src.api.utils.nlp.segment_cache import (
+    SegmentKey,
+    segment_cache,
+    segment_hash,
+    split_segments,
+)
+from src.api.utils.nlp.spacy_engine import load_spacy_pipeline
 from src.api.utils.patterns import (
     CaseNumberRecognizer,
     DutchBSNRecognizer,
@@ -16,6 +45,144 @@ from src.api.utils.patterns import (
     DutchPhoneNumberRecognizer,
     EmailRecognizer,
 )
+from src.api.utils.spans import merge_spans
+
+_pattern_analyzer: Optional[AnalyzerEngine] = None
+_pattern_analyzer_lock = threading.Lock()
+
+
+class _ProfiledSpacyNlpEngine(SpacyNlpEngine):
+    """Presidio's spaCy-engine, met het model geladen volgens een componentprofiel.
+
+    Zo worden componenten die de pattern recognizers niet gebruiken (zie
+    PATTERN_SPACY_PIPELINE_PROFILE) niet geladen.
+    """
+
+    # Presidio zet nlp in een ongetypeerde __init__ op None; na load() een dict
+    nlp: Optional[Dict[str, Language]]  # type: ignore[assignment]
+
+    def __init__(self, model_name: str, language: str, profile: str) -> None:
+        super().__init__(models=[{"lang_code": language, "model_name": model_name}])
+        self.model_name = model_name
+        self.language = language
+        self.profile = profile
+
+    def load(self) -> None:
+        self._download_spacy_model_if_needed(self.model_name)
+        self.nlp = {self.language: load_spacy_pipeline(self.model_name, self.profile)}
+
+
+def _create_pattern_analyzer() -> AnalyzerEngine:
+    spacy_config = {
+        "nlp_engine_name": "spacy",  # Presidio only supports spacy
+        "models": [
+            {
+                "lang_code": settings.DEFAULT_LANGUAGE,
+                # Always use SpaCy model for Presidio
+                "model_name": settings.DEFAULT_SPACY_MODEL,
+            }
+        ],
+    }
+
+    presidio_spacy_engine = _ProfiledSpacyNlpEngine(
+        settings.DEFAULT_SPACY_MODEL,
+        settings.DEFAULT_LANGUAGE,
+        settings.PATTERN_SPACY_PIPELINE_PROFILE,
+    )
+
+    # reuse the recognizer registry for the analyzer engine
+    registry = RecognizerRegistry()
+    registry.supported_languages = [settings.DEFAULT_LANGUAGE]
+
+    recognizers_to_add: list[EntityRecognizer] = [
+        DutchPhoneNumberRecognizer(),
+        DutchIBANRecognizer(),
+        DutchBSNRecognizer(),
+        DutchDateRecognizer(),
+        EmailRecognizer(),
+        DutchPassportIdRecognizer(),
+        DutchDriversLicenseRecognizer(),
+        CaseNumberRecognizer(),
+    ]
+    if settings.GAZETTEER_PATH:
+        from src.api.utils.gazetteer import GazetteerRecognizer
+
+        recognizers_to_add.append(
+            GazetteerRecognizer(settings.GAZETTEER_PATH, settings.DEFAULT_LANGUAGE)
+        )
+    for recognizer in recognizers_to_add:
+        registry.add_recognizer(recognizer=recognizer)
+
+    # Initialiseer de AnalyzerEngine met SpaCy-engine voor pattern recognizers
+    analyzer = AnalyzerEngine(
+        nlp_engine=presidio_spacy_engine,
+        registry=registry,
+        supported_languages=registry.supported_languages,
+    )
+    logging.debug(
+        f"Pattern analyzer is initialized with {len(recognizers_to_add)} "
+        f"recognizers, {spacy_config=}"
+    )
+    return analyzer
+
+
+def get_pattern_analyzer() -> AnalyzerEngine:
+    """Geef de gedeelde Presidio AnalyzerEngine voor de pattern recognizers.
+
+    Deze is onafhankelijk van de gekozen NLP-engine en wordt daarom door alle
+    analyzers gedeeld in plaats van per engine een eigen SpaCy-model te laden.
+    """
+    global _pattern_analyzer
+    if _pattern_analyzer is None:
+        with _pattern_analyzer_lock:
+            if _pattern_analyzer is None:
+                _pattern_analyzer = _create_pattern_analyzer()
+    return _pattern_analyzer
+
+
+_stage_pool: Optional[ThreadPoolExecutor] = None
+_stage_pool_lock = threading.Lock()
+
+
+def _get_stage_pool() -> Optional[ThreadPoolExecutor]:
+    """Geef de thread-pool waarop de pattern-analyse naast de NER draait.
+
+    Met ``ANALYSIS_STAGE_THREADS=0`` draaien de stages na elkaar.
+    """
+    global _stage_pool
+    if settings.ANALYSIS_STAGE_THREADS <= 0:
+        return None
+    if _stage_pool is None:
+        with _stage_pool_lock:
+            if _stage_pool is None:
+                _stage_pool = ThreadPoolExecutor(
+                    max_workers=settings.ANALYSIS_STAGE_THREADS,
+                    thread_name_prefix="analysis-stage",
+                )
+    return _stage_pool
+
+
+def _reset_stage_pool() -> None:
+    # De threads van de pool bestaan niet meer na een fork (api.py --preload)
+    global _stage_pool, _stage_pool_lock
+    _stage_pool = None
+    _stage_pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_stage_pool)
+
+
+def _record_stage_timings(ner: float, patterns: float, total: float) -> None:
+    # overlap > 0: de stages liepen (deels) tegelijk; totaal ~ max(ner, patterns)
+    overlap = max(0.0, ner + patterns - total)
+    metrics.observe("analysis_stage_seconds", ner, stage="ner")
+    metrics.observe("analysis_stage_seconds", patterns, stage="patterns")
+    metrics.observe("analysis_stage_seconds", total, stage="total")
+    metrics.observe("analysis_stage_overlap_seconds", overlap)
+    logging.debug(
+        f"Analysis stages: ner={ner * 1000:.1f}ms, patterns={patterns * 1000:.1f}ms, "
+        f"total={total * 1000:.1f}ms, overlap={overlap * 1000:.1f}ms"
+    )
 
 
 class ModularTextAnalyzer:
@@ -40,61 +207,31 @@ class ModularTextAnalyzer:
         nlp_engine: str = settings.DEFAULT_NLP_ENGINE,
     ) -> None:
         if model_name is None:
-            model_name = (
-                settings.DEFAULT_SPACY_MODEL
-                if nlp_engine == "spacy"
-                else settings.DEFAULT_TRANSFORMERS_MODEL
-            )
-        self.nlp_engine = load_nlp_engine(
-            config_dict={"nlp_engine": nlp_engine, "model_name": model_name}
-        )
+            model_name = default_model_name(nlp_engine)
+        self.engine_type = nlp_engine
+        self.model_name = model_name
+        # Laad (of hergebruik) de engine direct, zodat fouten bij het aanmaken optreden
+        model_manager.get(nlp_engine, model_name)
 
         # Presidio always uses SpaCy for pattern recognizers, regardless of our NLP engine choice
-        spacy_config = {
-            "nlp_engine_name": "spacy",  # Presidio only supports spacy
-            "models": [
-                {
-                    "lang_code": settings.DEFAULT_LANGUAGE,
-                    "model_name": settings.DEFAULT_SPACY_MODEL,  # Always use SpaCy model for Presidio
-                }
-            ],
-        }
+        self.analyzer = get_pattern_analyzer()
 
-        spacy_provider = NlpEngineProvider(nlp_configuration=spacy_config)
-        presidio_spacy_engine = spacy_provider.create_engine()
-
-        # reuse the recognizer registry for the analyzer engine
-        registry = RecognizerRegistry()
-        registry.supported_languages = [settings.DEFAULT_LANGUAGE]
-
-        recognizers_to_add = [
-            DutchPhoneNumberRecognizer(),
-            DutchIBANRecognizer(),
-            DutchBSNRecognizer(),
-            DutchDateRecognizer(),
-            EmailRecognizer(),
-            DutchPassportIdRecognizer(),
-            DutchDriversLicenseRecognizer(),
-            CaseNumberRecognizer(),
-        ]
-        for recognizer in recognizers_to_add:
-            registry.add_recognizer(recognizer=recognizer)
-
-        # Initialiseer de AnalyzerEngine met SpaCy-engine voor pattern recognizers
-        self.analyzer = AnalyzerEngine(
-            nlp_engine=presidio_spacy_engine,
-            registry=registry,
-            supported_languages=registry.supported_languages,
-        )
-        logging.debug(
-            f"ModularTextAnalyzer is initialized with {len(recognizers_to_add)} recognizers, {spacy_config=}"
-        )
+    @property
+    def nlp_engine(self) -> NLPEngine:
+        """De NLP-engine van deze analyzer, via de model manager.
+
+        De analyzer houdt zelf geen referentie vast, zodat de model manager het model
+        kan ontladen (LRU/idle); bij het volgende gebruik wordt het opnieuw geladen.
+        """
+        return model_manager.get(self.engine_type, self.model_name)
 
     def analyze_text(
         self,
         text: str,
         entities: list = settings.DEFAULT_ENTITIES,
         language: str = settings.DEFAULT_LANGUAGE,
+        deadline: Optional[Deadline] = None,
+        priority: str = INTERACTIVE,
     ) -> list:
         """Analyseer tekst met behulp van de NLP-engine en pattern recognizers.
 
@@ -102,28 +239,172 @@ class ModularTextAnalyzer:
             text (str): de tekst om te analyseren.
             entities (list, optional): entities om te analyseren. Defaults to DEFAULT_ENTITIES.
             language (str, optional): taal om in te analyseren. Defaults to DEFAULT_LANGUAGE.
+            deadline (Deadline, optional): gecontroleerd vóór en tussen de stages.
+            priority (str, optional): INTERACTIVE gebruikt de gedeelde micro-batching
+                scheduler en stage-pool; BULK (PDF's) draait alles op de eigen
+                thread, zodat een lange tekst niet vóór interactieve verzoeken in
+                de wachtrij staat. Defaults to INTERACTIVE.
+
+        Raises:
+            OperationCancelled: als de deadline verstreken of het verzoek
+                geannuleerd is.
 
         Returns:
             list: lijst van gedetecteerde entiteiten met hun start- en eindposities, type en score.
         """
         logging.debug(f"Analyzing text with {entities=} and {language=}")
+        check_deadline(deadline, "analyze")
 
-        # Analyze with NLP engine (supports entity filtering)
-        nlp_results = self.nlp_engine.analyze(text, entities, language)
+        # NER en de pattern recognizers zijn onafhankelijk: de patterns draaien op
+        # de stage-pool terwijl deze thread de NER doet
+        started = time.perf_counter()
+        interactive = priority == INTERACTIVE
+        pool = _get_stage_pool() if interactive else None
+        pattern_future = (
+            pool.submit(self._analyze_patterns, text, language) if pool else None
+        )
+        ner_started = time.perf_counter()
+        nlp_results = self._analyze_ner(
+            [text], entities, language, deadline, interactive
+        )[0]
+        ner_seconds = time.perf_counter() - ner_started
+        check_deadline(deadline, "analyze")
         print(f"nlp_results: {nlp_results}")
 
-        # Use pattern recognizers via Presidio AnalyzerEngine (detect ALL patterns first)
-        try:
-            pattern_results: List[RecognizerResult] = self.analyzer.analyze(
-                text=text,
-                entities=None,
-                language=language,  # Don't filter here
+        if pattern_future is not None:
+            pattern_results, pattern_seconds = pattern_future.result()
+        else:
+            pattern_results, pattern_seconds = self._analyze_patterns(text, language)
+        print(f"pattern_results: {pattern_results}")
+        _record_stage_timings(
+            ner_seconds, pattern_seconds, time.perf_counter() - started
+        )
+        return self._combine_results(text, nlp_results, pattern_results, entities)
+
+    def analyze_batch(
+        self,
+        texts: List[str],
+        entities: list = settings.DEFAULT_ENTITIES,
+        language: str = settings.DEFAULT_LANGUAGE,
+    ) -> List[list]:
+        """Analyseer meerdere teksten; de NER draait als één batch (``nlp.pipe``).
+
+        Bedoeld voor offline verwerking (cli.py stream): geen scheduler of
+        stage-pool, de aanroeper bepaalt zelf de batchgrootte.
+
+        Args:
+            texts (list): de teksten om te analyseren.
+            entities (list, optional): entities om te analyseren. Defaults to
+                DEFAULT_ENTITIES.
+            language (str, optional): taal om in te analyseren. Defaults to
+                DEFAULT_LANGUAGE.
+
+        Returns:
+            list: per tekst de resultaten zoals ``analyze_text``, in dezelfde volgorde.
+        """
+        started = time.perf_counter()
+        nlp_batch = self._analyze_ner(texts, entities, language)
+        ner_seconds = time.perf_counter() - started
+        combined = []
+        pattern_seconds = 0.0
+        for text, nlp_results in zip(texts, nlp_batch):
+            pattern_results, seconds = self._analyze_patterns(text, language)
+            pattern_seconds += seconds
+            combined.append(
+                self._combine_results(text, nlp_results, pattern_results, entities)
             )
-            print(f"pattern_results: {pattern_results}")
-        except Exception as e:
-            logging.warning(f"Pattern analysis failed: {e}")
-            pattern_results = []
+        _record_stage_timings(
+            ner_seconds, pattern_seconds, time.perf_counter() - started
+        )
+        return combined
+
+    def _analyze_ner(
+        self,
+        texts: List[str],
+        entities: list,
+        language: str,
+        deadline: Optional[Deadline] = None,
+        interactive: bool = False,
+    ) -> List[list]:
+        """NER per tekst, via de segmentcache als die aan staat.
+
+        Elke tekst wordt in alinea's (of zinnen) verdeeld; segmenten die al in de
+        cache staan gaan niet door het model, de rest gaat samen als één batch. De
+        offsets worden daarna teruggerekend naar de volledige tekst. De pattern
+        recognizers draaien niet per segment maar op de hele tekst, zodat hun
+        context over de grenzen van alinea's heen gewoon klopt.
+        """
+        if not segment_cache.enabled:
+            return self._run_ner(texts, entities, language, deadline, interactive)
+
+        entity_key = tuple(entities) if entities else None
+        segments: List[List[Tuple[int, SegmentKey]]] = []
+        known: Dict[SegmentKey, list] = {}
+        missing: Dict[SegmentKey, str] = {}
+        for text in texts:
+            keyed = []
+            for start, end in split_segments(
+                text, settings.ANALYSIS_CACHE_SEGMENT_MAX_CHARS
+            ):
+                segment = text[start:end]
+                key = (
+                    self.engine_type,
+                    self.model_name,
+                    language,
+                    entity_key,
+                    segment_hash(segment),
+                )
+                keyed.append((start, key))
+                if key not in known and key not in missing:
+                    results = segment_cache.get(key)
+                    if results is None:
+                        missing[key] = segment
+                    else:
+                        known[key] = results
+            segments.append(keyed)
+
+        if missing:
+            found = self._run_ner(
+                list(missing.values()), entities, language, deadline, interactive
+            )
+            for key, results in zip(missing, found):
+                segment_cache.put(key, results)
+                known[key] = results
+
+        return [
+            [
+                {**r, "start": r["start"] + start, "end": r["end"] + start}
+                for start, key in keyed
+                for r in known[key]
+            ]
+            for keyed in segments
+        ]
+
+    def _run_ner(
+        self,
+        texts: List[str],
+        entities: list,
+        language: str,
+        deadline: Optional[Deadline],
+        interactive: bool,
+    ) -> List[list]:
+        if settings.INFERENCE_MAX_BATCH_SIZE > 1 and interactive:
+            # Gelijktijdige verzoeken worden door de scheduler samen als één batch
+            # uitgevoerd
+            return get_scheduler(self.engine_type, self.model_name).analyze_many(
+                texts, entities, language, deadline
+            )
+        if len(texts) == 1:
+            return [self.nlp_engine.analyze(texts[0], entities, language)]
+        return self.nlp_engine.analyze_batch(texts, entities, language)
 
+    def _combine_results(
+        self,
+        text: str,
+        nlp_results: list,
+        pattern_results: List[RecognizerResult],
+        entities: list,
+    ) -> list:
         # Convert pattern results to dict format
         pattern_dicts = [
             {
@@ -132,6 +413,9 @@ class ModularTextAnalyzer:
                 "end": r.end,
                 "score": r.score,
                 "text": text[r.start : r.end],
+                "recognizer": (r.recognition_metadata or {}).get(
+                    RecognizerResult.RECOGNIZER_NAME_KEY
+                ),
             }
             for r in pattern_results
         ]
@@ -143,22 +427,34 @@ class ModularTextAnalyzer:
         if entities and entities != settings.DEFAULT_ENTITIES:
             all_results = [r for r in all_results if r["entity_type"] in entities]
 
-        # Deduplication based on start, end, entity_type
-        seen = set()
-        unique_results = []
-        for r in all_results:
-            key = (r["start"], r["end"], r["entity_type"])
-            if key not in seen:
-                unique_results.append(r)
-                seen.add(key)
+        # Los duplicaten en overlappende spans op (SPAN_MERGE_POLICY) en laat
+        # waarden op de allow-list weg
+        return merge_spans(all_results, allow_list=get_allow_list())
 
-        return unique_results
+    def _analyze_patterns(
+        self, text: str, language: str
+    ) -> Tuple[List[RecognizerResult], float]:
+        """Voer de Presidio pattern recognizers uit (alle patterns, niet gefilterd)."""
+        started = time.perf_counter()
+        try:
+            results: List[RecognizerResult] = self.analyzer.analyze(
+                text=text,
+                entities=None,
+                language=language,  # Don't filter here
+            )
+        except Exception as e:
+            logging.warning(f"Pattern analysis failed: {e}")
+            results = []
+        return results, time.perf_counter() - started
 
     def anonymize_text(
         self,
         text: str,
         entities: Optional[List] = None,
         language: str = settings.DEFAULT_LANGUAGE,
+        strategy: str = "replace",
+        results: Optional[List[dict]] = None,
+        session_id: Optional[str] = None,
     ) -> str:
         """Function to anonymize text by replacing detected entities with placeholders.
 
@@ -166,19 +462,136 @@ class ModularTextAnalyzer:
             text (str): the text to anonymize.
             entities (list, optional): the entities to anonymize. Defaults to None.
             language (str, optional): the language to anonymize in. Defaults to DEFAULT_LANGUAGE.
+            strategy (str, optional): replace, mask, redact, hash or pseudonymize.
+                Defaults to "replace".
+            results (list, optional): results of an earlier ``analyze_text`` call on
+                the same text; the text is only analyzed when these are not given.
+            session_id (str, optional): an existing pseudonym session (see
+                ``pseudonym_store.session``); the same value gets the same
+                ``<TYPE_n>`` placeholder in every text of the session.
+
+        Raises:
+            UnknownSessionError: if the pseudonym session does not exist.
 
         Returns:
             str: the anonymized text with placeholders for detected entities.
         """
-        results = self.analyze_text(text, entities, language)  # type: ignore
-
-        # Sorteer op start, zodat vervangen van achter naar voren kan
-        sorted_results = sorted(results, key=lambda x: x["start"], reverse=True)
-        anonymized = text
-        for ent in sorted_results:
-            anonymized = (
-                anonymized[: ent["start"]]
-                + f"<{ent['entity_type']}>"
-                + anonymized[ent["end"] :]
-            )
-        return anonymized
+        if results is None:
+            results = self.analyze_text(text, entities, language)  # type: ignore
+        session = (
+            pseudonym_store.session(session_id)
+            if strategy == "pseudonymize" and session_id
+            else None
+        )
+        return anonymize_text(text, results, strategy, session=session)
+
+
+_analyzers: dict[tuple[str, Optional[str]], ModularTextAnalyzer] = {}
+_analyzers_lock = threading.Lock()
+
+
+def get_text_analyzer(
+    nlp_engine: str = settings.DEFAULT_NLP_ENGINE,
+    model_name: Optional[str] = None,
+) -> ModularTextAnalyzer:
+    """Geef een gedeelde ModularTextAnalyzer terug voor de gekozen engine.
+
+    Het laden van de modellen kost seconden en honderden MB's; daarom wordt per
+    (engine, model) één analyzer per proces aangemaakt en hergebruikt.
+
+    Args:
+        nlp_engine (str, optional): de NLP-engine. Defaults to DEFAULT_NLP_ENGINE.
+        model_name (str, optional): modelnaam; None voor het standaardmodel.
+
+    Returns:
+        ModularTextAnalyzer: de (gecachte) analyzer.
+    """
+    key = (nlp_engine, model_name)
+    analyzer = _analyzers.get(key)
+    if analyzer is None:
+        with _analyzers_lock:
+            analyzer = _analyzers.get(key)
+            if analyzer is None:
+                analyzer = ModularTextAnalyzer(
+                    model_name=model_name, nlp_engine=nlp_engine
+                )
+                _analyzers[key] = analyzer
+    return analyzer
+
+
+_fingerprints: dict[str, str] = {}
+
+
+def _package_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return ""  # bijv. een model van de Hugging Face Hub
+
+
+def _file_digest(path: str) -> str:
+    if not path:
+        return ""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def analyzer_fingerprint(nlp_engine: str = settings.DEFAULT_NLP_ENGINE) -> str:
+    """Vingerafdruk van alles wat de uitkomst van een analyse bepaalt.
+
+    Engine, modellen (met versie), de instellingen voor het samenvoegen en
+    valideren van spans en de SHA-256 van de allow-list en het gazetteer. Een
+    opgeslagen analyse wordt alleen hergebruikt bij dezelfde vingerafdruk. Net als
+    de allow-list en het gazetteer zelf wordt die één keer per proces bepaald.
+
+    Args:
+        nlp_engine (str, optional): de NLP-engine. Defaults to DEFAULT_NLP_ENGINE.
+
+    Returns:
+        str: SHA-256 (hex) van de configuratie.
+    """
+    fingerprint = _fingerprints.get(nlp_engine)
+    if fingerprint is None:
+        model_name = default_model_name(nlp_engine)
+        config = {
+            "app": _package_version("OpenAnonymizer"),
+            "engine": nlp_engine,
+            "model": [model_name, _package_version(model_name)],
+            "spacy_model": [
+                settings.DEFAULT_SPACY_MODEL,
+                _package_version(settings.DEFAULT_SPACY_MODEL),
+            ],
+            "escalation": settings.CASCADE_ESCALATION_ENGINE,
+            "profiles": [
+                settings.SPACY_PIPELINE_PROFILE,
+                settings.PATTERN_SPACY_PIPELINE_PROFILE,
+            ],
+            "merge": [settings.SPAN_MERGE_POLICY, settings.SPAN_TYPE_PRIORITY],
+            "checksum": [
+                settings.CHECKSUM_INVALID_ACTION,
+                settings.CHECKSUM_INVALID_SCORE,
+            ],
+            "gazetteer": [
+                _file_digest(settings.GAZETTEER_PATH),
+                settings.GAZETTEER_DEFAULT_ENTITY,
+                settings.GAZETTEER_SCORE,
+            ],
+            "allow_list": _file_digest(settings.ALLOW_LIST_PATH),
+        }
+        fingerprint = hashlib.sha256(
+            json.dumps(config, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        _fingerprints[nlp_engine] = fingerprint
+    return fingerprint
+
+
+def preload_analyzers(nlp_engines: Optional[List[str]] = None) -> None:
+    """Laad de analyzers voor de opgegeven engines alvast in het geheugen.
+
+    Args:
+        nlp_engines (list, optional): engines om te laden. Defaults to
+            settings.PRELOAD_NLP_ENGINES.
+    """
+    for nlp_engine in nlp_engines or settings.PRELOAD_NLP_ENGINES:
+        logging.info(f"Preloading analyzer for NLP engine '{nlp_engine}'")
+        get_text_analyzer(nlp_engine)
@@ -0,0 +1,180 @@
+import logging
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.api.config import settings
+from src.api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Korte tekst die NER (naam, plaats) en de pattern recognizers (e-mail, IBAN,
+# telefoon, datum) raakt, zodat alle caches en lazy initialisaties gevuld worden.
+WARMUP_TEXT = (
+    "Jan Jansen woont in Amsterdam en is bereikbaar via jan@example.com of "
+    "06-12345678. IBAN NL91ABNA0417164300, geboren op 01-02-1980."
+)
+
+
+@dataclass
+class ModelLoadState:
+    nlp_engine: str
+    state: str = "pending"  # pending, loading, loaded, failed
+    load_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class WarmupState:
+    """Voortgang van de opstart-warmup, gerapporteerd door /health/ready."""
+
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    ready: bool = False
+    # Alle pogingen mislukt: /health/live faalt, zodat het proces herstart wordt
+    failed: bool = False
+    attempts: int = 0
+    error: Optional[str] = None
+    models: Dict[str, ModelLoadState] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return round(end - self.started_at, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "warmup_duration_seconds": self.duration_seconds,
+                "warmup_attempts": self.attempts,
+                "warmup_error": self.error,
+                "models": {
+                    name: {
+                        "state": m.state,
+                        "load_seconds": m.load_seconds,
+                        "error": m.error,
+                    }
+                    for name, m in self.models.items()
+                },
+            }
+
+
+warmup_state = WarmupState()
+
+
+def _warmup_pdf_path(analyzer: Any) -> None:
+    """Draai een minimale PDF door extractie, zoeken en redactie."""
+    import pymupdf
+
+    from src.api.utils import pdf_xmp
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "warmup.pdf"
+        target = Path(tmp) / "warmup_anonymized.pdf"
+        doc = pymupdf.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), WARMUP_TEXT[:60])
+        doc.save(str(source))
+        doc.close()
+
+        text = pdf_xmp.extract_text_from_pdf(source)
+        entities = analyzer.analyze_text(text) if text else []
+        mapping = {e["text"]: e["entity_type"].lower() for e in entities}
+        pdf_xmp.anonymize_pdf(
+            str(source), str(target), mapping, settings.CRYPTO_KEY.decode()
+        )
+
+
+def _warmup_once(state: WarmupState, engines: List[str]) -> None:
+    from src.api.services.text_analyzer import get_text_analyzer
+
+    with state._lock:
+        for engine in engines:
+            state.models[engine] = ModelLoadState(nlp_engine=engine)
+
+    for engine in engines:
+        model_state = state.models[engine]
+        model_state.state = "loading"
+        start = time.perf_counter()
+        try:
+            analyzer = get_text_analyzer(engine)
+            analyzer.analyze_text(WARMUP_TEXT)
+        except Exception as e:
+            model_state.state = "failed"
+            model_state.error = str(e)
+            raise
+        model_state.load_seconds = round(time.perf_counter() - start, 3)
+        model_state.state = "loaded"
+        logger.info(f"Warmup: engine '{engine}' loaded in {model_state.load_seconds}s")
+
+    default_analyzer = get_text_analyzer()
+    default_analyzer.anonymize_text(WARMUP_TEXT)
+    _warmup_pdf_path(default_analyzer)
+
+
+def run_warmup(state: WarmupState = warmup_state) -> None:
+    """Laad de geconfigureerde analyzers en voer een dummy-inferentie uit.
+
+    Per engine wordt de laadstatus bijgehouden. Daarna wordt een korte tekst door
+    NER en de pattern recognizers gehaald en een kleine PDF door het PDF-pad, zodat
+    het eerste echte verzoek geen laad- en initialisatiekosten meer betaalt.
+
+    Een mislukte poging wordt tot WARMUP_MAX_ATTEMPTS keer herhaald, met een
+    wachttijd die vanaf WARMUP_RETRY_BACKOFF_SECONDS steeds verdubbelt. Mislukken
+    alle pogingen, dan wordt ``failed`` gezet en faalt ook /health/live, zodat
+    Kubernetes de container herstart.
+    """
+    state.started_at = time.monotonic()
+    engines = settings.PRELOAD_NLP_ENGINES or [settings.DEFAULT_NLP_ENGINE]
+    max_attempts = max(1, settings.WARMUP_MAX_ATTEMPTS)
+    backoff = settings.WARMUP_RETRY_BACKOFF_SECONDS
+
+    try:
+        while True:
+            state.attempts += 1
+            try:
+                _warmup_once(state, engines)
+            except Exception as e:
+                logger.error(
+                    f"Warmup attempt {state.attempts}/{max_attempts} failed: {e}",
+                    exc_info=True,
+                )
+                state.error = str(e)
+                if state.attempts >= max_attempts:
+                    state.failed = True
+                    return
+                time.sleep(backoff)
+                backoff *= 2
+                continue
+            state.error = None
+            state.ready = True
+            return
+    finally:
+        state.finished_at = time.monotonic()
+        metrics.set_gauge("warmup_duration_seconds", state.duration_seconds or 0)
+        logger.info(
+            f"Warmup finished in {state.duration_seconds}s (ready={state.ready})"
+        )
+
+
+def start_warmup(state: WarmupState = warmup_state) -> Optional[threading.Thread]:
+    """Start de warmup op een achtergrondthread, zodat /health/live direct antwoordt.
+
+    Met ``WARMUP_ON_STARTUP=false`` wordt de warmup overgeslagen en is de service
+    direct ready (modellen laden dan bij het eerste verzoek).
+    """
+    if not settings.WARMUP_ON_STARTUP:
+        state.ready = True
+        return None
+    thread = threading.Thread(
+        target=run_warmup, args=(state,), name="warmup", daemon=True
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from src.api.config import settings
+from src.api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """Het verzoek is niet toegelaten.
+
+    De client kan het na ``retry_after`` seconden opnieuw proberen.
+    """
+
+    def __init__(self, lane: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"Too many {lane} requests ({reason})")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """Begrenst het aantal gelijktijdige verzoeken van één soort (lane).
+
+    Maximaal ``max_concurrent`` verzoeken worden tegelijk uitgevoerd, maximaal
+    ``max_queue`` wachten daarop (FIFO). Is de wachtrij vol, of wacht een verzoek
+    langer dan ``queue_timeout`` seconden, dan volgt direct ``Overloaded`` (HTTP 429)
+    in plaats van een onbegrensde wachtrij in het geheugen.
+
+    De ``Retry-After`` wordt geschat uit de gemiddelde duur van een verzoek en het
+    aantal wachtenden. Niet thread-safe: bedoeld voor gebruik vanuit de event loop.
+    """
+
+    def __init__(
+        self,
+        lane: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ) -> None:
+        """Initialiseer de limiter.
+
+        Args:
+            lane (str): naam voor de metrics, bijv. "text" of "document".
+            max_concurrent (int): gelijktijdige verzoeken; 0 = onbeperkt.
+            max_queue (int): wachtende verzoeken bovenop ``max_concurrent``.
+            queue_timeout (float, optional): maximale wachttijd in seconden.
+                Defaults to settings.ADMISSION_QUEUE_TIMEOUT_SECONDS.
+        """
+        self.lane = lane
+        self.max_concurrent = max_concurrent
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._avg_seconds = 1.0  # voortschrijdend gemiddelde duur van een verzoek
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Geschatte seconden tot er plaats is voor een nieuw verzoek."""
+        slots = max(1, self.max_concurrent)
+        return max(1, math.ceil((self.queued + 1) * self._avg_seconds / slots))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "avg_seconds": round(self._avg_seconds, 3),
+        }
+
+    def _report(self) -> None:
+        metrics.set_gauge("admission_running", self.running, lane=self.lane)
+        metrics.set_gauge("admission_queued", self.queued, lane=self.lane)
+
+    def _reject(self, reason: str) -> Overloaded:
+        metrics.inc("admission_rejected_total", lane=self.lane, reason=reason)
+        return Overloaded(self.lane, reason, self.retry_after())
+
+    def check_capacity(self) -> None:
+        """Weiger nu al als een nieuw verzoek geen plek en geen wachtplek zou krijgen.
+
+        Voor streaming-verzoeken, die hun plek pas in de stream zelf innemen maar
+        een volle lane wel met een echte 429 willen melden.
+
+        Raises:
+            Overloaded: als de lane en de wachtrij vol zijn.
+        """
+        if (
+            self.max_concurrent > 0
+            and self.running >= self.max_concurrent
+            and self.queued >= self.max_queue
+        ):
+            raise self._reject("queue_full")
+
+    async def acquire(self) -> None:
+        """Wacht op een plek.
+
+        Raises:
+            Overloaded: als de wachtrij vol is of de wachttijd verstreken.
+        """
+        if self.max_concurrent <= 0:
+            self.running += 1
+            return
+        if self.running < self.max_concurrent and not self._waiters:
+            self.running += 1
+            self._report()
+            return
+        if self.queued >= self.max_queue:
+            raise self._reject("queue_full")
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._report()
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter),
+                timeout=self.queue_timeout if self.queue_timeout > 0 else None,
+            )
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Net op tijd een plek gekregen
+                return
+            self._waiters.remove(waiter)
+            raise self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            # Client weg tijdens het wachten: een eventueel gekregen plek teruggeven
+            if waiter.done():
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        finally:
+            metrics.observe(
+                "admission_queue_wait_ms",
+                (time.monotonic() - started) * 1000,
+                lane=self.lane,
+            )
+            self._report()
+
+    def release(self, seconds: Optional[float] = None) -> None:
+        """Geef de plek vrij (aan de eerste wachtende); werk de gemiddelde duur bij."""
+        if seconds is not None:
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * seconds
+        # De plek gaat direct over naar de volgende wachtende; running blijft gelijk
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._report()
+                return
+        self.running -= 1
+        self._report()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+
+# Goedkope tekstverzoeken en dure PDF-verzoeken hebben elk hun eigen limiet
+admission_limiters: Dict[str, AdmissionLimiter] = {
+    "text": AdmissionLimiter(
+        "text",
+        settings.ADMISSION_TEXT_MAX_CONCURRENT,
+        settings.ADMISSION_TEXT_MAX_QUEUE,
+    ),
+    "document": AdmissionLimiter(
+        "document",
+        settings.ADMISSION_DOCUMENT_MAX_CONCURRENT,
+        settings.ADMISSION_DOCUMENT_MAX_QUEUE,
+    ),
+}
+
+_TEXT_PATHS = ("/api/v1/analyze", "/api/v1/anonymize")
+_DOCUMENT_PREFIX = "/api/v1/documents/"
+
+
+def lane_for_request(method: str, path: str) -> Optional[str]:
+    """Bepaal de lane van een verzoek, of None als er geen limiet geldt.
+
+    De ``/stream``-varianten vallen hier buiten: die nemen hun plek in de
+    document-lane in de stream zelf in, zodat die bezet blijft tot de laatste
+    gebeurtenis verstuurd is.
+    """
+    if method != "POST":
+        return None
+    if path in _TEXT_PATHS:
+        return "text"
+    if path.startswith(_DOCUMENT_PREFIX) and path.endswith(
+        ("/upload", "/anonymize", "/deanonymize")
+    ):
+        return "document"
+    return None
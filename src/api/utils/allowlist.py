@@ -0,0 +1,162 @@
+import logging
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALLOW_LIST_KINDS = ("exact", "prefix", "regex")
+
+# Scope van een regel zonder entiteitstype: geldt voor alle typen
+ANY_TYPE = "*"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_allowed(value: str) -> str:
+    """Normaliseer een waarde voor de allow-list.
+
+    Hoofdletters en witruimte tellen niet mee.
+    """
+    return _WHITESPACE.sub(" ", value).strip().casefold()
+
+
+class _PrefixTrie:
+    """Trie over tekens: controleert in O(len(waarde)) of een prefix erin staat."""
+
+    _END = ""  # sleutel die het einde van een prefix markeert (tekens zijn nooit "")
+
+    def __init__(self) -> None:
+        self._root: Dict[str, dict] = {}
+
+    def add(self, prefix: str) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[self._END] = {}
+
+    def has_prefix_of(self, value: str) -> bool:
+        node = self._root
+        for char in value:
+            if self._END in node:
+                return True
+            node = node.get(char)  # type: ignore[assignment]
+            if node is None:
+                return False
+        return self._END in node
+
+
+class AllowList:
+    """Bekende niet-PII waarden die nooit als entiteit gerapporteerd worden.
+
+    Drie soorten regels, optioneel beperkt tot één entiteitstype:
+        exact: de hele waarde, in een hash-set (O(1))
+        prefix: het begin van de waarde, in een trie (O(len(waarde)))
+        regex: een patroon dat de hele waarde moet matchen; alle patronen van een
+            type worden samengevoegd tot één regex
+
+    Waarden worden genormaliseerd met ``normalize_allowed``.
+    """
+
+    def __init__(self) -> None:
+        self._exact: Set[Tuple[str, str]] = set()
+        self._prefixes: Dict[str, _PrefixTrie] = {}
+        self._patterns: Dict[str, List[str]] = {}
+        self._compiled: Dict[str, "re.Pattern[str]"] = {}
+        self._rule_count = 0
+
+    def __len__(self) -> int:
+        return self._rule_count
+
+    def add(self, kind: str, value: str, entity_type: str = ANY_TYPE) -> None:
+        """Voeg een regel toe.
+
+        Raises:
+            ValueError: bij een onbekende soort of een ongeldige regex.
+        """
+        scope = entity_type.upper() if entity_type != ANY_TYPE else ANY_TYPE
+        if kind == "exact":
+            self._exact.add((scope, normalize_allowed(value)))
+        elif kind == "prefix":
+            self._prefixes.setdefault(scope, _PrefixTrie()).add(
+                normalize_allowed(value)
+            )
+        elif kind == "regex":
+            try:
+                re.compile(value)
+            except re.error as e:
+                raise ValueError(f"Ongeldige regex '{value}' in allow-list: {e}")
+            self._patterns.setdefault(scope, []).append(value)
+            self._compiled[scope] = re.compile(
+                "|".join(f"(?:{p})" for p in self._patterns[scope]), re.IGNORECASE
+            )
+        else:
+            raise ValueError(
+                f"Onbekende allow-list regel '{kind}', "
+                f"kies uit: {', '.join(ALLOW_LIST_KINDS)}"
+            )
+        self._rule_count += 1
+
+    def is_allowed(self, value: str, entity_type: str) -> bool:
+        """Geef True als de waarde voor dit entiteitstype onderdrukt moet worden."""
+        normalized = normalize_allowed(value)
+        for scope in (entity_type, ANY_TYPE):
+            if (scope, normalized) in self._exact:
+                return True
+            trie = self._prefixes.get(scope)
+            if trie is not None and trie.has_prefix_of(normalized):
+                return True
+            pattern = self._compiled.get(scope)
+            if pattern is not None and pattern.fullmatch(normalized):
+                return True
+        return False
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "AllowList":
+        r"""Lees regels als ``[ENTITEITSTYPE<TAB>]soort:waarde``.
+
+        Zonder soort is de regel ``exact``. Lege regels en regels die met ``#``
+        beginnen worden overgeslagen. Voorbeelden::
+
+            exact:12345678
+            prefix:0800
+            DRIVERS_LICENSE<TAB>regex:20\d{8}
+        """
+        allow_list = cls()
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entity_type = ANY_TYPE
+            if "\t" in line:
+                entity_type, line = (part.strip() for part in line.split("\t", 1))
+            kind, sep, value = line.partition(":")
+            if not sep or kind not in ALLOW_LIST_KINDS:
+                kind, value = "exact", line
+            allow_list.add(kind, value, entity_type)
+        return allow_list
+
+    @classmethod
+    def from_file(cls, path: str) -> "AllowList":
+        with open(path, encoding="utf-8") as f:
+            allow_list = cls.from_lines(f)
+        logger.info(f"Loaded allow-list with {len(allow_list)} rules from {path}")
+        return allow_list
+
+
+_allow_list: Optional[AllowList] = None
+_allow_list_lock = threading.Lock()
+
+
+def get_allow_list() -> Optional[AllowList]:
+    """Geef de allow-list uit ALLOW_LIST_PATH (één keer geladen), of None."""
+    global _allow_list
+    if not settings.ALLOW_LIST_PATH:
+        return None
+    if _allow_list is None:
+        with _allow_list_lock:
+            if _allow_list is None:
+                _allow_list = AllowList.from_file(settings.ALLOW_LIST_PATH)
+    return _allow_list
@@ -0,0 +1,109 @@
+import hashlib
+import hmac
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from src.api.config import settings
+
+if TYPE_CHECKING:
+    from src.api.services.pseudonyms import PseudonymSession
+
+ANONYMIZATION_STRATEGIES = ("replace", "mask", "redact", "hash", "pseudonymize")
+
+# Aparte sleutel voor de hashes, afgeleid van CRYPTO_KEY (niet dezelfde sleutel als
+# waarmee de occurrences in de PDF versleuteld worden).
+_HASH_KEY = hmac.new(settings.CRYPTO_KEY, b"anonymizer-hash", hashlib.sha256).digest()
+
+
+class TextAnonymizer:
+    """Vervangt entiteiten in een tekst volgens een anonimiseringsstrategie.
+
+    Strategieën:
+        replace: ``<ENTITY_TYPE>``
+        mask: elk teken vervangen door ``mask_char`` (lengte blijft gelijk)
+        redact: de waarde verwijderen
+        hash: HMAC-SHA256 van de waarde met een geheime sleutel
+        pseudonymize: ``<PERSON_1>``, ``<PERSON_2>``, ... per waarde, consistent
+            binnen de ``PseudonymSession``
+
+    De uitvoer wordt in één keer opgebouwd uit de gesorteerde segmenten, dus in
+    lineaire tijd in plaats van een kopie van de hele tekst per entiteit. Eén
+    instantie hoort bij één verzoek: elke herhaalde waarde wordt maar één keer
+    gehasht.
+    """
+
+    def __init__(
+        self,
+        strategy: str = "replace",
+        key: bytes = _HASH_KEY,
+        mask_char: str = "*",
+        session: Optional["PseudonymSession"] = None,
+    ) -> None:
+        if strategy not in ANONYMIZATION_STRATEGIES:
+            raise ValueError(
+                f"Onbekende strategie '{strategy}', "
+                f"kies uit: {', '.join(ANONYMIZATION_STRATEGIES)}"
+            )
+        self.strategy = strategy
+        self.key = key
+        self.mask_char = mask_char
+        self.session = session
+        if strategy == "pseudonymize" and session is None:
+            from src.api.services.pseudonyms import PseudonymSession
+
+            # Zonder sessie alleen consistent binnen deze tekst
+            self.session = PseudonymSession("request")
+        self._hash_memo: Dict[Tuple[str, str], str] = {}
+
+    def replacement(self, entity_type: str, value: str) -> str:
+        """Geef de vervangende tekst voor één entiteit."""
+        if self.strategy == "replace":
+            return f"<{entity_type}>"
+        if self.strategy == "mask":
+            return self.mask_char * len(value)
+        if self.strategy == "redact":
+            return ""
+        if self.strategy == "pseudonymize":
+            assert self.session is not None
+            return f"<{self.session.pseudonym(entity_type, value)}>"
+        memo_key = (entity_type, value)
+        digest = self._hash_memo.get(memo_key)
+        if digest is None:
+            digest = hmac.new(
+                self.key, value.encode("utf-8"), hashlib.sha256
+            ).hexdigest()
+            self._hash_memo[memo_key] = digest
+        return digest
+
+    def anonymize(self, text: str, results: List[dict]) -> str:
+        """Anonimiseer de tekst met de gevonden entiteiten.
+
+        Args:
+            text (str): de originele tekst.
+            results (list): entiteiten met ``start``, ``end`` en ``entity_type``.
+                Overlappende entiteiten (die na ``merge_spans`` niet meer voorkomen)
+                worden overgeslagen.
+
+        Returns:
+            str: de geanonimiseerde tekst.
+        """
+        parts: List[str] = []
+        cursor = 0
+        for result in sorted(results, key=lambda r: r["start"]):
+            start, end = result["start"], result["end"]
+            if start < cursor:
+                continue
+            parts.append(text[cursor:start])
+            parts.append(self.replacement(result["entity_type"], text[start:end]))
+            cursor = end
+        parts.append(text[cursor:])
+        return "".join(parts)
+
+
+def anonymize_text(
+    text: str,
+    results: List[dict],
+    strategy: str = "replace",
+    session: Optional["PseudonymSession"] = None,
+) -> str:
+    """Anonimiseer een tekst met een nieuwe ``TextAnonymizer`` (eigen hash-memo)."""
+    return TextAnonymizer(strategy, session=session).anonymize(text, results)
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from starlette.requests import Request
+
+from src.api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Interval (seconden) waarmee gecontroleerd wordt of de client nog verbonden is
+_DISCONNECT_POLL_SECONDS = 0.5
+
+
+class OperationCancelled(Exception):
+    """Het werk is gestopt voordat het klaar was; ``status_code`` voor de API.
+
+    ``partial_result`` kan gezet worden met wat al wel klaar was (bijv. de eerste
+    documenten van een upload).
+    """
+
+    status_code = 499
+
+    def __init__(self, message: str, stage: str = "") -> None:
+        super().__init__(message)
+        self.stage = stage
+        self.partial_result: Any = None
+
+
+class DeadlineExceeded(OperationCancelled):
+    status_code = 504
+
+
+class ClientDisconnected(OperationCancelled):
+    # 499 (Client Closed Request): er is niemand meer die het antwoord ontvangt
+    status_code = 499
+
+
+class Deadline:
+    """Uiterste tijd en annulering van één verzoek of taak.
+
+    Wordt door de pipeline doorgegeven (tekstextractie, analyzer, redactie) en
+    tussen pagina's en batches gecontroleerd met ``check``. Het werk stopt dan met
+    ``DeadlineExceeded`` als de tijd voorbij is, of met ``ClientDisconnected`` als
+    ``cancel`` aangeroepen is. Thread-safe: de controle gebeurt in worker-threads,
+    de annulering vanuit de event loop.
+    """
+
+    def __init__(self, timeout_seconds: Optional[float] = None) -> None:
+        """Initialiseer de deadline.
+
+        Args:
+            timeout_seconds (float, optional): seconden vanaf nu; None of <= 0
+                betekent geen tijdslimiet (annuleren kan nog wel).
+        """
+        self.timeout_seconds = timeout_seconds
+        self.expires_at = (
+            time.monotonic() + timeout_seconds
+            if timeout_seconds and timeout_seconds > 0
+            else None
+        )
+        self._cancelled = threading.Event()
+        self._reason = ""
+
+    def cancel(self, reason: str = "client disconnected") -> None:
+        self._reason = reason
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def remaining(self) -> Optional[float]:
+        """Resterende seconden (minimaal 0), of None zonder tijdslimiet."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self, stage: str = "") -> None:
+        """Stop het werk als het verzoek geannuleerd of de deadline voorbij is.
+
+        Args:
+            stage (str, optional): waar gecontroleerd wordt, voor de foutmelding en
+                de metric ``operations_cancelled_total``.
+
+        Raises:
+            ClientDisconnected: als ``cancel`` aangeroepen is.
+            DeadlineExceeded: als de deadline voorbij is.
+        """
+        if self._cancelled.is_set():
+            metrics.inc("operations_cancelled_total", reason="disconnect", stage=stage)
+            raise ClientDisconnected(f"Cancelled during {stage}: {self._reason}", stage)
+        if self.expired:
+            metrics.inc("operations_cancelled_total", reason="deadline", stage=stage)
+            raise DeadlineExceeded(
+                f"Deadline of {self.timeout_seconds:g}s exceeded during {stage}", stage
+            )
+
+
+def check_deadline(deadline: Optional[Deadline], stage: str) -> None:
+    """``deadline.check(stage)``, of niets als er geen deadline is."""
+    if deadline is not None:
+        deadline.check(stage)
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(
+    request: Request, deadline: Deadline
+) -> AsyncIterator[Deadline]:
+    """Annuleer de deadline zodra de client de verbinding verbreekt.
+
+    Het werk zelf moet in een thread draaien (``run_in_threadpool``), zodat de
+    event loop ondertussen de verbinding kan controleren.
+    """
+
+    async def watch() -> None:
+        while not deadline.cancelled:
+            if await request.is_disconnected():
+                logger.info(f"Client disconnected from {request.url.path}; cancelling")
+                deadline.cancel()
+                return
+            await asyncio.sleep(_DISCONNECT_POLL_SECONDS)
+
+    watcher = asyncio.create_task(watch())
+    try:
+        yield deadline
+    finally:
+        watcher.cancel()
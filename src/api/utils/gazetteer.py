@@ -0,0 +1,317 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+from src.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Verhoog bij een wijziging van de normalisatie of de opbouw van de automaat, zodat
+# oude caches niet meer gebruikt worden.
+_CACHE_VERSION = 2
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+Token = Tuple[str, int, int]  # (genormaliseerd token, start, end)
+Match = Tuple[int, int, str]  # (start, end, entiteitstype)
+
+
+def normalize_token(token: str) -> str:
+    """Normaliseer een token: kleine letters, zonder accenten ("Müller" -> "muller")."""
+    decomposed = unicodedata.normalize("NFKD", token.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Geef de genormaliseerde woorden van een tekst met hun positie.
+
+    Leestekens en witruimte tellen niet mee, dus "Jansen & Zn." en "jansen zn"
+    leveren dezelfde tokens op.
+    """
+    for match in _TOKEN_PATTERN.finditer(text):
+        yield normalize_token(match.group()), match.start(), match.end()
+
+
+class AhoCorasickAutomaton:
+    """Aho-Corasick-automaat over tokens in plaats van tekens.
+
+    Alle termen worden in één trie gezet met faallinks ertussen, zodat één lineaire
+    doorloop over de tokens van een tekst alle termen vindt, ongeacht het aantal
+    termen. Omdat op hele tokens gematcht wordt, vallen treffers altijd op
+    woordgrenzen ("Jan" matcht niet in "Janssen").
+    """
+
+    def __init__(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per toestand: (aantal tokens, entiteitstype) van de termen die hier eindigen
+        self._outputs: List[List[Tuple[int, str]]] = [[]]
+        self._term_count = 0
+        self._built = False
+
+    def __len__(self) -> int:
+        return self._term_count
+
+    @property
+    def entity_types(self) -> List[str]:
+        return sorted({t for outputs in self._outputs for _, t in outputs})
+
+    def add(self, term: str, entity_type: str) -> None:
+        """Voeg een term toe; moet vóór ``build`` gebeuren."""
+        if self._built:
+            raise RuntimeError("De automaat is al gebouwd")
+        tokens = [token for token, _, _ in tokenize(term)]
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        output = (len(tokens), entity_type)
+        if output not in self._outputs[state]:
+            self._outputs[state].append(output)
+            self._term_count += 1
+
+    def build(self) -> "AhoCorasickAutomaton":
+        """Bereken de faallinks (breadth-first) en voeg de outputs samen."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                # Termen die als suffix in deze term zitten, eindigen hier ook
+                self._outputs[child] = (
+                    self._outputs[child] + self._outputs[self._fail[child]]
+                )
+        self._built = True
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """De gebouwde automaat als JSON-serialiseerbare dict (voor de cache)."""
+        if not self._built:
+            raise RuntimeError("Roep eerst build() aan")
+        return {
+            "goto": self._goto,
+            "fail": self._fail,
+            "outputs": self._outputs,
+            "term_count": self._term_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "AhoCorasickAutomaton":
+        """Maak een gebouwde automaat uit de uitvoer van ``to_dict``.
+
+        De structuur wordt gecontroleerd, zodat een beschadigde cache geen
+        automaat oplevert die bij het zoeken vastloopt of naar niet-bestaande
+        toestanden wijst.
+
+        Raises:
+            ValueError: als ``data`` geen geldige automaat is.
+        """
+        try:
+            goto = [
+                {str(token): int(child) for token, child in edges.items()}
+                for edges in data["goto"]
+            ]
+            fail = [int(state) for state in data["fail"]]
+            outputs = [
+                [(int(length), str(entity_type)) for length, entity_type in items]
+                for items in data["outputs"]
+            ]
+            term_count = int(data["term_count"])
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"Ongeldige automaat: {e}") from e
+        states = len(goto)
+        if not states or len(fail) != states or len(outputs) != states:
+            raise ValueError("Ongeldige automaat: aantallen toestanden verschillen")
+        if any(not 0 <= state < states for state in fail):
+            raise ValueError("Ongeldige automaat: verwijzing naar onbekende toestand")
+        # De goto-overgangen vormen een boom vanaf toestand 0, en elke faallink
+        # wijst naar een minder diepe toestand: zoeken komt zo altijd bij 0 uit
+        depth = [-1] * states
+        depth[0] = 0
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            for child in goto[state].values():
+                if not 0 < child < states or depth[child] != -1:
+                    raise ValueError("Ongeldige automaat: geen boom")
+                depth[child] = depth[state] + 1
+                queue.append(child)
+        if -1 in depth or any(
+            depth[fail[state]] >= depth[state] for state in range(1, states)
+        ):
+            raise ValueError("Ongeldige automaat: ongeldige faallinks")
+        if any(length < 1 for items in outputs for length, _ in items):
+            raise ValueError("Ongeldige automaat: term zonder tokens")
+
+        automaton = cls()
+        automaton._goto, automaton._fail, automaton._outputs = goto, fail, outputs
+        automaton._term_count = term_count
+        automaton._built = True
+        return automaton
+
+    def search(self, text: str) -> Iterator[Match]:
+        """Geef (start, end, entiteitstype) van alle termen in de tekst.
+
+        Overlappende en geneste treffers worden allemaal teruggegeven; die worden
+        later in ``merge_spans`` opgelost.
+        """
+        if not self._built:
+            raise RuntimeError("Roep eerst build() aan")
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        # Startposities van de tokens, voor een treffer over meerdere tokens
+        starts: List[int] = []
+        state = 0
+        for index, (token, start, end) in enumerate(tokenize(text)):
+            starts.append(start)
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, entity_type in outputs[state]:
+                yield starts[index - length + 1], end, entity_type
+
+
+def load_terms(path: str, default_entity: str) -> Iterator[Tuple[str, str]]:
+    """Lees (term, entiteitstype) uit een gazetteer-bestand.
+
+    Eén term per regel, optioneel voorafgegaan door het entiteitstype en een tab
+    (``ORGANIZATION<TAB>Gemeente Utrecht``). Lege regels en regels die met ``#``
+    beginnen worden overgeslagen.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "\t" in line:
+                entity_type, term = line.split("\t", 1)
+                yield term.strip(), entity_type.strip().upper()
+            else:
+                yield line, default_entity
+
+
+def build_automaton(
+    path: str,
+    default_entity: str = settings.GAZETTEER_DEFAULT_ENTITY,
+    cache_dir: Optional[str] = settings.GAZETTEER_CACHE_DIR,
+) -> AhoCorasickAutomaton:
+    """Bouw de automaat voor een gazetteer-bestand, via de cache op schijf.
+
+    De cache is een JSON-bestand met de gebouwde automaat, met de SHA-256 van het
+    bestand (en het standaard entiteitstype) in de naam; een gewijzigd bestand
+    krijgt dus vanzelf een nieuwe cache. Een cache die niet te lezen of ongeldig
+    is, wordt genegeerd en opnieuw gebouwd (geen pickle: het laden van de cache
+    voert nooit code uit). Met ``cache_dir=None`` wordt altijd opnieuw gebouwd.
+
+    Args:
+        path (str): pad naar het gazetteer-bestand.
+        default_entity (str, optional): entiteitstype voor regels zonder type.
+            Defaults to settings.GAZETTEER_DEFAULT_ENTITY.
+        cache_dir (str, optional): map voor de gecompileerde automaat. Defaults to
+            settings.GAZETTEER_CACHE_DIR.
+
+    Returns:
+        AhoCorasickAutomaton: de gebouwde automaat.
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    cache_path = None
+    if cache_dir:
+        key = hashlib.sha256(
+            f"{_CACHE_VERSION}:{default_entity}:{digest}".encode("utf-8")
+        ).hexdigest()[:32]
+        cache_path = os.path.join(cache_dir, f"{key}.json")
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    automaton = AhoCorasickAutomaton.from_dict(json.load(f))
+                logger.info(f"Loaded gazetteer {path} from cache {cache_path}")
+                return automaton
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable gazetteer cache {cache_path}: {e}")
+
+    automaton = AhoCorasickAutomaton()
+    for term, entity_type in load_terms(path, default_entity):
+        automaton.add(term, entity_type)
+    automaton.build()
+    logger.info(f"Built gazetteer automaton with {len(automaton)} terms from {path}")
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)  # type: ignore[arg-type]
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(automaton.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    return automaton
+
+
+class GazetteerRecognizer(EntityRecognizer):
+    """Herkenner voor vaste lijsten met namen, straten en organisaties.
+
+    In plaats van één regex per term gebruikt deze herkenner een
+    ``AhoCorasickAutomaton``: de kosten van een scan hangen af van de lengte van
+    de tekst, niet van het aantal termen.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.GAZETTEER_PATH,
+        supported_language: str = "nl",
+        score: float = settings.GAZETTEER_SCORE,
+        automaton: Optional[AhoCorasickAutomaton] = None,
+    ) -> None:
+        """Initialiseer de herkenner.
+
+        Args:
+            path (str): pad naar het gazetteer-bestand (zie ``load_terms``).
+            supported_language (str, optional): taalcode. Defaults to "nl".
+            score (float, optional): score van een treffer. Defaults to
+                settings.GAZETTEER_SCORE.
+            automaton (AhoCorasickAutomaton, optional): een al gebouwde automaat;
+                dan wordt ``path`` niet gelezen.
+        """
+        self.path = path
+        self.score = score
+        self.automaton = automaton or build_automaton(path)
+        super().__init__(
+            supported_entities=self.automaton.entity_types
+            or [settings.GAZETTEER_DEFAULT_ENTITY],
+            supported_language=supported_language,
+        )
+
+    def load(self) -> None:
+        # De automaat wordt in __init__ gebouwd of uit de cache geladen
+        pass
+
+    def analyze(
+        self,
+        text: str,
+        entities: List[str],
+        nlp_artifacts: Optional[NlpArtifacts] = None,
+    ) -> List[RecognizerResult]:
+        return [
+            RecognizerResult(
+                entity_type=entity_type, start=start, end=end, score=self.score
+            )
+            for start, end, entity_type in self.automaton.search(text)
+            if not entities or entity_type in entities
+        ]
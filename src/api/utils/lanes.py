@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from src.api.config import settings
+from src.api.utils.metrics import metrics
+
+T = TypeVar("T")
+
+# Korte, interactieve tekstverzoeken (UI) en bulkwerk (PDF's)
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+
+class WorkLane:
+    """Eigen thread-pool (werkbudget) voor één prioriteitsklasse.
+
+    Elke lane heeft vaste threads; werk van de ene lane kan de threads van de
+    andere dus niet bezetten. Zo blijft er altijd capaciteit gereserveerd voor
+    interactieve tekstverzoeken, hoeveel PDF's er ook in behandeling zijn.
+    De wachttijd tot een taak start wordt per lane gerapporteerd in
+    ``lane_queue_wait_ms``.
+    """
+
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        # De threads van de pool bestaan niet meer na een fork (api.py --preload)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._queued = self._running = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix=f"lane-{self.name}"
+                    )
+        return self._executor
+
+    def _update(self, queued: int = 0, running: int = 0) -> None:
+        with self._lock:
+            self._queued += queued
+            self._running += running
+            metrics.set_gauge("lane_queued", self._queued, lane=self.name)
+            metrics.set_gauge("lane_running", self._running, lane=self.name)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "queued": self._queued,
+            "running": self._running,
+        }
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Voer ``func`` uit op een thread van deze lane en wacht op het resultaat."""
+        submitted = time.monotonic()
+
+        def task() -> T:
+            self._update(queued=-1, running=1)
+            metrics.observe(
+                "lane_queue_wait_ms",
+                (time.monotonic() - submitted) * 1000,
+                lane=self.name,
+            )
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._update(running=-1)
+
+        self._update(queued=1)
+        future = self._get_executor().submit(task)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Nog niet gestart: uit de wachtrij halen
+            if future.cancel():
+                self._update(queued=-1)
+            raise
+
+
+lanes: Dict[str, WorkLane] = {
+    INTERACTIVE: WorkLane(INTERACTIVE, settings.LANE_INTERACTIVE_WORKERS),
+    BULK: WorkLane(BULK, settings.LANE_BULK_WORKERS),
+}
+
+
+async def run_in_lane(
+    lane: str, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Voer ``func(*args, **kwargs)`` uit op de thread-pool van een lane.
+
+    Args:
+        lane (str): INTERACTIVE of BULK.
+        func (Callable): blokkerende functie.
+        *args: positionele argumenten voor ``func``.
+        **kwargs: keyword-argumenten voor ``func``.
+
+    Returns:
+        het resultaat van ``func``.
+    """
+    return await lanes[lane].run(functools.partial(func, *args, **kwargs))
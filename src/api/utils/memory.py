@@ -0,0 +1,62 @@
+import logging
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+# Velden uit /proc/<pid>/smaps_rollup die relevant zijn voor copy-on-write delen.
+_ROLLUP_FIELDS = (
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+)
+
+
+def read_process_memory_kb(pid: Union[int, str] = "self") -> dict[str, int]:
+    """Lees het geheugengebruik (kB) van een proces uit /proc.
+
+    Gebruikt ``smaps_rollup`` zodat naast RSS ook PSS en het gedeelde/private deel
+    zichtbaar is; op kernels zonder ``smaps_rollup`` wordt teruggevallen op VmRSS uit
+    ``status``. Op platforms zonder /proc wordt een lege dict teruggegeven.
+
+    Args:
+        pid (Union[int, str], optional): proces-id of "self". Defaults to "self".
+
+    Returns:
+        dict[str, int]: geheugenvelden in kB, bijv. {"Rss": ..., "Pss": ...}.
+    """
+    memory: dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in _ROLLUP_FIELDS:
+                    memory[name] = int(rest.split()[0])
+        if memory:
+            return memory
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    memory["Rss"] = int(line.split()[1])
+                    break
+    except (OSError, ValueError):
+        logger.debug(f"Could not read memory usage for pid {pid}")
+    return memory
+
+
+def current_rss_bytes() -> int:
+    """Geef de huidige RSS van dit proces in bytes (0 als onbekend)."""
+    return read_process_memory_kb().get("Rss", 0) * 1024
+
+
+def format_memory(memory: dict[str, int]) -> str:
+    """Formatteer een uitkomst van ``read_process_memory_kb`` voor logging (MB)."""
+    if not memory:
+        return "unknown"
+    return ", ".join(f"{name}={kb / 1024:.1f}MB" for name, kb in memory.items())
@@ -0,0 +1,121 @@
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+# Aantal recente waarnemingen per summary waarover percentielen berekend worden.
+_SUMMARY_WINDOW = 1024
+
+
+def _key(name: str, labels: Dict[str, Any]) -> str:
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+    return f"{name}{{{label_str}}}"
+
+
+class _Summary:
+    """Tellingen plus een venster van recente waarden voor percentielen."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.window: Deque[float] = deque(maxlen=_SUMMARY_WINDOW)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.window.append(value)
+
+    def snapshot(self) -> Dict[str, float]:
+        ordered = sorted(self.window)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": round(pct(50), 3),
+            "p95": round(pct(95), 3),
+            "p99": round(pct(99), 3),
+            "max": round(self.max, 3),
+        }
+
+
+class Metrics:
+    """Eenvoudig, thread-safe metrics-register van dit proces.
+
+    Ondersteunt counters, gauges en summaries (met p50/p95/p99 over een venster van
+    recente waarden). Labels worden in de naam opgenomen, bijv.
+    ``inference_batch_size{engine=spacy}``. Wordt als JSON geserveerd op
+    ``/api/v1/metrics``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._summaries: Dict[str, _Summary] = {}
+        # Een lock die bij de fork (api.py --preload) vastgehouden werd, komt in
+        # het kind nooit meer vrij.
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def add_gauge(self, name: str, delta: float, **labels: Any) -> float:
+        key = _key(name, labels)
+        with self._lock:
+            value = self._gauges.get(key, 0) + delta
+            self._gauges[key] = value
+            return value
+
+    def get_gauge(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._gauges.get(_key(name, labels), 0)
+
+    def get_counter(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = _Summary()
+            summary.observe(value)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "gauges": dict(sorted(self._gauges.items())),
+                "summaries": {
+                    k: s.snapshot() for k, s in sorted(self._summaries.items())
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+metrics = Metrics()
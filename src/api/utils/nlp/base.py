@@ -23,3 +23,23 @@ class NLPEngine(ABC):
             list: Lijst van entiteiten (dicts of Presidio RecognizerResult).
         """
         pass
+
+    def analyze_batch(
+        self, texts: List[str], entities: Optional[List] = None, language: str = "nl"
+    ) -> List[list]:
+        """Analyseer meerdere teksten in één keer.
+
+        Engines die batched inferentie ondersteunen (``nlp.pipe``, een transformers
+        pipeline met ``batch_size``) overschrijven deze methode; de standaard
+        analyseert de teksten één voor één.
+
+        Args:
+            texts (list): de te analyseren teksten.
+            entities (list, optional): Optionele lijst van te detecteren entiteiten.
+                Defaults to None.
+            language (str, optional): Taalcode. Defaults to 'nl'.
+
+        Returns:
+            list: per tekst de lijst van entiteiten, in dezelfde volgorde als ``texts``.
+        """
+        return [self.analyze(text, entities, language) for text in texts]
@@ -0,0 +1,262 @@
+import logging
+import re
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterator, List, Optional, Tuple, cast
+
+from spacy.tokens import Doc, Span
+
+from src.api.config import settings
+from src.api.utils.metrics import metrics
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.manager import model_manager
+from src.api.utils.nlp.spacy_engine import SpacyEngine
+
+logger = logging.getLogger(__name__)
+
+# Zinnen: tekst tot en met een eindteken of regeleinde (onafhankelijk van de parser,
+# die bij het "ner-only" profiel niet geladen is).
+_SENTENCE_PATTERN = re.compile(r"[^.!?\n]+(?:[.!?]+|\n|$)")
+
+# Woorden waarna vaak een naam, adres of organisatie volgt.
+CONTEXT_WORDS = frozenset(
+    {
+        "dhr",
+        "heer",
+        "mevr",
+        "mevrouw",
+        "mw",
+        "meneer",
+        "naam",
+        "cliënt",
+        "client",
+        "patiënt",
+        "patient",
+        "aanvrager",
+        "bezwaarmaker",
+        "advocaat",
+        "zoon",
+        "dochter",
+        "echtgenoot",
+        "echtgenote",
+        "wonende",
+        "woont",
+        "woonachtig",
+        "geboren",
+        "adres",
+        "straat",
+        "te",
+        "gemeente",
+        "bij",
+        "namens",
+        "door",
+    }
+)
+
+# spaCy-labels die vaak een verkeerd geclassificeerde naam of organisatie zijn.
+UNCERTAIN_LABELS = frozenset(
+    {"NORP", "PRODUCT", "WORK_OF_ART", "EVENT", "FAC", "LANGUAGE", "MISC"}
+)
+
+_CONTEXT_WINDOW = 3  # aantal tokens vóór een hoofdletterwoord dat bekeken wordt
+
+Sentence = Tuple[int, int]
+
+
+def split_sentences(text: str) -> Iterator[Sentence]:
+    """Geef (start, end) van de niet-lege zinnen in de tekst."""
+    for match in _SENTENCE_PATTERN.finditer(text):
+        if match.group().strip():
+            yield match.start(), match.end()
+
+
+def _is_suspicious(sentence: Span, ents: list) -> bool:
+    """Bepaal of spaCy in deze zin mogelijk iets gemist heeft of twijfelt.
+
+    spaCy geeft geen scores per entiteit; onzekerheid wordt daarom benaderd met:
+    een entiteit met een label dat vaak een verkeerd geclassificeerde naam is, of
+    een niet-herkend woord met een hoofdletter (niet aan het begin van de zin) dat
+    direct na een contextwoord staat of naast een ander niet-herkend hoofdletterwoord.
+
+    Args:
+        sentence (Span): de tokens van de zin.
+        ents (list): de spaCy-entiteiten binnen de zin.
+
+    Returns:
+        bool: of de zin naar het transformers-model moet.
+    """
+    if any(e["entity_type"] in UNCERTAIN_LABELS for e in ents):
+        return True
+
+    covered = [(e["start"], e["end"]) for e in ents]
+    tokens = [t for t in sentence if not t.is_space]
+    previous_capitalized = False
+    for i, token in enumerate(tokens):
+        capitalized = (
+            i > 0
+            and token.is_title
+            and token.is_alpha
+            and not token.is_stop
+            and not any(s <= token.idx < e for s, e in covered)
+        )
+        if capitalized:
+            if previous_capitalized:
+                return True
+            window = tokens[max(0, i - _CONTEXT_WINDOW) : i]
+            if any(t.lower_.rstrip(".") in CONTEXT_WORDS for t in window):
+                return True
+        previous_capitalized = capitalized
+    return False
+
+
+def _suspicious_sentences(text: str, doc: Doc, ents: list) -> Iterator[Sentence]:
+    """Geef de zinnen van de tekst die naar het transformers-model moeten."""
+    # Tokens en entiteiten per zin via bisect op de (gesorteerde) offsets
+    token_starts = [t.idx for t in doc]
+    ent_starts = [e["start"] for e in ents]
+    for start, end in split_sentences(text):
+        sentence = doc[
+            bisect_left(token_starts, start) : bisect_left(token_starts, end)
+        ]
+        sentence_ents = [
+            e
+            for e in ents[bisect_left(ent_starts, start) : bisect_left(ent_starts, end)]
+            if e["end"] <= end
+        ]
+        if _is_suspicious(sentence, sentence_ents):
+            yield start, end
+
+
+def _replace_overlapping(results: list, replacements: list) -> list:
+    """Vervang de resultaten die overlappen met een van de vervangende resultaten."""
+    replacements = sorted(replacements, key=lambda r: r["start"])
+    starts = [r["start"] for r in replacements]
+    # Grootste einde tot en met elke vervanging: overlap met r bestaat als een
+    # vervanging vóór r["end"] begint en na r["start"] eindigt
+    max_ends = list(accumulate((r["end"] for r in replacements), max))
+    kept = []
+    for result in results:
+        before_end = bisect_left(starts, result["end"])
+        if before_end and max_ends[before_end - 1] > result["start"]:
+            continue
+        kept.append(result)
+    return kept + replacements
+
+
+class CascadeEngine(NLPEngine):
+    """Cascade van een snel spaCy-model en een nauwkeuriger transformers-model.
+
+    spaCy analyseert de hele tekst. Alleen zinnen waarin spaCy twijfelt of iets
+    verdachts mist (zie ``_is_suspicious``) gaan door het transformers-model; de
+    resultaten daarvan vervangen in die zinnen de overlappende spaCy-entiteiten.
+    Zo ligt de recall dicht bij die van het transformers-model, terwijl de kosten
+    dicht bij die van spaCy blijven.
+
+    Beide modellen komen uit de ``model_manager``, zodat ze met de andere engines
+    gedeeld worden en onder het geheugenbudget vallen.
+
+    Het aandeel doorgestuurde tekst wordt bijgehouden in de counters
+    ``cascade_escalated_chars_total`` en ``cascade_chars_total``.
+    """
+
+    def __init__(
+        self,
+        model_name: str = settings.DEFAULT_TRANSFORMERS_MODEL,
+        spacy_model: str = settings.DEFAULT_SPACY_MODEL,
+        escalation_engine: str = settings.CASCADE_ESCALATION_ENGINE,
+    ) -> None:
+        """Initialiseer de cascade en laad beide modellen.
+
+        Args:
+            model_name (str): het transformers-model voor de onzekere zinnen.
+            spacy_model (str): het spaCy-model voor de eerste ronde.
+            escalation_engine (str): "transformers" of "onnx".
+        """
+        self.model_name = model_name
+        self.spacy_model = spacy_model
+        self.escalation_engine = escalation_engine
+        self.last_escalation_fraction = 0.0
+        # Vooraf laden, zodat het eerste verzoek niet op de modellen wacht
+        model_manager.get("spacy", spacy_model)
+        model_manager.get(escalation_engine, model_name)
+
+    @property
+    def spacy(self) -> SpacyEngine:
+        # Bij elk gebruik opvragen: de manager kan het model intussen ontladen hebben
+        return cast(SpacyEngine, model_manager.get("spacy", self.spacy_model))
+
+    @property
+    def escalation(self) -> NLPEngine:
+        return model_manager.get(self.escalation_engine, self.model_name)
+
+    def analyze(
+        self, text: str, entities: Optional[List] = None, language: str = "nl"
+    ) -> list:
+        """Analyseer de tekst met spaCy en escaleer onzekere zinnen.
+
+        Args:
+            text (str): de te analyseren tekst.
+            entities (list, optional): entiteitstypen om te filteren. Defaults to None.
+            language (str, optional): taalcode. Defaults to 'nl'.
+
+        Returns:
+            list: entiteiten van beide modellen, gesorteerd op positie.
+        """
+        return self.analyze_batch([text], entities, language)[0]
+
+    def analyze_batch(
+        self, texts: List[str], entities: Optional[List] = None, language: str = "nl"
+    ) -> List[list]:
+        """Analyseer meerdere teksten; alle onzekere zinnen gaan in één batch."""
+        docs = list(self.spacy.nlp.pipe(texts))
+        spacy_results = [SpacyEngine._doc_to_results(doc, None) for doc in docs]
+
+        # (tekstindex, zin) van alle zinnen die naar het transformers-model gaan
+        escalated: List[Tuple[int, Sentence]] = [
+            (index, sentence)
+            for index, (text, doc) in enumerate(zip(texts, docs))
+            for sentence in _suspicious_sentences(text, doc, spacy_results[index])
+        ]
+
+        outputs = (
+            self.escalation.analyze_batch(
+                [texts[i][s:e] for i, (s, e) in escalated], entities, language
+            )
+            if escalated
+            else []
+        )
+        replacements: List[list] = [[] for _ in texts]
+        for (index, (start, end)), sentence_results in zip(escalated, outputs):
+            # Alleen labels die het filter doorkomen mogen een spaCy-entiteit
+            # vervangen; anders verdwijnt bijv. spaCy's PERSON onder een PER
+            replacements[index].extend(
+                {**r, "start": r["start"] + start, "end": r["end"] + start}
+                for r in sentence_results
+                if entities is None or r["entity_type"] in entities
+            )
+        # Transformers-resultaten winnen van overlappende spaCy-entiteiten
+        merged = [
+            _replace_overlapping(results, extra) if extra else results
+            for results, extra in zip(spacy_results, replacements)
+        ]
+
+        total_chars = sum(len(t) for t in texts)
+        escalated_chars = sum(e - s for _, (s, e) in escalated)
+        self.last_escalation_fraction = (
+            escalated_chars / total_chars if total_chars else 0.0
+        )
+        metrics.inc("cascade_chars_total", total_chars)
+        metrics.inc("cascade_escalated_chars_total", escalated_chars)
+        metrics.inc("cascade_escalated_sentences_total", len(escalated))
+
+        return [
+            sorted(
+                (
+                    r
+                    for r in results
+                    if entities is None or r["entity_type"] in entities
+                ),
+                key=lambda r: r["start"],
+            )
+            for results in merged
+        ]
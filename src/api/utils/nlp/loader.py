@@ -1,11 +1,25 @@
-from typing import Optional, Union, overload
+from typing import TYPE_CHECKING, Optional, overload
 
-from src.api.utils.nlp.spacy_engine import SpacyEngine
-from src.api.utils.nlp.transformers_engine import NLPEngine, TransformersEngine
+from src.api.config import settings
+from src.api.utils.nlp.base import NLPEngine
+
+if TYPE_CHECKING:
+    from src.api.utils.nlp.spacy_engine import SpacyEngine
+
+
+# Engine-typen die load_nlp_engine kent
+NLP_ENGINES = ("spacy", "transformers", "onnx", "cascade")
+
+
+def default_model_name(nlp_engine: str) -> str:
+    """Het standaardmodel voor een engine-type (DEFAULT_SPACY/TRANSFORMERS_MODEL)."""
+    if nlp_engine == "spacy":
+        return settings.DEFAULT_SPACY_MODEL
+    return settings.DEFAULT_TRANSFORMERS_MODEL
 
 
 @overload
-def load_nlp_engine(config_dict: None = None) -> SpacyEngine: ...
+def load_nlp_engine(config_dict: None = None) -> "SpacyEngine": ...
 
 
 @overload
@@ -14,9 +28,12 @@ def load_nlp_engine(config_dict: dict) -> NLPEngine: ...
 
 def load_nlp_engine(
     config_dict: Optional[dict] = None,
-) -> Union[SpacyEngine, TransformersEngine]:
+) -> NLPEngine:
     """Load the NLP engine based on the provided configuration.
 
+    The engine modules are imported on first use, so selecting SpaCy never imports
+    transformers (and with it torch), and vice versa.
+
     Args:
         config_dict (dict, optional): model and supplier config. Defaults to None.
 
@@ -24,18 +41,33 @@ def load_nlp_engine(
         ValueError: if the engine type is unknown.
 
     Returns:
-        Union[SpacyEngine, TransformersEngine]: the loaded NLP engine.
+        NLPEngine: the loaded NLP engine (spacy, transformers, onnx or cascade).
     """
     if config_dict is None:
         # Default to SpaCy
+        from src.api.utils.nlp.spacy_engine import SpacyEngine
+
         return SpacyEngine()
 
     engine_type = config_dict.get("nlp_engine", "spacy")
     model_name = config_dict.get("model_name", "nl_core_news_md")
 
     if engine_type == "spacy":
+        from src.api.utils.nlp.spacy_engine import SpacyEngine
+
         return SpacyEngine(model_name)
     elif engine_type == "transformers":
+        from src.api.utils.nlp.transformers_engine import TransformersEngine
+
         return TransformersEngine(model_name)
+    elif engine_type == "onnx":
+        from src.api.utils.nlp.onnx_engine import OnnxTransformersEngine
+
+        return OnnxTransformersEngine(model_name)
+    elif engine_type == "cascade":
+        # spaCy op de hele tekst, het transformers-model alleen op onzekere zinnen
+        from src.api.utils.nlp.cascade_engine import CascadeEngine
+
+        return CascadeEngine(model_name)
     else:
         raise ValueError(f"Onbekende NLP engine: {engine_type}")
@@ -0,0 +1,283 @@
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.api.config import settings
+from src.api.utils.memory import current_rss_bytes
+from src.api.utils.metrics import metrics
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.loader import NLP_ENGINES, default_model_name, load_nlp_engine
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, str]  # (nlp_engine, model_name)
+
+# Schatting (MB) als het RSS-verschil bij het laden niet te meten is.
+_DEFAULT_FOOTPRINT_MB = {
+    "spacy": 300,
+    "transformers": 1200,
+    "onnx": 400,
+    # De cascade haalt zijn spaCy- en transformers-model zelf uit de manager;
+    # die tellen als eigen modellen mee
+    "cascade": 0,
+}
+_FALLBACK_FOOTPRINT_MB = 500
+
+
+@dataclass
+class _ResidentModel:
+    engine: NLPEngine
+    size_bytes: int
+    loaded_at: float
+    last_used: float
+    uses: int = 0
+
+
+class ModelManager:
+    """Beheert de geladen NLP-engines binnen een geheugenbudget.
+
+    Wrapt ``load_nlp_engine``: elke (engine, model)-combinatie wordt één keer
+    geladen en hergebruikt. Per model wordt de footprint geschat uit het verschil
+    in RSS rond het laden. Als het totaal boven ``budget_bytes`` komt, worden de
+    minst recent gebruikte modellen ontladen (LRU); modellen die langer dan
+    ``idle_ttl`` seconden niet gebruikt zijn worden ook ontladen.
+
+    Een ontladen engine wordt pas echt vrijgegeven zodra lopende verzoeken die er
+    nog een referentie naar hebben klaar zijn.
+
+    De standaardmodellen van DEFAULT_NLP_ENGINE en PRELOAD_NLP_ENGINES worden nooit
+    ontladen: die zijn vóór het forken geladen en worden door de workers gedeeld
+    (copy-on-write); opnieuw laden zou per worker een eigen kopie opleveren.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = settings.MODEL_MEMORY_BUDGET_MB * 1024 * 1024,
+        idle_ttl: float = settings.MODEL_IDLE_TTL_SECONDS,
+        pinned: Optional[Iterable[ModelKey]] = None,
+    ) -> None:
+        self.budget_bytes = budget_bytes
+        self.idle_ttl = idle_ttl
+        self.pinned: Set[ModelKey] = (
+            set(pinned) if pinned is not None else _default_pinned()
+        )
+        self._models: "OrderedDict[ModelKey, _ResidentModel]" = OrderedDict()
+        self._known_sizes: Dict[ModelKey, int] = {}
+        # Totaal gemeten bij alle loads; om geneste loads (cascade) niet dubbel
+        # te tellen
+        self._loaded_bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self._reaper: Optional[threading.Thread] = None
+        # Threads en locks overleven een fork (api.py --preload) niet.
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._reaper = None
+
+    def get(self, nlp_engine: str, model_name: str) -> NLPEngine:
+        """Geef de engine voor (nlp_engine, model_name), laad deze zo nodig.
+
+        Args:
+            nlp_engine (str): type engine, bijv. "spacy" of "transformers".
+            model_name (str): naam van het model.
+
+        Raises:
+            ValueError: als het engine-type onbekend is.
+
+        Returns:
+            NLPEngine: de geladen engine.
+        """
+        if nlp_engine not in NLP_ENGINES:
+            # Vóór het budget en de load-locks: een onbekende naam mag geen
+            # modellen ontladen of een lock achterlaten
+            raise ValueError(f"Onbekende NLP engine: {nlp_engine}")
+        key = (nlp_engine, model_name)
+        self.evict_idle()
+        engine = self._touch(key)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            # Een andere thread kan het model intussen geladen hebben.
+            engine = self._touch(key)
+            if engine is not None:
+                return engine
+            return self._load(key)
+
+    def _touch(self, key: ModelKey) -> Optional[NLPEngine]:
+        with self._lock:
+            resident = self._models.get(key)
+            if resident is None:
+                return None
+            resident.last_used = time.monotonic()
+            resident.uses += 1
+            self._models.move_to_end(key)
+            return resident.engine
+
+    def _estimate(self, key: ModelKey) -> int:
+        if key in self._known_sizes:
+            return self._known_sizes[key]
+        return _DEFAULT_FOOTPRINT_MB.get(key[0], _FALLBACK_FOOTPRINT_MB) * 1024 * 1024
+
+    def _load(self, key: ModelKey) -> NLPEngine:
+        nlp_engine, model_name = key
+        # Maak vooraf ruimte op basis van de (eerder gemeten) schatting.
+        self._enforce_budget(incoming=self._estimate(key))
+
+        rss_before = current_rss_bytes()
+        loaded_before = self._loaded_bytes
+        start = time.perf_counter()
+        engine = load_nlp_engine(
+            config_dict={"nlp_engine": nlp_engine, "model_name": model_name}
+        )
+        load_seconds = time.perf_counter() - start
+        # Modellen die tijdens het laden apart geladen zijn, tellen niet mee
+        nested = self._loaded_bytes - loaded_before
+        measured = current_rss_bytes() - rss_before - nested
+        size = measured if measured > 0 else self._estimate(key)
+
+        now = time.monotonic()
+        with self._lock:
+            self._loaded_bytes += size
+            self._known_sizes[key] = size
+            self._models[key] = _ResidentModel(
+                engine=engine, size_bytes=size, loaded_at=now, last_used=now, uses=1
+            )
+        metrics.inc("model_loads_total", engine=nlp_engine, model=model_name)
+        metrics.observe("model_load_seconds", load_seconds, engine=nlp_engine)
+        logger.info(
+            f"Loaded NLP engine {nlp_engine}:{model_name} in {load_seconds:.1f}s "
+            f"(~{size / 1024 / 1024:.0f}MB)"
+        )
+        self._enforce_budget(keep=key)
+        self._update_gauges()
+        self._ensure_reaper()
+        return engine
+
+    def _enforce_budget(
+        self, incoming: int = 0, keep: Optional[ModelKey] = None
+    ) -> None:
+        if self.budget_bytes <= 0:
+            return
+        evicted: List[ModelKey] = []
+        with self._lock:
+            total = sum(m.size_bytes for m in self._models.values())
+            for key in list(self._models):
+                if total + incoming <= self.budget_bytes:
+                    break
+                if key == keep or key in self.pinned:
+                    continue
+                total -= self._models.pop(key).size_bytes
+                evicted.append(key)
+        self._after_evict(evicted, reason="memory budget")
+
+    def evict_idle(self) -> List[ModelKey]:
+        """Ontlaad modellen die langer dan de TTL niet gebruikt zijn."""
+        if self.idle_ttl <= 0:
+            return []
+        cutoff = time.monotonic() - self.idle_ttl
+        with self._lock:
+            evicted = [
+                k
+                for k, m in self._models.items()
+                if m.last_used < cutoff and k not in self.pinned
+            ]
+            for key in evicted:
+                del self._models[key]
+        self._after_evict(evicted, reason="idle")
+        return evicted
+
+    def unload(self, nlp_engine: str, model_name: str) -> bool:
+        key = (nlp_engine, model_name)
+        with self._lock:
+            removed = self._models.pop(key, None) is not None
+        if removed:
+            self._after_evict([key], reason="requested")
+        return removed
+
+    def _after_evict(self, evicted: List[ModelKey], reason: str) -> None:
+        if not evicted:
+            return
+        for nlp_engine, model_name in evicted:
+            metrics.inc(
+                "model_evictions_total",
+                engine=nlp_engine,
+                model=model_name,
+                reason=reason,
+            )
+            logger.info(f"Unloaded NLP engine {nlp_engine}:{model_name} ({reason})")
+        gc.collect()
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        with self._lock:
+            total = sum(m.size_bytes for m in self._models.values())
+            count = len(self._models)
+        metrics.set_gauge("model_resident_bytes", total)
+        metrics.set_gauge("model_resident_count", count)
+
+    def _ensure_reaper(self) -> None:
+        """Start (eenmalig) een achtergrondthread die idle modellen opruimt."""
+        if self.idle_ttl <= 0 or self._reaper is not None:
+            return
+        interval = max(1.0, min(self.idle_ttl / 2, 60.0))
+
+        def reap() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.evict_idle()
+                except Exception as e:  # pragma: no cover
+                    logger.warning(f"Idle model eviction failed: {e}")
+
+        self._reaper = threading.Thread(target=reap, name="model-reaper", daemon=True)
+        self._reaper.start()
+
+    def stats(self) -> Dict[str, Any]:
+        """Geef de resident modellen met hun geschatte grootte en gebruik."""
+        now = time.monotonic()
+        with self._lock:
+            models = [
+                {
+                    "nlp_engine": key[0],
+                    "model_name": key[1],
+                    "size_mb": round(m.size_bytes / 1024 / 1024, 1),
+                    "idle_seconds": round(now - m.last_used, 1),
+                    "uses": m.uses,
+                }
+                for key, m in reversed(self._models.items())
+            ]
+            total = sum(m.size_bytes for m in self._models.values())
+        return {
+            "budget_mb": round(self.budget_bytes / 1024 / 1024, 1)
+            if self.budget_bytes > 0
+            else None,
+            "idle_ttl_seconds": self.idle_ttl if self.idle_ttl > 0 else None,
+            "resident_mb": round(total / 1024 / 1024, 1),
+            "models": models,
+        }
+
+
+def _default_pinned() -> Set[ModelKey]:
+    engines = {settings.DEFAULT_NLP_ENGINE, *settings.PRELOAD_NLP_ENGINES}
+    pinned = {(e, default_model_name(e)) for e in engines if e in NLP_ENGINES}
+    if "cascade" in engines:
+        # De modellen waar de cascade uit bestaat
+        pinned.add(("spacy", settings.DEFAULT_SPACY_MODEL))
+        pinned.add(
+            (settings.CASCADE_ESCALATION_ENGINE, settings.DEFAULT_TRANSFORMERS_MODEL)
+        )
+    return pinned
+
+
+model_manager = ModelManager()
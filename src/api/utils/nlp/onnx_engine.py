@@ -0,0 +1,114 @@
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer, pipeline
+
+from src.api.config import settings
+from src.api.utils.nlp.transformers_engine import TransformersEngine
+
+logger = logging.getLogger(__name__)
+
+_QUANTIZED_FILE_NAME = "model_quantized.onnx"
+_FULL_PRECISION_FILE_NAME = "model.onnx"
+
+
+def onnx_cache_path(model_name: str, quantize: bool = settings.ONNX_QUANTIZE) -> Path:
+    """Geef de map waarin de ONNX-export van een model gecachet wordt.
+
+    Args:
+        model_name (str): HuggingFace model-id of lokaal pad.
+        quantize (bool, optional): of de int8-variant bedoeld wordt.
+
+    Returns:
+        Path: map onder ``ONNX_CACHE_DIR``, per model en precisie.
+    """
+    safe_name = model_name.strip("/").replace("/", "--")
+    variant = f"int8-{settings.ONNX_QUANTIZATION_ARCH}" if quantize else "fp32"
+    return Path(settings.ONNX_CACHE_DIR) / safe_name / variant
+
+
+def _quantization_config() -> AutoQuantizationConfig:
+    arch = settings.ONNX_QUANTIZATION_ARCH
+    factory = getattr(AutoQuantizationConfig, arch, None)
+    if factory is None:
+        raise ValueError(f"Onbekende ONNX_QUANTIZATION_ARCH: {arch}")
+    # Dynamische quantisatie: gewichten int8, activaties per batch geschaald
+    return factory(is_static=False, per_channel=False)
+
+
+def export_onnx_model(model_name: str, quantize: bool = settings.ONNX_QUANTIZE) -> Path:
+    """Exporteer een token-classificatiemodel naar ONNX (eenmalig, gecachet).
+
+    De export wordt eerst in een tijdelijke map gemaakt en daarna in één keer naar
+    de cache verplaatst, zodat een afgebroken export geen halve cache achterlaat.
+
+    Args:
+        model_name (str): HuggingFace model-id of lokaal pad.
+        quantize (bool, optional): quantiseer de gewichten dynamisch naar int8.
+
+    Returns:
+        Path: map met het ONNX-model, de config en de tokenizer.
+    """
+    target = onnx_cache_path(model_name, quantize)
+    file_name = _QUANTIZED_FILE_NAME if quantize else _FULL_PRECISION_FILE_NAME
+    if (target / file_name).exists():
+        return target
+
+    logger.info(f"Exporting {model_name} to ONNX (quantize={quantize}) in {target}")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".export-", dir=target.parent))
+    try:
+        model = ORTModelForTokenClassification.from_pretrained(model_name, export=True)
+        model.save_pretrained(tmp_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(tmp_dir)
+        if quantize:
+            quantizer = ORTQuantizer.from_pretrained(tmp_dir)
+            quantizer.quantize(
+                save_dir=tmp_dir, quantization_config=_quantization_config()
+            )
+            (tmp_dir / _FULL_PRECISION_FILE_NAME).unlink(missing_ok=True)
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(tmp_dir, target)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return target
+
+
+class OnnxTransformersEngine(TransformersEngine):
+    """Transformers NER-engine op ONNX Runtime met een int8-gequantiseerd model.
+
+    Gebruikt dezelfde token-classification pipeline (en aggregatie) als
+    ``TransformersEngine``, alleen met een ONNX Runtime-model in plaats van
+    PyTorch. De entity-dicts zijn daardoor gelijk aan die van de torch-engine; de
+    scores kunnen door de quantisatie licht afwijken.
+    """
+
+    def __init__(
+        self,
+        model_name: str = settings.DEFAULT_TRANSFORMERS_MODEL,
+        quantize: bool = settings.ONNX_QUANTIZE,
+    ) -> None:
+        """Initialiseer de engine; exporteer het model als het nog niet gecachet is.
+
+        Args:
+            model_name (str): naam van het HuggingFace-model.
+            quantize (bool, optional): gebruik het int8-model. Defaults to
+                settings.ONNX_QUANTIZE.
+        """
+        self.model_name = model_name
+        self.quantize = quantize
+        model_dir = export_onnx_model(model_name, quantize)
+        model = ORTModelForTokenClassification.from_pretrained(
+            model_dir,
+            file_name=_QUANTIZED_FILE_NAME if quantize else _FULL_PRECISION_FILE_NAME,
+        )
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.ner_pipeline = pipeline(
+            "ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple"
+        )
@@ -0,0 +1,267 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.api.config import settings
+from src.api.utils.deadline import Deadline, OperationCancelled
+from src.api.utils.metrics import metrics
+from src.api.utils.nlp.base import NLPEngine
+
+logger = logging.getLogger(__name__)
+
+# Interval (seconden) waarmee een wachtend verzoek op annulering controleert
+_CANCEL_POLL_SECONDS = 0.25
+
+
+@dataclass
+class _InferenceRequest:
+    text: str
+    entities: Optional[List]
+    language: str
+    deadline: Optional[Deadline] = None
+    future: "Future[list]" = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class InferenceScheduler:
+    """Verzamelt gelijktijdige NER-verzoeken en voert ze als één batch uit.
+
+    Verzoeken worden op een wachtrij gezet; een achtergrondthread wacht na het
+    eerste verzoek maximaal ``max_wait_ms`` milliseconden op meer verzoeken (tot
+    ``max_batch_size``) en voert dan één ``analyze_batch``-aanroep uit
+    (``nlp.pipe`` of een gebatchte transformers pipeline). De resultaten gaan via
+    een ``Future`` terug naar de wachtende verzoeken.
+
+    Per batch worden de batchgrootte en de wachttijd in de wachtrij gerapporteerd
+    (``inference_batch_size`` en ``inference_queue_wait_ms``). Verzoeken waarvan de
+    ``Deadline`` verstreken of geannuleerd is, worden niet meer uitgevoerd.
+    """
+
+    def __init__(
+        self,
+        get_engine: Callable[[], NLPEngine],
+        name: str,
+        max_batch_size: int = settings.INFERENCE_MAX_BATCH_SIZE,
+        max_wait_ms: float = settings.INFERENCE_MAX_WAIT_MS,
+    ) -> None:
+        self.get_engine = get_engine
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: "queue.Queue[_InferenceRequest]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        # De workerthread bestaat niet in het kindproces; start deze opnieuw.
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        text: str,
+        entities: Optional[List] = None,
+        language: str = settings.DEFAULT_LANGUAGE,
+        deadline: Optional[Deadline] = None,
+    ) -> "Future[list]":
+        """Zet een tekst in de wachtrij en geef een Future met de entiteiten terug."""
+        request = _InferenceRequest(
+            text=text, entities=entities, language=language, deadline=deadline
+        )
+        self._ensure_worker()
+        self._queue.put(request)
+        metrics.set_gauge(
+            "inference_queue_depth", self._queue.qsize(), engine=self.name
+        )
+        return request.future
+
+    def analyze(
+        self,
+        text: str,
+        entities: Optional[List] = None,
+        language: str = settings.DEFAULT_LANGUAGE,
+        deadline: Optional[Deadline] = None,
+    ) -> list:
+        """Blokkerende variant van ``submit``: wacht op het resultaat.
+
+        Raises:
+            OperationCancelled: als de deadline tijdens het wachten verstrijkt of
+                het verzoek geannuleerd wordt.
+        """
+        return self._wait(self.submit(text, entities, language, deadline), deadline)
+
+    def analyze_many(
+        self,
+        texts: List[str],
+        entities: Optional[List] = None,
+        language: str = settings.DEFAULT_LANGUAGE,
+        deadline: Optional[Deadline] = None,
+    ) -> List[list]:
+        """Zet alle teksten tegelijk in de wachtrij, zodat ze samen in een batch komen.
+
+        Raises:
+            OperationCancelled: zoals bij ``analyze``; de andere teksten worden dan
+                ook uit de wachtrij gehaald.
+        """
+        futures = [self.submit(t, entities, language, deadline) for t in texts]
+        try:
+            return [self._wait(future, deadline) for future in futures]
+        except OperationCancelled:
+            for future in futures:
+                future.cancel()
+            raise
+
+    @staticmethod
+    def _wait(future: "Future[list]", deadline: Optional[Deadline]) -> list:
+        if deadline is None:
+            return future.result()
+        while True:
+            remaining = deadline.remaining()
+            try:
+                # In stukjes wachten, zodat ook een annulering opgemerkt wordt
+                return future.result(
+                    timeout=_CANCEL_POLL_SECONDS
+                    if remaining is None
+                    else min(remaining, _CANCEL_POLL_SECONDS)
+                )
+            except FutureTimeoutError:
+                try:
+                    deadline.check("ner")
+                except OperationCancelled:
+                    future.cancel()
+                    raise
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name=f"inference-{self.name}", daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> List[_InferenceRequest]:
+        batch = [self._queue.get()]
+        deadline = batch[0].enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout <= 0:
+                    # Wachttijd voorbij: neem alleen nog wat al klaarstaat mee
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            metrics.set_gauge(
+                "inference_queue_depth", self._queue.qsize(), engine=self.name
+            )
+            try:
+                self._process(batch)
+            except Exception as e:  # pragma: no cover
+                logger.error(f"Inference batch failed unexpectedly: {e}", exc_info=True)
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _process(self, batch: List[_InferenceRequest]) -> None:
+        started = time.monotonic()
+        metrics.observe("inference_batch_size", len(batch), engine=self.name)
+        for request in batch:
+            metrics.observe(
+                "inference_queue_wait_ms",
+                (started - request.enqueued_at) * 1000,
+                engine=self.name,
+            )
+
+        groups: Dict[str, List[_InferenceRequest]] = {}
+        for request in batch:
+            # set_running_or_notify_cancel: False als de wachtende al opgegeven heeft
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            if request.deadline is not None:
+                try:
+                    request.deadline.check("ner")
+                except OperationCancelled as e:
+                    request.future.set_exception(e)
+                    continue
+            groups.setdefault(request.language, []).append(request)
+
+        engine = self.get_engine()
+        for language, requests in groups.items():
+            try:
+                # Filter per verzoek achteraf, zodat verzoeken met verschillende
+                # entiteiten in dezelfde batch kunnen.
+                outputs = engine.analyze_batch(
+                    [r.text for r in requests], None, language
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Batched inference of {len(requests)} texts failed ({e}); "
+                    "falling back to one by one"
+                )
+                self._process_individually(engine, requests)
+                continue
+            for request, results in zip(requests, outputs):
+                request.future.set_result(_filter(results, request.entities))
+
+        metrics.observe(
+            "inference_batch_seconds", time.monotonic() - started, engine=self.name
+        )
+
+    @staticmethod
+    def _process_individually(
+        engine: NLPEngine, requests: List[_InferenceRequest]
+    ) -> None:
+        for request in requests:
+            try:
+                request.future.set_result(
+                    engine.analyze(request.text, request.entities, request.language)
+                )
+            except Exception as e:
+                request.future.set_exception(e)
+
+
+def _filter(results: list, entities: Optional[List]) -> list:
+    if entities is None:
+        return results
+    return [r for r in results if r["entity_type"] in entities]
+
+
+_schedulers: Dict[Tuple[str, str], InferenceScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(nlp_engine: str, model_name: str) -> InferenceScheduler:
+    """Geef de (gedeelde) scheduler voor een (engine, model)-combinatie.
+
+    De engine wordt per batch via de model manager opgehaald, zodat een ontladen
+    model bij de volgende batch opnieuw geladen wordt.
+    """
+    key = (nlp_engine, model_name)
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        from src.api.utils.nlp.manager import model_manager
+
+        with _schedulers_lock:
+            scheduler = _schedulers.get(key)
+            if scheduler is None:
+                scheduler = _schedulers[key] = InferenceScheduler(
+                    get_engine=lambda: model_manager.get(nlp_engine, model_name),
+                    name=nlp_engine,
+                )
+    return scheduler
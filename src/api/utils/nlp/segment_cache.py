@@ -0,0 +1,123 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.api.config import settings
+from src.api.utils.metrics import metrics
+
+Span = Tuple[int, int]  # (start, end) in de volledige tekst
+# (engine, model, taal, entiteiten of None, hash van het segment)
+SegmentKey = Tuple[str, str, str, Optional[Tuple[str, ...]], str]
+
+# Een of meer lege regels scheiden alinea's
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t\r\f\v]*\n\s*")
+# Zinseinde gevolgd door witruimte; alleen gebruikt voor te lange alinea's
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_segments(text: str, max_chars: int) -> List[Span]:
+    """Verdeel een tekst in alinea's, en te lange alinea's in zinnen.
+
+    De grenzen hangen alleen af van de inhoud van een alinea zelf, zodat een
+    alinea die in twee teksten voorkomt, in beide dezelfde segmenten oplevert.
+    Witruimte rond een segment hoort er niet bij; segmenten zonder tekens worden
+    overgeslagen.
+
+    Args:
+        text (str): de tekst.
+        max_chars (int): alinea's langer dan dit worden in zinnen gesplitst (0 = nooit).
+
+    Returns:
+        List[Span]: de segmenten, op volgorde, als offsets in ``text``.
+    """
+    spans: List[Span] = []
+    for paragraph in _split(text, 0, len(text), _PARAGRAPH_BREAK):
+        if 0 < max_chars < paragraph[1] - paragraph[0]:
+            spans.extend(_split(text, *paragraph, _SENTENCE_BREAK))
+        else:
+            spans.append(paragraph)
+    return spans
+
+
+def _split(text: str, start: int, end: int, pattern: re.Pattern) -> List[Span]:
+    spans: List[Span] = []
+    position = start
+    for match in pattern.finditer(text, start, end):
+        spans.append((position, match.start()))
+        position = match.end()
+    spans.append((position, end))
+    return [_strip(text, s, e) for s, e in spans if text[s:e].strip()]
+
+
+def _strip(text: str, start: int, end: int) -> Span:
+    segment = text[start:end]
+    leading = len(segment) - len(segment.lstrip())
+    return start + leading, start + len(segment.rstrip())
+
+
+def segment_hash(segment: str) -> str:
+    return hashlib.sha256(segment.encode("utf-8")).hexdigest()
+
+
+class SegmentCache:
+    """LRU-cache met NER-resultaten per segment, op basis van een hash van de tekst.
+
+    Teksten uit sjablonen (brieven met dezelfde standaardalinea's) delen het
+    grootste deel van hun segmenten; alleen de segmenten die nog niet eerder
+    gezien zijn, gaan door het model. De resultaten staan met offsets relatief
+    aan het segment in de cache, en staan alleen in het geheugen van dit proces.
+    """
+
+    def __init__(self, max_entries: int = settings.ANALYSIS_CACHE_MAX_SEGMENTS) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[SegmentKey, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: SegmentKey) -> Optional[list]:
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            self._record(hit=results is not None)
+            return results
+
+    def put(self, key: SegmentKey, results: list) -> None:
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.inc("analysis_segment_cache_evicted_total")
+            metrics.set_gauge("analysis_segment_cache_entries", len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            metrics.set_gauge("analysis_segment_cache_entries", 0)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _record(self, hit: bool) -> None:
+        metrics.inc("analysis_segment_cache_total", result="hit" if hit else "miss")
+        metrics.set_gauge("analysis_segment_cache_hit_rate", round(self.hit_rate, 4))
+
+
+segment_cache = SegmentCache()
@@ -1,10 +1,94 @@
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional, Tuple
 
 import spacy
 
 from src.api.config import settings
 from src.api.utils.nlp.base import NLPEngine
 
+logger = logging.getLogger(__name__)
+
+# Componenten van de nl_core_news-pipelines (sm/md/lg).
+_PIPELINE_COMPONENTS = (
+    "tok2vec",
+    "morphologizer",
+    "tagger",
+    "parser",
+    "senter",
+    "attribute_ruler",
+    "lemmatizer",
+    "ner",
+)
+
+# Per profiel de componenten die geladen blijven (None = volledige pipeline).
+# In de nl_core_news-modellen heeft "ner" een eigen tok2vec-laag, dus de gedeelde
+# tok2vec is alleen nodig voor morphologizer/lemmatizer. Lemma's worden gelezen door
+# Presidio's context enhancer.
+PIPELINE_PROFILES: Dict[str, Optional[Tuple[str, ...]]] = {
+    "full": None,
+    "ner-only": ("ner",),
+    "ner+lemma": (
+        "tok2vec",
+        "morphologizer",
+        "tagger",
+        "attribute_ruler",
+        "lemmatizer",
+        "ner",
+    ),
+}
+
+
+def excluded_components(profile: str) -> List[str]:
+    """Geef de pipeline-componenten die voor een profiel niet geladen worden.
+
+    Args:
+        profile (str): "full", "ner-only" of "ner+lemma".
+
+    Raises:
+        ValueError: als het profiel onbekend is.
+
+    Returns:
+        List[str]: namen om aan ``spacy.load(..., exclude=...)`` mee te geven.
+    """
+    if profile not in PIPELINE_PROFILES:
+        raise ValueError(
+            f"Onbekend spaCy pipeline-profiel '{profile}', "
+            f"kies uit: {', '.join(PIPELINE_PROFILES)}"
+        )
+    keep = PIPELINE_PROFILES[profile]
+    if keep is None:
+        return []
+    return [c for c in _PIPELINE_COMPONENTS if c not in keep]
+
+
+def load_spacy_pipeline(
+    model_name: str, profile: str = settings.SPACY_PIPELINE_PROFILE
+) -> spacy.language.Language:
+    """Laad een spaCy-model met alleen de componenten uit het profiel.
+
+    Uitgesloten componenten worden niet geladen (geen gewichten in het geheugen).
+    Als het model met dit profiel niet werkt, bijvoorbeeld omdat de NER een
+    gedeelde tok2vec gebruikt, wordt de volledige pipeline geladen.
+    """
+    exclude = excluded_components(profile)
+    if exclude:
+        try:
+            nlp = spacy.load(model_name, exclude=exclude)
+            nlp("Test")  # controleer dat de resterende componenten zelfstandig werken
+            logger.info(
+                f"Loaded spaCy model {model_name} with profile '{profile}': "
+                f"{nlp.pipe_names}"
+            )
+            return nlp
+        except OSError:
+            raise
+        except Exception as e:
+            logger.warning(
+                f"spaCy profile '{profile}' does not work for {model_name} ({e}); "
+                "loading the full pipeline"
+            )
+    return spacy.load(model_name)
+
 
 class SpacyEngine(NLPEngine):
     """Wrapper voor SpaCy NER-engine voor Nederlandse PII-detectie.
@@ -12,17 +96,22 @@ class SpacyEngine(NLPEngine):
     Laadt een opgegeven SpaCy-model en voert entity extractie uit.
     """
 
-    def __init__(self, model_name: str = settings.DEFAULT_SPACY_MODEL) -> None:
+    def __init__(
+        self,
+        model_name: str = settings.DEFAULT_SPACY_MODEL,
+        profile: str = settings.SPACY_PIPELINE_PROFILE,
+    ) -> None:
         self.model_name = model_name
+        self.profile = profile
         try:
-            self.nlp: spacy.language.Language = spacy.load(model_name)
+            self.nlp: spacy.language.Language = load_spacy_pipeline(model_name, profile)
         except Exception:
             # Fallback: probeer model on-the-fly te installeren (handig voor staging)
             try:
                 from spacy.cli import download as spacy_download
 
                 spacy_download(model_name)
-                self.nlp = spacy.load(model_name)  # type: ignore[assignment]
+                self.nlp = load_spacy_pipeline(model_name, profile)
             except Exception as e:  # pragma: no cover
                 raise RuntimeError(
                     f"SpaCy model '{model_name}' kon niet worden geladen/geïnstalleerd: {e}"
@@ -44,7 +133,22 @@ class SpacyEngine(NLPEngine):
         Returns:
             list: een lijst van dictionaries met de resultaten van de analyse.
         """
-        doc = self.nlp(text)
+        return self._doc_to_results(self.nlp(text), entities)
+
+    def analyze_batch(
+        self,
+        texts: List[str],
+        entities: Optional[List] = None,
+        language: str = settings.DEFAULT_LANGUAGE,
+    ) -> List[list]:
+        """Analyseer meerdere teksten met één ``nlp.pipe``-aanroep."""
+        return [
+            self._doc_to_results(doc, entities)
+            for doc in self.nlp.pipe(texts, batch_size=max(1, len(texts)))
+        ]
+
+    @staticmethod
+    def _doc_to_results(doc: spacy.tokens.Doc, entities: Optional[List]) -> list:
         results = []
         for ent in doc.ents:
             if entities is None or ent.label_ in entities:
@@ -36,8 +36,23 @@ class TransformersEngine(NLPEngine):
         Returns:
             list: Lijst van gevonden entiteiten met type, start, end, score en tekst.
         """
+        return self._to_results(text, self.ner_pipeline(text), entities)
+
+    def analyze_batch(
+        self, texts: List[str], entities: Optional[List] = None, language: str = "nl"
+    ) -> List[list]:
+        """Voert NER uit op meerdere teksten in één batched forward pass."""
+        if not texts:
+            return []
+        outputs = self.ner_pipeline(texts, batch_size=len(texts))
+        return [
+            self._to_results(text, ents, entities) for text, ents in zip(texts, outputs)
+        ]
+
+    @staticmethod
+    def _to_results(text: str, pipeline_output: list, entities: Optional[List]) -> list:
         results = []
-        for ent in self.ner_pipeline(text):
+        for ent in pipeline_output:
             # Mapping van model-labels naar Presidio/standaard labels kan hier uitgebreid worden
             entity_type = ent.get("entity_group", ent.get("entity", ""))
             if entities is None or entity_type in entities:
@@ -1,14 +1,69 @@
-from typing import List, Optional
-
-from presidio_analyzer import Pattern, PatternRecognizer
-
+from typing import Callable, List, Optional
+
+from presidio_analyzer import Pattern, PatternRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+from src.api.config import settings
+from src.api.utils.metrics import metrics
+from src.api.utils.validators import (
+    is_valid_bsn,
+    is_valid_iban,
+    is_valid_nl_phone,
+    is_valid_nl_vat,
+)
+
+
+class ChecksumPatternRecognizer(PatternRecognizer):
+    """Basis voor herkenners met een controlegetal of vaste structuur in een treffer.
+
+    Subklassen geven met ``validator`` een goedkope controle op. Presidio roept die
+    via ``validate_result`` direct na elke regex-match aan: een geldige treffer
+    krijgt de maximale score (alleen bij een echt controlegetal, zie
+    ``boost_valid``), een ongeldige wordt afhankelijk van
+    settings.CHECKSUM_INVALID_ACTION weggelaten ("drop") of krijgt de score
+    settings.CHECKSUM_INVALID_SCORE ("downscore"). Ongeldige treffers worden
+    geteld in ``checksum_invalid_total``.
+    """
 
-class DutchPhoneNumberRecognizer(PatternRecognizer):
+    validator: Callable[[str], bool]
+    # Gezet door Presidio's (ongetypeerde) EntityRecognizer.__init__
+    name: str
+    # False voor alleen een structuurcontrole: een geldige treffer houdt zijn score
+    boost_valid = True
+
+    def validate_result(self, pattern_text: str) -> Optional[bool]:
+        if self.validator(pattern_text):
+            return True if self.boost_valid else None
+        metrics.inc("checksum_invalid_total", recognizer=self.name)
+        if settings.CHECKSUM_INVALID_ACTION == "drop":
+            return False
+        # Behoud de treffer; de score wordt in analyze verlaagd
+        return None
+
+    def analyze(
+        self,
+        text: str,
+        entities: List[str],
+        nlp_artifacts: Optional[NlpArtifacts] = None,
+        regex_flags: Optional[int] = None,
+    ) -> List[RecognizerResult]:
+        results = super().analyze(text, entities, nlp_artifacts, regex_flags)
+        if settings.CHECKSUM_INVALID_ACTION == "downscore":
+            for result in results:
+                if not self.validator(text[result.start : result.end]):
+                    result.score = min(result.score, settings.CHECKSUM_INVALID_SCORE)
+        return results
+
+
+class DutchPhoneNumberRecognizer(ChecksumPatternRecognizer):
     """Herkenner voor Nederlandse telefoonnummers.
 
     Gebruikt een regex-patroon voor mobiele en vaste nummers in NL-formaat.
     """
 
+    validator = staticmethod(is_valid_nl_phone)
+    boost_valid = False
+
     def __init__(
         self,
         context: Optional[List[str]] = None,
@@ -25,13 +80,16 @@ class DutchPhoneNumberRecognizer(PatternRecognizer):
         )
 
 
-class DutchIBANRecognizer(PatternRecognizer):
+class DutchIBANRecognizer(ChecksumPatternRecognizer):
     """Herkenner voor IBAN bankrekeningnummers.
 
     Ondersteunt Nederlandse IBANs (beginnend met 'NL') en internationale IBANs,
-    in zowel aaneengesloten als gespatieerde vormen.
+    in zowel aaneengesloten als gespatieerde vormen. Treffers worden gecontroleerd
+    met het mod-97-controlegetal.
     """
 
+    validator = staticmethod(is_valid_iban)
+
     def __init__(
         self,
         context: Optional[List[str]] = None,
@@ -83,7 +141,14 @@ class EmailRecognizer(PatternRecognizer):
         )
 
 
-class DutchBSNRecognizer(PatternRecognizer):
+class DutchBSNRecognizer(ChecksumPatternRecognizer):
+    """Herkenner voor burgerservicenummers (9 cijfers).
+
+    Een treffer wordt gecontroleerd met de elfproef.
+    """
+
+    validator = staticmethod(is_valid_bsn)
+
     def __init__(self, context: Optional[List[str]] = None) -> None:
         pattern = Pattern(
             "NL_BSN",
@@ -97,9 +162,6 @@ class DutchBSNRecognizer(PatternRecognizer):
             supported_language="nl",
         )
 
-    def _is_valid_bsn(self, bsn: str) -> bool:
-        digits = [int(d) for d in bsn if d.isdigit()]
-        return sum((9 - i) * d for i, d in enumerate(digits)) % 11 == 0
 
 class DutchPostcodeRecognizer(PatternRecognizer):
     def __init__(
@@ -115,7 +177,9 @@ class DutchPostcodeRecognizer(PatternRecognizer):
 
 
 # BTW-/VAT-nummer (NL999999999B99 – nieuw formaat)
-class DutchVATRecognizer(PatternRecognizer):
+class DutchVATRecognizer(ChecksumPatternRecognizer):
+    validator = staticmethod(is_valid_nl_vat)
+
     def __init__(
         self, context: Optional[List[str]] = None, supported_language: str = "nl"
     ) -> None:
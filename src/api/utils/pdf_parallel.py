@@ -0,0 +1,404 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pymupdf
+
+from src.api.config import settings
+from src.api.utils.deadline import Deadline, check_deadline
+from src.api.utils.metrics import metrics
+from src.api.utils.progress import (
+    ANALYZE,
+    EMBED,
+    EXTRACT,
+    REDACT,
+    ProgressCallback,
+    emit,
+)
+
+logger = logging.getLogger(__name__)
+
+# Interval (seconden) waarmee de deadline gecontroleerd wordt tijdens het wachten
+_POLL_SECONDS = 0.25
+
+PageRange = Tuple[int, int]  # (start, stop), 0-based, stop exclusief
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# Uit in de workerprocessen zelf (en in de batch-workers): geen geneste pools
+_enabled = True
+
+
+def _reset_after_fork() -> None:
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def disable() -> None:
+    """Schakel parallelle verwerking uit in dit proces (bijv. in een worker)."""
+    global _enabled
+    _enabled = False
+
+
+def should_parallelize(page_count: int) -> bool:
+    """Wordt een document met ``page_count`` pagina's in stukken verwerkt?"""
+    threshold = settings.PDF_PARALLEL_PAGE_THRESHOLD
+    return (
+        _enabled
+        and threshold > 0
+        and settings.PDF_PARALLEL_WORKERS > 1
+        and page_count >= threshold
+    )
+
+
+def page_ranges(page_count: int, range_pages: int) -> List[PageRange]:
+    """Verdeel ``page_count`` pagina's in opeenvolgende stukken van ``range_pages``."""
+    size = max(1, range_pages)
+    return [
+        (start, min(start + size, page_count)) for start in range(0, page_count, size)
+    ]
+
+
+def _init_worker() -> None:
+    from src.api.services.text_analyzer import get_text_analyzer
+
+    disable()
+    try:
+        get_text_analyzer()
+    except Exception as e:
+        # Niet fataal voor de pool: redactie heeft geen model nodig en een
+        # analyse laadt het alsnog (en meldt dan de fout bij dat document)
+        logger.warning(f"PDF worker {os.getpid()} could not preload the model: {e}")
+        return
+    logger.info(f"PDF worker {os.getpid()} ready")
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # "spawn": geen threads of modelstatus van de API in de workers
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PDF_PARALLEL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+    return _pool
+
+
+def _discard_pool(broken: ProcessPoolExecutor) -> None:
+    """Ruim een kapotte pool op; de volgende aanvraag start een nieuwe."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_ranges(
+    func: Callable[..., Any],
+    jobs: Sequence[Tuple[Any, ...]],
+    deadline: Optional[Deadline],
+    stage: str,
+    on_done: Optional[Callable[[int, Any], None]] = None,
+) -> List[Any]:
+    """Voer ``func(*job)`` per stuk uit in de pool; resultaten in volgorde van ``jobs``.
+
+    ``on_done(index, result)`` wordt in de volgorde van ``jobs`` aangeroepen, zodra
+    een stuk en alle stukken ervoor klaar zijn. Bij een verlopen of geannuleerde
+    deadline worden de nog niet gestarte stukken geannuleerd. Valt een worker weg
+    (bijv. door te weinig geheugen), dan is de pool kapot: die wordt vervangen en
+    de onafgemaakte stukken worden één keer opnieuw geprobeerd.
+    """
+    results: List[Any] = [None] * len(jobs)
+    finished = [False] * len(jobs)
+    reported = 0
+    retried = False
+    while True:
+        pool = _get_pool()
+        pending: set = set()
+        try:
+            futures: Dict[Future, int] = {
+                pool.submit(func, *jobs[index]): index
+                for index in range(len(jobs))
+                if not finished[index]
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(
+                    pending, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    index = futures[future]
+                    results[index] = future.result()
+                    finished[index] = True
+                while reported < len(jobs) and finished[reported]:
+                    if on_done is not None:
+                        on_done(reported, results[reported])
+                    reported += 1
+                check_deadline(deadline, stage)
+            return results
+        except BrokenProcessPool:
+            for future in pending:
+                future.cancel()
+            _discard_pool(pool)
+            metrics.inc("pdf_parallel_pool_broken_total", stage=stage)
+            if retried:
+                raise
+            retried = True
+            logger.warning(f"PDF worker pool broke during {stage}, retrying once")
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+
+def _timeout(deadline: Optional[Deadline]) -> Optional[float]:
+    # Een Deadline kan niet naar een ander proces; de worker krijgt de resterende tijd
+    return deadline.remaining() if deadline is not None else None
+
+
+def _analyze_range(
+    source_path: str,
+    page_range: PageRange,
+    timeout: Optional[float],
+    nlp_engine: Optional[str],
+) -> Tuple[List[str], List[dict]]:
+    """Worker: extraheer en analyseer één stuk pagina's.
+
+    Returns:
+        de tekst per pagina en de entiteiten, met offsets in de tekst van dit
+        stuk (de pagina's samengevoegd met newlines).
+    """
+    from src.api.services.text_analyzer import get_text_analyzer
+    from src.api.utils.lanes import BULK
+
+    deadline = Deadline(timeout)
+    start, stop = page_range
+    with pymupdf.open(source_path) as doc:
+        texts = []
+        for page_idx in range(start, stop):
+            deadline.check(EXTRACT)
+            texts.append(doc[page_idx].get_text())
+    text = "\n".join(texts)
+    entities = (
+        get_text_analyzer(nlp_engine or settings.DEFAULT_NLP_ENGINE).analyze_text(
+            text, deadline=deadline, priority=BULK
+        )
+        if text.strip()
+        else []
+    )
+    return texts, entities
+
+
+def analyze_pdf_parallel(
+    source_path: Path,
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    nlp_engine: Optional[str] = None,
+) -> Tuple[List[str], List[dict]]:
+    """Extraheer en analyseer een groot document in stukken, verdeeld over processen.
+
+    Elk stuk (PDF_PARALLEL_RANGE_PAGES pagina's) wordt als één tekst geanalyseerd;
+    de offsets worden daarna omgerekend naar de volledige tekst, zoals die van
+    ``extract_text_from_pdf``. Een entiteit die over de grens van twee stukken
+    loopt, wordt niet als één entiteit gevonden.
+
+    Args:
+        source_path (Path): het PDF-bestand.
+        deadline (Deadline, optional): gecontroleerd tijdens het wachten en in de
+            workers.
+        on_progress (ProgressCallback, optional): ``extract`` en ``analyze`` per
+            pagina, zodra het stuk van die pagina klaar is.
+        nlp_engine (str, optional): de NLP-engine; None voor DEFAULT_NLP_ENGINE.
+
+    Returns:
+        Tuple[List[str], List[dict]]: de tekst per pagina en alle entiteiten, met
+            offsets in de volledige tekst (de pagina's samengevoegd met newlines).
+    """
+    from src.api.utils.pdf_xmp import entities_on_page
+
+    with pymupdf.open(str(source_path)) as doc:
+        page_count = doc.page_count
+    ranges = page_ranges(page_count, settings.PDF_PARALLEL_RANGE_PAGES)
+    metrics.inc("pdf_parallel_documents_total", stage=ANALYZE)
+    logger.info(f"Analyzing {source_path} ({page_count} pages) in {len(ranges)} ranges")
+
+    range_offset = 0
+
+    def report(index: int, result: Tuple[List[str], List[dict]]) -> None:
+        # Per pagina, met offsets in de volledige tekst (zoals analyze_pdf_pages)
+        nonlocal range_offset
+        texts, entities = result
+        offset = 0
+        for page_number, page_text in enumerate(texts, start=ranges[index][0] + 1):
+            end = offset + len(page_text)
+            emit(on_progress, EXTRACT, page=page_number, pages=page_count)
+            emit(
+                on_progress,
+                ANALYZE,
+                page=page_number,
+                pages=page_count,
+                entities=[
+                    {
+                        **e,
+                        "start": e["start"] + range_offset,
+                        "end": e["end"] + range_offset,
+                    }
+                    for e in entities_on_page(entities, offset, end)
+                ],
+            )
+            offset = end + 1
+        range_offset += offset
+
+    results = _run_ranges(
+        _analyze_range,
+        [(str(source_path), r, _timeout(deadline), nlp_engine) for r in ranges],
+        deadline,
+        ANALYZE,
+        on_done=report if on_progress is not None else None,
+    )
+
+    # Aan elkaar zetten: offsets verschuiven met de lengte van de eerdere stukken
+    all_texts: List[str] = []
+    all_entities: List[dict] = []
+    offset = 0
+    for texts, entities in results:
+        all_entities.extend(
+            {**e, "start": e["start"] + offset, "end": e["end"] + offset}
+            for e in entities
+        )
+        all_texts.extend(texts)
+        offset += len("\n".join(texts)) + 1
+    return all_texts, all_entities
+
+
+def _redact_range(
+    source_path: str,
+    page_range: PageRange,
+    output_path: str,
+    replacements: Dict[str, str],
+    private_key: str,
+    entity_masks: Optional[Dict[str, str]],
+    value_masks: Optional[Dict[str, str]],
+    timeout: Optional[float],
+    page_count: int,
+) -> List[dict]:
+    """Worker: redigeer één stuk pagina's en schrijf het als losse PDF weg."""
+    from src.api.utils.pdf_xmp import redact_pages
+
+    start, stop = page_range
+    with pymupdf.open(source_path) as doc:
+        doc.select(list(range(start, stop)))
+        occurrences = redact_pages(
+            doc,
+            replacements,
+            private_key,
+            entity_masks=entity_masks,
+            value_masks=value_masks,
+            deadline=Deadline(timeout),
+            first_page=start + 1,
+            page_count=page_count,
+        )
+        doc.save(output_path)
+    return occurrences
+
+
+def anonymize_pdf_parallel(
+    input_path: str,
+    output_path: str,
+    replacements: Dict[str, str],
+    private_key: str,
+    *,
+    entity_masks: Optional[Dict[str, str]] = None,
+    value_masks: Optional[Dict[str, str]] = None,
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> List[dict]:
+    """Anonimiseer een groot document in stukken, verdeeld over processen.
+
+    Elk stuk wordt door een worker geredigeerd en als losse PDF weggeschreven;
+    daarna worden de stukken in volgorde samengevoegd tot één document (met de
+    metadata en inhoudsopgave van het origineel) en krijgt dat document één
+    occurrence-tabel in de XMP, met doorlopende ids. Zelfde argumenten en
+    resultaat als ``pdf_xmp.anonymize_pdf``.
+    """
+    from src.api.utils.pdf_xmp import _embed_occurrences_xmp
+
+    with pymupdf.open(input_path) as source:
+        page_count = source.page_count
+        metadata = source.metadata
+        toc = source.get_toc(simple=False)
+    ranges = page_ranges(page_count, settings.PDF_PARALLEL_RANGE_PAGES)
+    metrics.inc("pdf_parallel_documents_total", stage=REDACT)
+    logger.info(f"Redacting {input_path} ({page_count} pages) in {len(ranges)} ranges")
+
+    def report(index: int, occurrences: List[dict]) -> None:
+        for page_number in range(ranges[index][0] + 1, ranges[index][1] + 1):
+            emit(
+                on_progress,
+                REDACT,
+                page=page_number,
+                pages=page_count,
+                redactions=sum(1 for o in occurrences if o["page"] == page_number),
+            )
+
+    with tempfile.TemporaryDirectory(prefix="pdf_ranges_") as tmp:
+        parts = [str(Path(tmp) / f"range_{i:05d}.pdf") for i in range(len(ranges))]
+        results = _run_ranges(
+            _redact_range,
+            [
+                (
+                    input_path,
+                    page_range,
+                    part,
+                    replacements,
+                    private_key,
+                    entity_masks,
+                    value_masks,
+                    _timeout(deadline),
+                    page_count,
+                )
+                for page_range, part in zip(ranges, parts)
+            ],
+            deadline,
+            REDACT,
+            on_done=report if on_progress is not None else None,
+        )
+
+        # Samenvoegen in paginavolgorde; pas daarna wordt output_path geschreven
+        stitched = pymupdf.open()
+        try:
+            for part in parts:
+                with pymupdf.open(part) as range_doc:
+                    stitched.insert_pdf(range_doc)
+            if metadata:
+                stitched.set_metadata(metadata)
+            if toc:
+                try:
+                    stitched.set_toc(toc)
+                except Exception as e:
+                    logger.warning(f"Could not copy the table of contents: {e}")
+            stitched.save(output_path)
+        finally:
+            stitched.close()
+
+    occurrences: List[dict] = []
+    for range_occurrences in results:
+        for occ in range_occurrences:
+            occ["id"] = f"ann{len(occurrences)}"
+            occurrences.append(occ)
+    _embed_occurrences_xmp(output_path, occurrences)
+    emit(on_progress, EMBED, occurrences=len(occurrences))
+    return occurrences
@@ -1,3 +1,4 @@
+import contextlib
 import hashlib
 import json
 import logging
@@ -8,7 +9,7 @@ import xml.sax.saxutils as saxutils
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import pikepdf
 import pymupdf
@@ -16,9 +17,13 @@ from fastapi import BackgroundTasks, UploadFile
 from sqlalchemy.orm import Session
 
 from src.api import database
-from src.api.crud import create_document, create_tag
+from src.api.crud import (
+    create_document,
+    create_document_pages,
+    create_tag,
+    get_page_entities,
+)
 from src.api.dtos import DocumentAnonymizationRequest, DocumentDto, DocumentTagDto
-from src.api.services.text_analyzer import ModularTextAnalyzer
 from src.api.utils.crypto import (
     aes_gcm_decrypt as decrypt_entity,
 )
@@ -28,6 +33,17 @@ from src.api.utils.crypto import (
 from src.api.utils.crypto import (
     fingerprint_sha256 as get_fingerprint,
 )
+from src.api.utils.deadline import Deadline, OperationCancelled, check_deadline
+from src.api.utils.lanes import BULK, run_in_lane
+from src.api.utils.metrics import metrics
+from src.api.utils.progress import (
+    ANALYZE,
+    EMBED,
+    EXTRACT,
+    REDACT,
+    ProgressCallback,
+    emit,
+)
 
 _DEFAULT_ENTITY_MASK = {
     "person": "[PERSON]",
@@ -140,7 +156,10 @@ async def create_temp_paths_and_save(file: UploadFile) -> Tuple[Path, Path]:
 
 
 async def upload_and_analyze_files(
-    files: list[UploadFile], tags: Optional[list[str]], db: Session
+    files: list[UploadFile],
+    tags: Optional[list[str]],
+    db: Session,
+    deadline: Optional[Deadline] = None,
 ) -> list[DocumentDto]:
     """Upload files, analyze them for PII entities, and store metadata in the database.
 
@@ -148,6 +167,11 @@ async def upload_and_analyze_files(
         files (list[UploadFile]): List of files to be uploaded and analyzed.
         tags (list[str]): List of tags to be associated with the documents.
         db (Session): Database session for storing document metadata.
+        deadline (Deadline, optional): Checked between pages and analysis batches.
+
+    Raises:
+        OperationCancelled: When the deadline passes or the client disconnects;
+            ``partial_result`` holds the documents that were fully processed.
 
     Returns:
         _type_: list[DocumentDto]
@@ -155,59 +179,185 @@ async def upload_and_analyze_files(
     docs: list[DocumentDto] = []
 
     for file in files:
-        content = await file.read()
-        await file.close()
+        file_id, source_path = await save_upload(file)
+
+        try:
+            page_texts, known_pages = await find_known_pages(db, source_path, deadline)
+            # Op de bulk-lane, zodat PDF's de threads voor tekstverzoeken niet
+            # bezetten en de event loop een verbroken verbinding opmerkt
+            analysis = await run_in_lane(
+                BULK,
+                analyze_pdf_document,
+                source_path,
+                deadline,
+                page_texts=page_texts,
+                known_pages=known_pages,
+            )
+        except OperationCancelled as e:
+            # Het onvolledig geanalyseerde bestand wordt niet bewaard
+            source_path.unlink(missing_ok=True)
+            e.partial_result = docs
+            raise
+
+        docs.append(
+            store_document(
+                db,
+                file,
+                file_id,
+                source_path,
+                analysis.entities,
+                unique_entities(analysis.entities),
+                tags,
+                pages=analysis.pages,
+            )
+        )
+    return docs
+
+
+async def find_known_pages(
+    db: Session, source_path: Path, deadline: Optional[Deadline] = None
+) -> Tuple[Optional[List[str]], Dict[str, List[dict]]]:
+    """Extract the pages of an upload and look up the ones analyzed before.
 
-        file_id = uuid.uuid4().hex
-        from src.api.config import settings
+    Returns:
+        Tuple[Optional[List[str]], Dict[str, List[dict]]]: the page texts and the
+            stored entities by page hash; (None, {}) when PAGE_ANALYSIS_REUSE is off.
+    """
+    from src.api.config import settings
+    from src.api.services.text_analyzer import analyzer_fingerprint
+
+    if not settings.PAGE_ANALYSIS_REUSE:
+        return None, {}
+    page_texts = await run_in_lane(BULK, extract_pages, source_path, deadline)
+    known_pages = get_page_entities(
+        db,
+        analyzer_fingerprint(),
+        content_hashes=[page_hash(t) for t in page_texts],
+    )
+    if known_pages:
+        logger.info(
+            f"{source_path.name}: {len(known_pages)} of {len(page_texts)} pages "
+            "were analyzed before"
+        )
+    return page_texts, known_pages
 
-        source_dir = Path(settings.DATA_DIR) / "temp/source"
-        source_dir.mkdir(parents=True, exist_ok=True)
-        source_path = source_dir / f"{file_id}.pdf"
-        with open(source_path, "wb") as f:
-            f.write(content)
 
-        text = extract_text_from_pdf(source_path)
+def document_known_pages(db: Session, document_id: str) -> Dict[str, List[dict]]:
+    """The stored page analyses of a document ({} when PAGE_ANALYSIS_REUSE is off)."""
+    from src.api.config import settings
+    from src.api.services.text_analyzer import analyzer_fingerprint
+
+    if not settings.PAGE_ANALYSIS_REUSE:
+        return {}
+    return get_page_entities(db, analyzer_fingerprint(), document_id=document_id)
 
-        entities, unique = await extract_unique_entities(text=text)
 
-        # Convert entities to JSON string for database storage
-        import json
+async def save_upload(file: UploadFile) -> Tuple[str, Path]:
+    """Save an uploaded PDF under a new file id in ``DATA_DIR/temp/source``.
 
-        entities_json = json.dumps(entities) if entities else None
+    Returns:
+        Tuple[str, Path]: the file id and the path of the saved file.
+    """
+    content = await file.read()
+    await file.close()
 
-        db_document = create_document(
+    file_id = uuid.uuid4().hex
+    from src.api.config import settings
+
+    source_dir = Path(settings.DATA_DIR) / "temp/source"
+    source_dir.mkdir(parents=True, exist_ok=True)
+    source_path = source_dir / f"{file_id}.pdf"
+    with open(source_path, "wb") as f:
+        f.write(content)
+    return file_id, source_path
+
+
+def store_document(
+    db: Session,
+    file: UploadFile,
+    file_id: str,
+    source_path: Path,
+    entities: list[dict],
+    unique: list[dict[str, str]],
+    tags: Optional[list[str]],
+    pages: Optional[List["PageAnalysis"]] = None,
+) -> DocumentDto:
+    """Store an analyzed upload, its tags and its per-page analysis in the database.
+
+    Returns:
+        DocumentDto: the metadata of the stored document.
+    """
+    # Convert entities to JSON string for database storage
+    entities_json = json.dumps(entities) if entities else None
+
+    db_document = create_document(
+        db,
+        id=file_id,
+        filename=file.filename or f"{file_id}.pdf",
+        content_type=file.content_type or "application/pdf",
+        source_path=str(source_path),
+        anonymized_path=None,
+        pii_entities=entities_json,
+    )
+
+    db_tags = []
+    for tag_name in tags or []:
+        tag_id = uuid.uuid4().hex
+        tag = create_tag(db, tag_id, tag_name, file_id)
+        db_tags.append(tag)
+
+    from src.api.config import settings
+
+    if pages and settings.PAGE_ANALYSIS_REUSE:
+        from src.api.services.text_analyzer import analyzer_fingerprint
+
+        create_document_pages(
             db,
-            id=file_id,
-            filename=file.filename or f"{file_id}.pdf",
-            content_type=file.content_type or "application/pdf",
-            source_path=str(source_path),
-            anonymized_path=None,
-            pii_entities=entities_json,
+            file_id,
+            settings.DEFAULT_NLP_ENGINE,
+            analyzer_fingerprint(),
+            [(page.number, page.content_hash, page.entities) for page in pages],
         )
 
-        db_tags = []
-        for tag_name in tags or []:
-            tag_id = uuid.uuid4().hex
-            tag = create_tag(db, tag_id, tag_name, file_id)
-            db_tags.append(tag)
-
-        db_document._entities = entities
-
-        stored_tags = [
-            DocumentTagDto(id=str(tag.id), name=str(tag.name)) for tag in db_tags
-        ]
-        doc_meta = DocumentDto(
-            id=file_id,
-            filename=str(db_document.filename),
-            content_type=str(db_document.content_type),
-            uploaded_at=datetime.now(),  # Use current time for response
-            tags=stored_tags,
-            pii_entities=unique,
-        )
+    db_document._entities = entities
 
-        docs.append(doc_meta)
-    return docs
+    stored_tags = [
+        DocumentTagDto(id=str(tag.id), name=str(tag.name)) for tag in db_tags
+    ]
+    return DocumentDto(
+        id=file_id,
+        filename=str(db_document.filename),
+        content_type=str(db_document.content_type),
+        uploaded_at=datetime.now(),  # Use current time for response
+        tags=stored_tags,
+        pii_entities=unique,
+    )
+
+
+def entity_type_per_text(entities: List[dict]) -> Dict[str, str]:
+    """Pick one entity type per text for redacting a PDF.
+
+    A PDF is searched by text, so every occurrence of a text gets the same mask.
+    When a text was found as several types, the type that comes first in
+    SPAN_TYPE_PRIORITY wins (then alphabetical), so the result does not depend
+    on the order of the entities.
+
+    Returns:
+        Dict[str, str]: text -> entity type.
+    """
+    from src.api.config import settings
+
+    ranks = {t: i for i, t in enumerate(settings.SPAN_TYPE_PRIORITY)}
+    types: Dict[str, str] = {}
+    for e in entities:
+        current = types.get(e["text"])
+        candidate = e["entity_type"]
+        if current is None or (
+            ranks.get(candidate, len(ranks)),
+            candidate,
+        ) < (ranks.get(current, len(ranks)), current):
+            types[e["text"]] = candidate
+    return types
 
 
 def analyze_and_anonymize_document(
@@ -215,6 +365,9 @@ def analyze_and_anonymize_document(
     request_body: DocumentAnonymizationRequest,
     doc: database.Document,
     key: str,
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    known_pages: Optional[Dict[str, List[dict]]] = None,
 ) -> AnalysisAnonymizationResponse:
     """Analyze a document and anonymize identified PII entities.
 
@@ -227,6 +380,10 @@ def analyze_and_anonymize_document(
         request_body: Request containing the PII entity types to anonymize
         doc: Database document model containing document information
         key: Private key used for encrypting PII entities
+        deadline: Optional deadline, checked between pages and analysis batches
+        on_progress: Optional callback for per-page progress
+        known_pages: Optional stored page analyses (see ``document_known_pages``);
+            those pages are not analyzed again
 
     Returns:
         AnalysisAnonymizationResponse:
@@ -237,22 +394,27 @@ def analyze_and_anonymize_document(
     Raises:
         FileNotFoundError: If the source document cannot be found
         ValueError: If the anonymization process fails to produce a valid output file
+        OperationCancelled: If the deadline passes or the client disconnects
+        UnknownSessionError: If the requested pseudonym session does not exist
     """
+    session = None
+    if request_body.anonymization_strategy == "pseudonymize":
+        from src.api.services.pseudonyms import pseudonym_store
+
+        # Vóór de analyse: een onbekende sessie van de client kost dan niets.
+        # Zonder session_id is het document-id de sessie (door de server gekozen)
+        session = pseudonym_store.session(
+            request_body.session_id or file_id,
+            create=request_body.session_id is None,
+        )
+
     source_path = doc.source_path
-    analyzer = ModularTextAnalyzer()
 
     entities = getattr(doc, "_entities", None)
     if not entities:
-        text = ""
-        try:
-            import pymupdf
-
-            pdf_doc: pymupdf.Document = pymupdf.open(source_path)
-            text = "\n".join(p.get_text() for p in pdf_doc)  # type: ignore
-            pdf_doc.close()
-        except Exception:
-            text = ""
-        entities = analyzer.analyze_text(text) if text else []
+        entities = analyze_pdf_document(
+            Path(source_path), deadline, on_progress, known_pages=known_pages
+        ).entities
         doc._entities = entities
 
     selected = []
@@ -264,10 +426,19 @@ def analyze_and_anonymize_document(
                     e_copy[field] = str(e_copy[field])
             selected.append(e_copy)
 
-    mapping = {e["text"]: e["entity_type"].lower() for e in selected}
+    entity_types = entity_type_per_text(selected)
+    mapping = {text: entity_type.lower() for text, entity_type in entity_types.items()}
 
     from src.api.config import settings
 
+    value_masks = None
+    if session is not None:
+        # Same type as the redaction, so [PERSON_n] matches the stored pseudonym
+        value_masks = {
+            text: f"[{session.pseudonym(entity_type, text)}]"
+            for text, entity_type in entity_types.items()
+        }
+
     anonym_dir = Path(settings.DATA_DIR) / "temp/anonymized"
     anonym_dir.mkdir(parents=True, exist_ok=True)
     out_path = anonym_dir / f"{file_id}.pdf"
@@ -281,7 +452,15 @@ def analyze_and_anonymize_document(
             raise FileNotFoundError(f"Source file {source_path} not found")
 
         anonym_dir.mkdir(parents=True, exist_ok=True)
-        occurrences = anonymize_pdf(str(source_path), str(out_path), mapping, key)
+        occurrences = anonymize_pdf(
+            str(source_path),
+            str(out_path),
+            mapping,
+            key,
+            value_masks=value_masks,
+            deadline=deadline,
+            on_progress=on_progress,
+        )
 
         if not os.path.exists(out_path) or os.path.getsize(out_path) == 0:
             raise ValueError("Anonymization failed to produce valid output file")
@@ -297,6 +476,8 @@ def analyze_and_anonymize_document(
                 )
 
         status_text = f"success ({len(occurrences)} entities processed)"
+    except OperationCancelled:
+        raise
     except FileNotFoundError as exc:
         logger.error(f"File not found error: {exc}", exc_info=True)
         status_text = f"failed: {exc}"
@@ -314,32 +495,453 @@ def analyze_and_anonymize_document(
     )
 
 
-def extract_text_from_pdf(source_path: Path) -> str:
-    """Extract text from a PDF file using PyMuPDF."""
-    text = ""
+def extract_text_from_pdf(
+    source_path: Path, deadline: Optional[Deadline] = None
+) -> str:
+    """Extract text from a PDF file using PyMuPDF.
+
+    The deadline is checked before every page; OperationCancelled is raised
+    instead of returning an empty text.
+    """
+    return "\n".join(extract_pages(source_path, deadline))
+
+
+def extract_pages(source_path: Path, deadline: Optional[Deadline] = None) -> List[str]:
+    """Extract the text per page; [] for a PDF that cannot be read.
+
+    The full text of the document is these pages joined with newlines.
+    """
+    pages: List[str] = []
     try:
         doc = pymupdf.open(str(source_path))
-        text = "\n".join(page.get_text() for page in doc)  # type: ignore
-        doc.close()
     except Exception:
-        text = ""
-    return text
+        return []
+    try:
+        for page in doc:  # type: ignore
+            check_deadline(deadline, EXTRACT)
+            pages.append(page.get_text())
+    except OperationCancelled:
+        raise
+    except Exception:
+        return []
+    finally:
+        doc.close()
+    return pages
+
+
+def page_hash(page_text: str) -> str:
+    """Content hash of a page, used to recognise pages that were analyzed before."""
+    return hashlib.sha256(page_text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PageAnalysis:
+    """Analysis of one page; entity offsets are relative to the page text.
+
+    An entity that runs over the boundary with the next page is also listed, with
+    an ``end`` past the page and the hash of that page as ``next_page``; on the
+    next page it is listed with a negative ``start`` and ``prev_page``.
+    """
+
+    number: int  # 1-based
+    content_hash: str
+    entities: List[dict]
+    reused: bool = False
+
+
+def entities_on_page(entities: List[dict], start: int, end: int) -> List[dict]:
+    """The entities of the page that spans ``[start, end)`` of a text.
+
+    An entity belongs to a page when it lies entirely on that page. The stored
+    page results and the per-page progress events both use this rule.
+    """
+    return [e for e in entities if start <= e["start"] and e["end"] <= end]
+
+
+def _page_offsets(page_texts: List[str]) -> List[int]:
+    # Begin van elke pagina in de volledige tekst (pagina's gescheiden door "\n")
+    offsets, offset = [], 0
+    for page_text in page_texts:
+        offsets.append(offset)
+        offset += len(page_text) + 1
+    return offsets
+
+
+@dataclass
+class PdfAnalysis:
+    """Analysis of a PDF: the full text, its entities and the result per page."""
+
+    text: str
+    entities: List[dict]
+    pages: List[PageAnalysis]
+
+    @classmethod
+    def from_pages(cls, page_texts: List[str], entities: List[dict]) -> "PdfAnalysis":
+        """Split entities with offsets into the full text over the pages.
+
+        An entity that runs over the boundary of two pages is listed on both, with
+        the hash of the other page (see ``PageAnalysis``), so a later upload reuses
+        it only when both pages are unchanged. An entity over more than two pages
+        is kept in ``entities`` only.
+        """
+        hashes = [page_hash(t) for t in page_texts]
+        offsets = _page_offsets(page_texts)
+        ends = [o + len(t) for o, t in zip(offsets, page_texts)]
+        pages: List[PageAnalysis] = []
+        for index, offset in enumerate(offsets):
+            found = [
+                {**e, "start": e["start"] - offset, "end": e["end"] - offset}
+                for e in entities_on_page(entities, offset, ends[index])
+            ]
+            for e in entities:
+                shifted = {**e, "start": e["start"] - offset, "end": e["end"] - offset}
+                if index + 1 < len(offsets) and (
+                    offset <= e["start"] < ends[index] < e["end"] <= ends[index + 1]
+                ):
+                    found.append({**shifted, "next_page": hashes[index + 1]})
+                elif index > 0 and (
+                    offsets[index - 1] <= e["start"] < offset <= e["end"] <= ends[index]
+                ):
+                    found.append({**shifted, "prev_page": hashes[index - 1]})
+            pages.append(PageAnalysis(index + 1, hashes[index], found))
+        return cls("\n".join(page_texts), entities, pages)
+
+
+def analyze_pdf(
+    source_path: Path,
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    nlp_engine: Optional[str] = None,
+) -> Tuple[str, List[dict]]:
+    """Extract and analyze a PDF, picking the strategy by document size.
+
+    Documents with at least PDF_PARALLEL_PAGE_THRESHOLD pages are split into page
+    ranges that are analyzed by worker processes. Otherwise the analysis runs in
+    this thread: page by page when progress is requested, else on the full text.
+
+    Args:
+        source_path (Path): The PDF to analyze.
+        deadline (Optional[Deadline]): Checked between pages and ranges.
+        on_progress (Optional[ProgressCallback]): Receives per-page events.
+        nlp_engine (Optional[str]): The NLP engine; None for DEFAULT_NLP_ENGINE.
+
+    Returns:
+        Tuple[str, List[dict]]: the full text and all entities, with offsets into
+            that text. A PDF that cannot be opened gives ("", []).
+    """
+    analysis = analyze_pdf_document(source_path, deadline, on_progress, nlp_engine)
+    return analysis.text, analysis.entities
+
+
+def analyze_pdf_document(
+    source_path: Path,
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    nlp_engine: Optional[str] = None,
+    *,
+    page_texts: Optional[List[str]] = None,
+    known_pages: Optional[Dict[str, List[dict]]] = None,
+) -> PdfAnalysis:
+    """Like ``analyze_pdf``, with the result per page and reuse of known pages.
+
+    Pages whose hash is in ``known_pages`` are not analyzed again: their stored
+    entities are used, with the values read back from the page text. The other
+    pages are analyzed in runs of consecutive pages (see ``analyze_pdf_reusing``).
+    When that leaves fewer than PDF_PARALLEL_PAGE_THRESHOLD pages to analyze, this
+    happens in this thread instead of in worker processes.
+
+    Args:
+        source_path (Path): The PDF to analyze.
+        deadline (Optional[Deadline]): Checked between pages and ranges.
+        on_progress (Optional[ProgressCallback]): Receives per-page events.
+        nlp_engine (Optional[str]): The NLP engine; None for DEFAULT_NLP_ENGINE.
+        page_texts (Optional[List[str]]): The pages, if already extracted.
+        known_pages (Optional[Dict[str, List[dict]]]): Page hash -> stored
+            entities of the same analyzer configuration, with offsets relative to
+            the page (see ``crud.get_page_entities``).
+
+    Returns:
+        PdfAnalysis: A PDF that cannot be opened gives an empty analysis.
+    """
+    from src.api.config import settings
+    from src.api.services.text_analyzer import get_text_analyzer
+    from src.api.utils import pdf_parallel
+
+    if page_texts is None and known_pages:
+        page_texts = extract_pages(source_path, deadline)
+    if page_texts is not None:
+        page_count = len(page_texts)
+    else:
+        try:
+            with pymupdf.open(str(source_path)) as doc:
+                page_count = doc.page_count
+        except Exception:
+            return PdfAnalysis("", [], [])
+
+    known_pages = known_pages or {}
+    to_analyze = (
+        sum(1 for t in page_texts if page_hash(t) not in known_pages)
+        if page_texts is not None and known_pages
+        else page_count
+    )
+    if pdf_parallel.should_parallelize(to_analyze):
+        texts, entities = pdf_parallel.analyze_pdf_parallel(
+            source_path, deadline, on_progress, nlp_engine
+        )
+        metrics.inc("pdf_pages_analyzed_total", len(texts), result="analyzed")
+        return PdfAnalysis.from_pages(texts, entities)
+    if page_texts is not None and known_pages:
+        return analyze_pdf_reusing(
+            page_texts, known_pages, deadline, on_progress, nlp_engine
+        )
+    if on_progress is not None:
+        return analyze_pdf_pages(
+            source_path, deadline, on_progress, nlp_engine, page_texts=page_texts
+        )
+
+    analyzer = get_text_analyzer(nlp_engine or settings.DEFAULT_NLP_ENGINE)
+    if page_texts is None:
+        page_texts = extract_pages(source_path, deadline)
+    text = "\n".join(page_texts)
+    entities = (
+        analyzer.analyze_text(text, deadline=deadline, priority=BULK) if text else []
+    )
+    metrics.inc("pdf_pages_analyzed_total", len(page_texts), result="analyzed")
+    return PdfAnalysis.from_pages(page_texts, entities)
+
+
+def _reusable_pages(
+    hashes: List[str], known_pages: Dict[str, List[dict]]
+) -> List[bool]:
+    # Een bekende pagina is alleen herbruikbaar als de buurpagina's van de
+    # entiteiten over de paginagrens ook ongewijzigd en herbruikbaar zijn
+    reuse = [h in known_pages for h in hashes]
+    changed = True
+    while changed:
+        changed = False
+        for index, content_hash in enumerate(hashes):
+            if not reuse[index]:
+                continue
+            for e in known_pages[content_hash]:
+                neighbour = (
+                    index + 1
+                    if "next_page" in e
+                    else index - 1
+                    if "prev_page" in e
+                    else None
+                )
+                if neighbour is None:
+                    continue
+                if not (
+                    0 <= neighbour < len(hashes)
+                    and hashes[neighbour] == e.get("next_page", e.get("prev_page"))
+                    and reuse[neighbour]
+                ):
+                    reuse[index] = False
+                    changed = True
+                    break
+    return reuse
+
+
+def analyze_pdf_reusing(
+    page_texts: List[str],
+    known_pages: Dict[str, List[dict]],
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    nlp_engine: Optional[str] = None,
+) -> PdfAnalysis:
+    """Analyze the pages of a PDF, reusing the stored analysis of known pages.
+
+    Consecutive pages that need analysis are analyzed as one text, as in a first
+    upload, so names that run over their boundaries are found. A known page is
+    analyzed again when a stored entity runs over its boundary with a page that
+    changed; a name that newly runs from an unchanged into a changed page is
+    found only in part.
+
+    Args:
+        page_texts (List[str]): The pages of the PDF.
+        known_pages (Dict[str, List[dict]]): Page hash -> stored entities, with
+            offsets relative to the page (see ``PdfAnalysis.from_pages``).
+        deadline (Optional[Deadline]): Checked before every run of pages.
+        on_progress (Optional[ProgressCallback]): Receives an ``extract`` and an
+            ``analyze`` event per page, the latter with the entities on that page
+            and whether they were reused.
+        nlp_engine (Optional[str]): The NLP engine; None for DEFAULT_NLP_ENGINE.
+
+    Returns:
+        PdfAnalysis: the full text, all entities and the result per page.
+    """
+    from src.api.config import settings
+    from src.api.services.text_analyzer import get_text_analyzer
+
+    analyzer = get_text_analyzer(nlp_engine or settings.DEFAULT_NLP_ENGINE)
+    text = "\n".join(page_texts)
+    hashes = [page_hash(t) for t in page_texts]
+    offsets = _page_offsets(page_texts)
+    reuse = _reusable_pages(hashes, known_pages)
+    page_count = len(page_texts)
+
+    entities: Dict[Tuple[int, int, str], dict] = {}
+    index = 0
+    while index < page_count:
+        check_deadline(deadline, EXTRACT)
+        end = index + 1
+        if reuse[index]:
+            # Zelfde tekst: de waarden staan niet in de opslag, wel de offsets
+            for e in known_pages[hashes[index]]:
+                start = offsets[index] + e["start"]
+                stop = offsets[index] + e["end"]
+                found = {
+                    k: v for k, v in e.items() if k not in ("next_page", "prev_page")
+                }
+                # Een entiteit over de paginagrens staat op beide pagina's
+                entities.setdefault(
+                    (start, stop, e["entity_type"]),
+                    {**found, "start": start, "end": stop, "text": text[start:stop]},
+                )
+        else:
+            while end < page_count and not reuse[end]:
+                end += 1
+            run = "\n".join(page_texts[index:end])
+            if run.strip():
+                for e in analyzer.analyze_text(run, deadline=deadline, priority=BULK):
+                    start = offsets[index] + e["start"]
+                    stop = offsets[index] + e["end"]
+                    entities[(start, stop, e["entity_type"])] = {
+                        **e,
+                        "start": start,
+                        "end": stop,
+                    }
+        metrics.inc(
+            "pdf_pages_analyzed_total",
+            end - index,
+            result="reused" if reuse[index] else "analyzed",
+        )
+        for page_idx in range(index, end):
+            emit(on_progress, EXTRACT, page=page_idx + 1, pages=page_count)
+            emit(
+                on_progress,
+                ANALYZE,
+                page=page_idx + 1,
+                pages=page_count,
+                entities=entities_on_page(
+                    list(entities.values()),
+                    offsets[page_idx],
+                    offsets[page_idx] + len(page_texts[page_idx]),
+                ),
+                reused=reuse[page_idx],
+            )
+        index = end
+
+    analysis = PdfAnalysis.from_pages(
+        page_texts, sorted(entities.values(), key=lambda e: (e["start"], e["end"]))
+    )
+    for page, reused in zip(analysis.pages, reuse):
+        page.reused = reused
+    return analysis
+
+
+def analyze_pdf_pages(
+    source_path: Path,
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    nlp_engine: Optional[str] = None,
+    *,
+    page_texts: Optional[List[str]] = None,
+) -> PdfAnalysis:
+    """Extract and analyze a PDF page by page, reporting progress per page.
+
+    The offsets of the entities refer to the full text, i.e. the pages joined
+    with newlines as in ``extract_text_from_pdf``. An entity that is split over
+    two pages is not found as one entity.
+
+    Args:
+        source_path (Path): The PDF to analyze.
+        deadline (Optional[Deadline]): Checked before every page.
+        on_progress (Optional[ProgressCallback]): Receives an ``extract`` and an
+            ``analyze`` event per page; the latter holds the entities of that page.
+        nlp_engine (Optional[str]): The NLP engine; None for DEFAULT_NLP_ENGINE.
+        page_texts (Optional[List[str]]): The pages, if already extracted.
+
+    Returns:
+        PdfAnalysis: the full text, all entities and the result per page.
+    """
+    from src.api.config import settings
+    from src.api.services.text_analyzer import get_text_analyzer
+
+    analyzer = get_text_analyzer(nlp_engine or settings.DEFAULT_NLP_ENGINE)
+    texts: List[str] = []
+    pages: List[PageAnalysis] = []
+    entities: List[dict] = []
+    offset = 0
+    with contextlib.ExitStack() as stack:
+        if page_texts is None:
+            doc = stack.enter_context(pymupdf.open(str(source_path)))
+            page_count = doc.page_count
+        else:
+            page_count = len(page_texts)
+        for page_idx in range(page_count):
+            check_deadline(deadline, EXTRACT)
+            page_text = (
+                doc[page_idx].get_text() if page_texts is None else page_texts[page_idx]
+            )
+            texts.append(page_text)
+            emit(on_progress, EXTRACT, page=page_idx + 1, pages=page_count)
+
+            found = (
+                analyzer.analyze_text(page_text, deadline=deadline, priority=BULK)
+                if page_text.strip()
+                else []
+            )
+            metrics.inc("pdf_pages_analyzed_total", result="analyzed")
+            pages.append(PageAnalysis(page_idx + 1, page_hash(page_text), found))
+
+            page_entities = [
+                {**e, "start": e["start"] + offset, "end": e["end"] + offset}
+                for e in found
+            ]
+            entities.extend(page_entities)
+            emit(
+                on_progress,
+                ANALYZE,
+                page=page_idx + 1,
+                pages=page_count,
+                entities=page_entities,
+                reused=False,
+            )
+            offset += len(page_text) + 1
+    return PdfAnalysis("\n".join(texts), entities, pages)
 
 
 async def extract_unique_entities(
     text: str,
+    deadline: Optional[Deadline] = None,
 ) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
     """Extract unique entities from the given text using the provided analyzer.
 
     Args:
         text (str): The text to analyze for entities.
+        deadline (Deadline, optional): Deadline for the analysis.
 
     Returns:
         tuple[list[dict[str, str]], list[dict[str, str]]]: the first list contains all entities found,
             the second list contains unique entities with their types and text.
     """
-    analyzer = ModularTextAnalyzer()
-    entities = analyzer.analyze_text(text) if text else []
+    from src.api.services.text_analyzer import get_text_analyzer
+
+    analyzer = get_text_analyzer()
+    entities = (
+        await run_in_lane(
+            BULK, analyzer.analyze_text, text, deadline=deadline, priority=BULK
+        )
+        if text
+        else []
+    )
+    return entities, unique_entities(entities)
+
+
+def unique_entities(entities: list[dict]) -> list[dict[str, str]]:
+    """Return the distinct (entity_type, text) pairs, in order of appearance."""
     unique: list[dict[str, str]] = []
     seen = set()
     for ent in entities:
@@ -347,7 +949,7 @@ async def extract_unique_entities(
         if key not in seen:
             unique.append({"entity_type": ent["entity_type"], "text": ent["text"]})
             seen.add(key)
-    return entities, unique
+    return unique
 
 
 def anonymize_pdf(
@@ -357,10 +959,16 @@ def anonymize_pdf(
     private_key: str,
     *,
     entity_masks: Optional[Dict[str, str]] = None,
+    value_masks: Optional[Dict[str, str]] = None,
     incremental_save: bool = False,
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
 ) -> List[dict]:
     """Anonymise *input_path* and write to *output_path*.
 
+    Documents with at least PDF_PARALLEL_PAGE_THRESHOLD pages are redacted in
+    page ranges by worker processes (see ``pdf_parallel``).
+
     Args:
         input_path (str): Path to the input PDF file.
         output_path (str): Path to save the anonymised PDF.
@@ -368,22 +976,98 @@ def anonymize_pdf(
             E.g. {"Bob": "person", "NL91ABNA": "iban"}.
         private_key (str): Private key for encrypting PII entities.
         entity_masks (Optional[Dict[str, str]]): Custom masks for entity types.
+        value_masks (Optional[Dict[str, str]]): Masks per target text, e.g.
+            pseudonyms {"Bob": "[PERSON_1]"}; take precedence over entity masks.
         incremental_save (bool): If True, save changes incrementally to the PDF.
+        deadline (Optional[Deadline]): Checked before every page; when it raises,
+            nothing is written to *output_path*.
+        on_progress (Optional[ProgressCallback]): Called after every redacted
+            page and once the occurrences are embedded.
 
     Returns:
         List[dict]: List of occurrences with metadata about each redaction.
     """
-    hashed_key = hashlib.sha256(private_key.encode()).digest()
-    masks = {**_DEFAULT_ENTITY_MASK, **(entity_masks or {})}
+    if not incremental_save:
+        from src.api.utils import pdf_parallel
+
+        with pymupdf.open(input_path) as probe:
+            page_count = probe.page_count
+        if pdf_parallel.should_parallelize(page_count):
+            return pdf_parallel.anonymize_pdf_parallel(
+                input_path,
+                output_path,
+                replacements,
+                private_key,
+                entity_masks=entity_masks,
+                value_masks=value_masks,
+                deadline=deadline,
+                on_progress=on_progress,
+            )
 
     doc: pymupdf.Document = pymupdf.open(input_path)
-    occurrences: List[_Occurrence] = []
-    id_counter = 0
+    occurrences = redact_pages(
+        doc,
+        replacements,
+        private_key,
+        entity_masks=entity_masks,
+        value_masks=value_masks,
+        deadline=deadline,
+        on_progress=on_progress,
+    )
+    doc.save(output_path, incremental=incremental_save)
+
+    _embed_occurrences_xmp(output_path, occurrences)
+    emit(on_progress, EMBED, occurrences=len(occurrences))
+    return occurrences
 
-    for target, entity_type in replacements.items():
-        mask = masks.get(entity_type, f"[{entity_type.upper()}]")
-        for page_idx, page in enumerate(doc):  # type: ignore
-            page: pymupdf.Page  # type: ignore
+
+def redact_pages(
+    doc: pymupdf.Document,
+    replacements: Dict[str, str],
+    private_key: str,
+    *,
+    entity_masks: Optional[Dict[str, str]] = None,
+    value_masks: Optional[Dict[str, str]] = None,
+    deadline: Optional[Deadline] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    first_page: int = 1,
+    page_count: Optional[int] = None,
+) -> List[dict]:
+    """Redact every target on every page of *doc*, in place.
+
+    Args:
+        doc (pymupdf.Document): The opened document (or a page range of it).
+        replacements (Dict[str, str]): Mapping of target text to entity type.
+        private_key (str): Private key for encrypting PII entities.
+        entity_masks (Optional[Dict[str, str]]): Custom masks for entity types.
+        value_masks (Optional[Dict[str, str]]): Masks per target text.
+        deadline (Optional[Deadline]): Checked before every page.
+        on_progress (Optional[ProgressCallback]): Called after every page.
+        first_page (int): Page number of the first page of *doc* in the original
+            document, so a page range records the original page numbers.
+        page_count (Optional[int]): Page count of the original document, reported
+            in the progress events; None for the page count of *doc*.
+
+    Returns:
+        List[dict]: The occurrences, numbered ``ann0``, ``ann1``, ...
+    """
+    hashed_key = hashlib.sha256(private_key.encode()).digest()
+    masks = {**_DEFAULT_ENTITY_MASK, **(entity_masks or {})}
+    occurrences: List[dict] = []
+    id_counter = 0
+    target_masks = {
+        target: (value_masks or {}).get(target)
+        or masks.get(entity_type, f"[{entity_type.upper()}]")
+        for target, entity_type in replacements.items()
+    }
+
+    # Pagina voor pagina, zodat de voortgang per pagina gemeld kan worden
+    for page_idx, page in enumerate(doc):  # type: ignore
+        page: pymupdf.Page  # type: ignore
+        check_deadline(deadline, "redact")
+        page_occurrences = len(occurrences)
+        for target, entity_type in replacements.items():
+            mask = target_masks[target]
             rects = page.search_for(target)
             for r in rects:
                 # Get text style information around the target text
@@ -399,7 +1083,7 @@ def anonymize_pdf(
                 # Record before redaction so coordinates refer to original.
                 occ: _Occurrence = {  # type: ignore
                     "id": f"ann{id_counter}",
-                    "page": page_idx + 1,
+                    "page": page_idx + first_page,
                     "rect": (r.x0, r.y0, r.x1, r.y1),
                     "entity_type": entity_type,
                     "entity_mask": mask,
@@ -431,10 +1115,13 @@ def anonymize_pdf(
                         )
                     }' on page {page_idx + 1}."
                 )
-
-    doc.save(output_path, incremental=incremental_save)
-
-    _embed_occurrences_xmp(output_path, occurrences)
+        emit(
+            on_progress,
+            REDACT,
+            page=page_idx + first_page,
+            pages=page_count or doc.page_count,
+            redactions=len(occurrences) - page_occurrences,
+        )
     return occurrences
 
 
@@ -791,7 +1478,7 @@ def retrieve_json_occurrencesfrom_xmp(
     return []  # No valid occurrences found
 
 
-def _embed_occurrences_xmp(pdf_path: str, occs: List[_Occurrence]) -> None:
+def _embed_occurrences_xmp(pdf_path: str, occs: Sequence[dict]) -> None:
     """Create /Metadata with one <rdf:Description> element per occurrence."""
     # Convert occurrences to JSON for embedding in CDATA section
     import json
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from starlette.requests import Request
+
+from src.api.utils.deadline import Deadline
+from src.api.utils.lanes import BULK, run_in_lane
+
+# Voortgangsgebeurtenis, bijv. {"stage": "analyze", "page": 3, "pages": 500, ...}
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# Stages van de documentpipeline, in volgorde
+EXTRACT = "extract"
+ANALYZE = "analyze"
+REDACT = "redact"
+EMBED = "embed"
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+_CLOSED = object()
+
+
+def emit(callback: Optional[ProgressCallback], stage: str, **fields: Any) -> None:
+    """Roep ``callback`` aan met een gebeurtenis, als er een callback is."""
+    if callback is not None:
+        callback({"stage": stage, **fields})
+
+
+class ProgressChannel:
+    """Brengt voortgang van een worker-thread naar een async generator.
+
+    ``publish`` mag vanuit elke thread worden aangeroepen (de pipeline draait op
+    de bulk-lane); ``events`` geeft de gebeurtenissen in volgorde door op de event
+    loop. Blijft het langer dan ``heartbeat_seconds`` stil, dan komt er een
+    ``{"stage": "heartbeat"}``, zodat proxies de verbinding niet afsluiten.
+    """
+
+    def __init__(self, heartbeat_seconds: float = 15.0) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        self.heartbeat_seconds = heartbeat_seconds
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, _CLOSED)
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    self._queue.get(), timeout=self.heartbeat_seconds
+                )
+            except asyncio.TimeoutError:
+                yield {"stage": "heartbeat"}
+                continue
+            if event is _CLOSED:
+                return
+            yield event
+
+
+async def stream_progress(
+    work: Callable[..., Any], deadline: Optional[Deadline] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Voer ``work(on_progress=...)`` uit op de bulk-lane en geef de voortgang door.
+
+    Na de laatste gebeurtenis volgt ``{"stage": "result", "result": ...}`` met de
+    returnwaarde van ``work``; een exceptie van ``work`` wordt daarna opnieuw
+    geraised. Stopt de consument eerder (client weg), dan wordt ``deadline``
+    geannuleerd, zodat het werk bij de volgende pagina stopt.
+    """
+    channel = ProgressChannel()
+
+    def run() -> Any:
+        try:
+            return work(on_progress=channel.publish)
+        finally:
+            channel.close()
+
+    task = asyncio.ensure_future(run_in_lane(BULK, run))
+    try:
+        async for event in channel.events():
+            yield event
+        yield {"stage": "result", "result": await task}
+    except (asyncio.CancelledError, GeneratorExit):
+        if deadline is not None:
+            deadline.cancel()
+        raise
+
+
+def wants_sse(request: Request) -> bool:
+    """Server-Sent Events als de client daarom vraagt, anders NDJSON."""
+    return SSE_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def format_event(event: Dict[str, Any], sse: bool = False) -> str:
+    """Serialiseer een gebeurtenis als NDJSON-regel of als SSE-bericht."""
+    data = json.dumps(event, default=str, ensure_ascii=False)
+    if sse:
+        return f"event: {event.get('stage', 'message')}\ndata: {data}\n\n"
+    return data + "\n"
@@ -0,0 +1,94 @@
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.api.config import settings
+from src.api.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from src.api.utils.allowlist import AllowList
+
+MERGE_POLICIES = ("score", "length", "priority")
+
+
+def _score(result: dict) -> float:
+    # SpaCy geeft geen scores (lege string); die tellen als 0
+    score = result.get("score")
+    return float(score) if isinstance(score, (int, float)) else 0.0
+
+
+def _rank_key(
+    policy: str, type_priority: Sequence[str]
+) -> Callable[[dict], Tuple[float, ...]]:
+    """Geef de sorteersleutel waarmee de winnaar van een conflict bepaald wordt."""
+    if policy not in MERGE_POLICIES:
+        raise ValueError(
+            f"Onbekend merge-beleid '{policy}', kies uit: {', '.join(MERGE_POLICIES)}"
+        )
+    ranks: Dict[str, int] = {t: i for i, t in enumerate(type_priority)}
+    lowest = len(ranks)
+
+    def key(r: dict) -> Tuple[float, ...]:
+        length = r["end"] - r["start"]
+        priority = -ranks.get(r["entity_type"], lowest)  # hoger = belangrijker
+        if policy == "score":
+            return (_score(r), length, priority)
+        if policy == "length":
+            return (length, _score(r), priority)
+        return (priority, _score(r), length)
+
+    return key
+
+
+def merge_spans(
+    results: List[dict],
+    policy: str = settings.SPAN_MERGE_POLICY,
+    type_priority: Optional[Sequence[str]] = None,
+    allow_list: Optional["AllowList"] = None,
+) -> List[dict]:
+    """Los overlappende entiteiten op tot een lijst zonder overlap.
+
+    Sorteer op start (O(n log n)) en loop één keer door de lijst: een span die
+    overlapt met de laatst behouden span strijdt daarmee om de plek, de winnaar
+    blijft staan. Omdat de behouden spans gesorteerd en disjunct zijn, hoeft alleen
+    met de laatste vergeleken te worden. Exacte duplicaten vallen hier ook onder.
+
+    Spans waarvan de tekst op de allow-list staat doen niet mee, zodat een bekende
+    false positive ook geen echte entiteit kan verdringen. Per herkenner wordt het
+    aantal onderdrukte treffers geteld in ``allow_list_suppressed_total``.
+
+    Args:
+        results (list): entiteiten als dicts met ``start``, ``end``,
+            ``entity_type`` en ``score``.
+        policy (str, optional): "score" (hoogste score), "length" (langste span) of
+            "priority" (volgorde van ``type_priority``). Defaults to
+            settings.SPAN_MERGE_POLICY.
+        type_priority (Sequence[str], optional): entiteitstypen, belangrijkste
+            eerst. Defaults to settings.SPAN_TYPE_PRIORITY.
+        allow_list (AllowList, optional): waarden die geen entiteit zijn; de spans
+            hebben dan een ``text`` nodig. Defaults to None.
+
+    Raises:
+        ValueError: als het beleid onbekend is.
+
+    Returns:
+        list: niet-overlappende entiteiten, gesorteerd op start.
+    """
+    key = _rank_key(policy, type_priority or settings.SPAN_TYPE_PRIORITY)
+    ordered = sorted(results, key=lambda r: (r["start"], -(r["end"] - r["start"])))
+    merged: List[dict] = []
+    for result in ordered:
+        if result["end"] <= result["start"]:
+            continue
+        if allow_list is not None and allow_list.is_allowed(
+            result.get("text", ""), result["entity_type"]
+        ):
+            metrics.inc(
+                "allow_list_suppressed_total",
+                recognizer=result.get("recognizer") or "ner",
+            )
+            continue
+        if merged and result["start"] < merged[-1]["end"]:
+            if key(result) > key(merged[-1]):
+                merged[-1] = result
+            continue
+        merged.append(result)
+    return merged
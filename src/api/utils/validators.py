@@ -0,0 +1,81 @@
+# Controles op de structuur en het controlegetal van gevonden nummers. Elke controle
+# loopt één keer over de waarde en draait direct na de regex van een herkenner (zie
+# ChecksumPatternRecognizer in patterns.py); scheidingstekens worden genegeerd.
+
+# Lengte van het IBAN per landcode, voor de landen die hier het vaakst voorkomen
+IBAN_LENGTHS = {
+    "NL": 18,
+    "BE": 16,
+    "DE": 22,
+    "FR": 27,
+    "LU": 20,
+    "GB": 22,
+    "ES": 24,
+    "IT": 27,
+    "AT": 20,
+    "CH": 21,
+    "PL": 28,
+    "PT": 25,
+    "DK": 18,
+    "IE": 22,
+}
+
+
+def _compact(value: str) -> str:
+    return "".join(c for c in value if c.isalnum()).upper()
+
+
+def is_valid_bsn(value: str) -> bool:
+    """Elfproef voor een BSN: gewichten 9 t/m 2 en -1 voor het laatste cijfer."""
+    digits = [int(c) for c in value if c.isdigit()]
+    if len(digits) != 9 or not any(digits):
+        return False
+    total = sum((9 - i) * d for i, d in enumerate(digits[:8])) - digits[8]
+    return total % 11 == 0
+
+
+def _mod97(value: str) -> int:
+    """Rest na deling door 97 van een alfanumerieke string (A=10 ... Z=35)."""
+    remainder = 0
+    for c in value:
+        number = int(c, 36)
+        remainder = (remainder * (100 if number > 9 else 10) + number) % 97
+    return remainder
+
+
+def is_valid_iban(value: str) -> bool:
+    """Controleer lengte (per land, anders 15-34 tekens) en het mod-97-controlegetal."""
+    iban = _compact(value)
+    if not 15 <= len(iban) <= 34 or not iban[:2].isalpha() or not iban[2:4].isdigit():
+        return False
+    expected = IBAN_LENGTHS.get(iban[:2])
+    if expected is not None and len(iban) != expected:
+        return False
+    return _mod97(iban[4:] + iban[:4]) == 1
+
+
+def is_valid_nl_vat(value: str) -> bool:
+    """Controleer een btw-identificatienummer (NL999999999B99).
+
+    Sinds 2020 gelden de mod-97-controle over ``NL`` + nummer (zoals bij IBAN);
+    oudere nummers bevatten het RSIN/BSN met de elfproef.
+    """
+    vat = _compact(value)
+    if len(vat) != 14 or not vat.startswith("NL") or vat[11] != "B":
+        return False
+    return _mod97(vat) == 1 or is_valid_bsn(vat[2:11])
+
+
+def is_valid_nl_phone(value: str) -> bool:
+    """Structuurcontrole voor een Nederlands nummer: 9 cijfers na 0/+31/0031.
+
+    Het abonneenummer begint nooit met een 0 (dan is het een internationaal nummer).
+    """
+    digits = "".join(c for c in value if c.isdigit())
+    if value.lstrip().startswith("+"):
+        digits = digits[2:] if digits.startswith("31") else ""
+    elif digits.startswith("0031"):
+        digits = digits[4:]
+    elif digits.startswith("0"):
+        digits = digits[1:]
+    return len(digits) == 9 and digits[0] != "0"
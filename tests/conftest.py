@@ -0,0 +1,85 @@
+import re
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+import pymupdf
+import pytest
+
+
+class FakeAnalyzer:
+    """Vindt elke "Jan Jansen" als PERSON (ook over een regelovergang), zonder model.
+
+    Houdt de geanalyseerde teksten en het aantal batches bij, zodat tests kunnen
+    controleren wat (opnieuw) geanalyseerd wordt.
+    """
+
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+        self.batches = 0
+
+    def analyze_text(self, text: str, **kwargs) -> list:
+        self.texts.append(text)
+        return [
+            {
+                "entity_type": "PERSON",
+                "start": m.start(),
+                "end": m.end(),
+                "score": 0.9,
+                "text": m.group(),
+            }
+            for m in re.finditer(r"Jan\s+Jansen", text)
+        ]
+
+    def analyze_batch(self, texts: list, **kwargs) -> list:
+        self.batches += 1
+        return [self.analyze_text(text) for text in texts]
+
+    def anonymize_text(self, text: str, strategy: str, results: list) -> str:
+        for r in sorted(results, key=lambda r: r["start"], reverse=True):
+            text = text[: r["start"]] + f"<{r['entity_type']}>" + text[r["end"] :]
+        return text
+
+
+@pytest.fixture
+def fake_analyzer(monkeypatch: pytest.MonkeyPatch) -> FakeAnalyzer:
+    """Een ``FakeAnalyzer`` in plaats van ``get_text_analyzer`` (ook in workers)."""
+    fake = FakeAnalyzer()
+    monkeypatch.setattr(
+        "src.api.services.text_analyzer.get_text_analyzer", lambda *a, **k: fake
+    )
+    return fake
+
+
+def _make_pdf(
+    pages: Union[int, List[str]],
+    every: int = 1,
+    title: Optional[str] = None,
+    path: Optional[Path] = None,
+) -> bytes:
+    if isinstance(pages, int):
+        pages = [
+            f"Pagina {i + 1}" + (": Jan Jansen" if i % every == 0 else "")
+            for i in range(pages)
+        ]
+    doc = pymupdf.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    if title is not None:
+        doc.set_metadata({"title": title})
+    content = doc.tobytes()
+    doc.close()
+    if path is not None:
+        path.write_bytes(content)
+    return content
+
+
+@pytest.fixture
+def make_pdf() -> Callable[..., bytes]:
+    """Maak een PDF met één tekst per pagina en geef de inhoud terug.
+
+    ``make_pdf(pages, every=1, title=None, path=None)``: ``pages`` is een lijst
+    teksten, of een aantal pagina's "Pagina 1", "Pagina 2", ... waarvan elke
+    ``every``-de (vanaf de eerste) Jan Jansen noemt. Met ``path`` wordt de PDF
+    ook daar weggeschreven.
+    """
+    return _make_pdf
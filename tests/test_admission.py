@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.utils import admission
+from src.api.utils.admission import AdmissionLimiter, Overloaded, lane_for_request
+
+client = TestClient(app)
+
+
+def test_requests_are_assigned_to_lanes() -> None:
+    assert lane_for_request("POST", "/api/v1/analyze") == "text"
+    assert lane_for_request("POST", "/api/v1/anonymize") == "text"
+    assert lane_for_request("POST", "/api/v1/documents/upload") == "document"
+    assert lane_for_request("POST", "/api/v1/documents/abc/anonymize") == "document"
+    assert lane_for_request("GET", "/api/v1/documents/abc/download") is None
+    assert lane_for_request("GET", "/api/v1/health/ready") is None
+
+
+def test_waiters_are_admitted_in_order_and_overflow_is_rejected() -> None:
+    async def scenario() -> list:
+        limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=2)
+        order = []
+
+        async def request(name: str) -> None:
+            async with limiter.admit():
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        tasks = [asyncio.create_task(request(n)) for n in ("a", "b", "c")]
+        await asyncio.sleep(0)  # a draait, b en c wachten
+        assert (limiter.running, limiter.queued) == (1, 2)
+        with pytest.raises(Overloaded) as exc_info:
+            await limiter.acquire()
+        assert exc_info.value.reason == "queue_full"
+        assert exc_info.value.retry_after >= 1
+        await asyncio.gather(*tasks)
+        assert (limiter.running, limiter.queued) == (0, 0)
+        return order
+
+    assert asyncio.run(scenario()) == ["a", "b", "c"]
+
+
+def test_waiting_too_long_is_rejected() -> None:
+    async def scenario() -> None:
+        limiter = AdmissionLimiter("test", 1, 5, queue_timeout=0.01)
+        await limiter.acquire()
+        with pytest.raises(Overloaded) as exc_info:
+            await limiter.acquire()
+        assert exc_info.value.reason == "queue_timeout"
+        assert limiter.queued == 0
+        limiter.release()
+        assert limiter.running == 0
+
+    asyncio.run(scenario())
+
+
+def test_full_lane_returns_429_with_retry_after(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    full = AdmissionLimiter("text", max_concurrent=1, max_queue=0)
+    full.running = 1
+    monkeypatch.setitem(admission.admission_limiters, "text", full)
+
+    resp = client.post("/api/v1/analyze", json={"text": "Jan Jansen"})
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+
+    ready = client.get("/api/v1/health/ready").json()
+    assert ready["admission"]["text"]["running"] == 1
@@ -0,0 +1,88 @@
+import pytest
+
+from src.api.utils.allowlist import AllowList
+from src.api.utils.metrics import metrics
+from src.api.utils.spans import merge_spans
+
+
+def span(start: int, end: int, entity_type: str, text: str, **extra) -> dict:
+    return {
+        "entity_type": entity_type,
+        "start": start,
+        "end": end,
+        "score": 0.5,
+        "text": text,
+        **extra,
+    }
+
+
+@pytest.fixture
+def allow_list() -> AllowList:
+    return AllowList.from_lines(
+        [
+            "# eigen nummers",
+            "12345678",
+            "prefix:0800",
+            "CASE_NO\tregex:0363\\d{12}",
+            "DRIVERS_LICENSE\texact:1111111111",
+        ]
+    )
+
+
+def test_exact_prefix_and_regex_rules(allow_list: AllowList) -> None:
+    assert len(allow_list) == 4
+    assert allow_list.is_allowed("12345678", "KVK_NUMBER")
+    assert allow_list.is_allowed("0800-1234", "PHONE_NUMBER")
+    assert allow_list.is_allowed("0363010000000001", "CASE_NO")
+    assert not allow_list.is_allowed("87654321", "KVK_NUMBER")
+    assert not allow_list.is_allowed("0900-1234", "PHONE_NUMBER")
+
+
+def test_rules_can_be_scoped_to_an_entity_type(allow_list: AllowList) -> None:
+    assert allow_list.is_allowed("1111111111", "DRIVERS_LICENSE")
+    assert not allow_list.is_allowed("1111111111", "PHONE_NUMBER")
+    assert not allow_list.is_allowed("0363010000000001", "BSN")
+
+
+def test_values_are_normalized() -> None:
+    allow_list = AllowList.from_lines(["Gemeente  Utrecht"])
+    assert allow_list.is_allowed("gemeente\nutrecht", "ORGANIZATION")
+
+
+def test_invalid_rules_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        AllowList.from_lines(["regex:(unclosed"])
+    with pytest.raises(ValueError):
+        AllowList().add("suffix", "123")
+
+
+def test_merge_drops_allowed_spans_and_counts_them(allow_list: AllowList) -> None:
+    before = metrics.snapshot()["counters"].get(
+        "allow_list_suppressed_total{recognizer=DutchKvKRecognizer}", 0
+    )
+    results = [
+        span(0, 8, "KVK_NUMBER", "12345678", recognizer="DutchKvKRecognizer"),
+        span(20, 28, "KVK_NUMBER", "87654321", recognizer="DutchKvKRecognizer"),
+    ]
+    merged = merge_spans(results, policy="score", allow_list=allow_list)
+    assert [r["text"] for r in merged] == ["87654321"]
+    after = metrics.snapshot()["counters"][
+        "allow_list_suppressed_total{recognizer=DutchKvKRecognizer}"
+    ]
+    assert after == before + 1
+
+
+def test_allowed_span_does_not_displace_an_overlapping_entity(
+    allow_list: AllowList,
+) -> None:
+    results = [
+        span(0, 8, "KVK_NUMBER", "12345678"),
+        span(0, 20, "PERSON", "12345678 Jan Jansen"),
+    ]
+    merged = merge_spans(
+        results,
+        policy="priority",
+        type_priority=["KVK_NUMBER", "PERSON"],
+        allow_list=allow_list,
+    )
+    assert [r["entity_type"] for r in merged] == ["PERSON"]
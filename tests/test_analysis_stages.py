@@ -0,0 +1,71 @@
+import time
+from typing import List, Optional
+
+import pytest
+from presidio_analyzer import RecognizerResult
+
+from src.api.config import settings
+from src.api.services import text_analyzer
+from src.api.services.text_analyzer import ModularTextAnalyzer
+from src.api.utils.metrics import metrics
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.segment_cache import segment_cache
+
+STAGE_SECONDS = 0.2
+
+
+class SlowNerEngine(NLPEngine):
+    def analyze(
+        self, text: str, entities: Optional[List] = None, language: str = "nl"
+    ) -> list:
+        time.sleep(STAGE_SECONDS)
+        return [
+            {"entity_type": "PERSON", "start": 0, "end": 3, "score": "", "text": "Jan"}
+        ]
+
+
+class SlowPatternAnalyzer:
+    def analyze(self, text: str, entities: None, language: str) -> list:
+        time.sleep(STAGE_SECONDS)
+        return [RecognizerResult("EMAIL", 13, 28, 1.0)]
+
+
+class FakeModelManager:
+    def get(self, nlp_engine: str, model_name: str) -> NLPEngine:
+        return SlowNerEngine()
+
+
+@pytest.fixture
+def analyzer(monkeypatch: pytest.MonkeyPatch) -> ModularTextAnalyzer:
+    monkeypatch.setattr(text_analyzer, "model_manager", FakeModelManager())
+    monkeypatch.setattr(settings, "INFERENCE_MAX_BATCH_SIZE", 1)
+    metrics.reset()
+    segment_cache.clear()
+    instance = ModularTextAnalyzer.__new__(ModularTextAnalyzer)
+    instance.engine_type = "fake"
+    instance.model_name = "fake"
+    instance.analyzer = SlowPatternAnalyzer()  # type: ignore[assignment]
+    return instance
+
+
+def test_ner_and_patterns_run_concurrently(analyzer: ModularTextAnalyzer) -> None:
+    started = time.perf_counter()
+    results = analyzer.analyze_text("Jan mailt na jan@example.com", entities=None)
+    elapsed = time.perf_counter() - started
+
+    assert {r["entity_type"] for r in results} == {"PERSON", "EMAIL"}
+    assert elapsed < 2 * STAGE_SECONDS * 0.9
+    summaries = metrics.snapshot()["summaries"]
+    assert summaries["analysis_stage_seconds{stage=ner}"]["count"] == 1
+    assert summaries["analysis_stage_overlap_seconds"]["max"] > STAGE_SECONDS / 2
+
+
+def test_stages_run_sequentially_without_pool(
+    analyzer: ModularTextAnalyzer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ANALYSIS_STAGE_THREADS", 0)
+    started = time.perf_counter()
+    results = analyzer.analyze_text("Jan mailt na jan@example.com", entities=None)
+
+    assert len(results) == 2
+    assert time.perf_counter() - started >= 2 * STAGE_SECONDS
@@ -0,0 +1,57 @@
+import hashlib
+import hmac
+
+import pytest
+
+from src.api.utils.anonymizer import TextAnonymizer, anonymize_text
+
+TEXT = "Jan Jansen belt Piet. Jan Jansen woont in Utrecht."
+RESULTS = [
+    {"entity_type": "PERSON", "start": 0, "end": 10},
+    {"entity_type": "PERSON", "start": 16, "end": 20},
+    {"entity_type": "PERSON", "start": 22, "end": 32},
+    {"entity_type": "LOCATION", "start": 42, "end": 49},
+]
+
+
+def test_replace_uses_entity_type_placeholders() -> None:
+    assert (
+        anonymize_text(TEXT, RESULTS, "replace")
+        == "<PERSON> belt <PERSON>. <PERSON> woont in <LOCATION>."
+    )
+
+
+def test_mask_keeps_length() -> None:
+    masked = anonymize_text(TEXT, RESULTS, "mask")
+    assert len(masked) == len(TEXT)
+    assert masked.startswith("********** belt ****.")
+
+
+def test_redact_removes_values() -> None:
+    assert anonymize_text(TEXT, RESULTS, "redact") == " belt .  woont in ."
+
+
+def test_hash_is_keyed_and_consistent() -> None:
+    anonymizer = TextAnonymizer("hash", key=b"k")
+    output = anonymizer.anonymize(TEXT, RESULTS)
+    expected = hmac.new(b"k", b"Jan Jansen", hashlib.sha256).hexdigest()
+    assert output.count(expected) == 2
+    # Herhaalde waarden worden één keer gehasht
+    assert len(anonymizer._hash_memo) == 3
+    assert TextAnonymizer("hash", key=b"other").anonymize(TEXT, RESULTS) != output
+
+
+def test_results_order_does_not_matter() -> None:
+    assert anonymize_text(TEXT, list(reversed(RESULTS))) == anonymize_text(
+        TEXT, RESULTS
+    )
+
+
+def test_overlapping_results_do_not_corrupt_output() -> None:
+    results = RESULTS + [{"entity_type": "PERSON", "start": 4, "end": 10}]
+    assert anonymize_text(TEXT, results).startswith("<PERSON> belt <PERSON>.")
+
+
+def test_unknown_strategy_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        TextAnonymizer("encrypt")
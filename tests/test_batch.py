@@ -0,0 +1,91 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from src.api.services import batch
+from src.api.services.batch import (
+    MANIFEST_NAME,
+    BatchOptions,
+    run_batch,
+    stream_jsonl,
+)
+
+
+def test_batch_writes_outputs_and_manifest(tmp_path: Path, fake_analyzer) -> None:
+    source = tmp_path / "in"
+    (source / "sub").mkdir(parents=True)
+    (source / "a.txt").write_text("Brief van Jan Jansen.", encoding="utf-8")
+    (source / "sub" / "b.txt").write_text("Niets te zien.", encoding="utf-8")
+    (source / "notes.md").write_text("overgeslagen", encoding="utf-8")
+    target = tmp_path / "out"
+
+    summary = run_batch(source, target, BatchOptions(entities=["PERSON"]))
+
+    assert (summary.processed, summary.failed, summary.skipped) == (2, 0, 0)
+    assert (target / "a.txt").read_text(encoding="utf-8") == "Brief van <PERSON>."
+    assert (target / "sub" / "b.txt").exists()
+    lines = (target / MANIFEST_NAME).read_text(encoding="utf-8").splitlines()
+    entries = {e["path"]: e for e in map(json.loads, lines)}
+    assert entries["a.txt"]["entities"] == 1
+    assert entries["sub/b.txt"]["status"] == "ok"
+
+
+def test_batch_resumes_and_reprocesses_changed_files(
+    tmp_path: Path, fake_analyzer
+) -> None:
+    source, target = tmp_path / "in", tmp_path / "out"
+    source.mkdir()
+    for name in ("a.txt", "b.txt"):
+        (source / name).write_text("Jan Jansen", encoding="utf-8")
+    run_batch(source, target, BatchOptions())
+    assert len(fake_analyzer.texts) == 2
+
+    (source / "b.txt").write_text("Jan Jansen, opnieuw", encoding="utf-8")
+    summary = run_batch(source, target, BatchOptions())
+
+    assert (summary.processed, summary.skipped) == (1, 1)
+    assert len(fake_analyzer.texts) == 3
+
+
+def test_failed_file_is_recorded_and_not_retried_by_default(
+    tmp_path: Path, fake_analyzer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source, target = tmp_path / "in", tmp_path / "out"
+    source.mkdir()
+    (source / "kapot.txt").write_bytes(b"\xff\xfe\xfa")
+
+    summary = run_batch(source, target, BatchOptions())
+    assert summary.failed == 1
+    assert not (target / "kapot.txt").exists()
+
+    assert run_batch(source, target, BatchOptions()).skipped == 1
+    assert run_batch(source, target, BatchOptions(), retry_failed=True).failed == 1
+
+
+def test_half_written_manifest_line_is_ignored(tmp_path: Path) -> None:
+    manifest = tmp_path / MANIFEST_NAME
+    manifest.write_text(
+        json.dumps({"path": "a.txt", "status": "ok"}) + '\n{"path": "b.t',
+        encoding="utf-8",
+    )
+    assert list(batch.load_manifest(manifest)) == ["a.txt"]
+
+
+def test_stream_keeps_order_and_reports_bad_records(fake_analyzer) -> None:
+    lines = [json.dumps({"id": i, "text": f"{i}: Jan Jansen"}) for i in range(5)]
+    lines.insert(2, "geen json")
+    source, sink = io.StringIO("\n".join(lines) + "\n\n"), io.StringIO()
+
+    summary = stream_jsonl(source, sink, BatchOptions(), batch_size=2)
+
+    out = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [r["id"] for r in out] == [0, 1, None, 2, 3, 4]
+    assert "error" in out[2]
+    assert out[0]["text"] == "0: <PERSON>"
+    assert out[0]["entities"] == [
+        {"entity_type": "PERSON", "start": 3, "end": 13, "score": 0.9}
+    ]
+    assert (summary.records, summary.failed) == (6, 1)
+    assert fake_analyzer.batches == 3
@@ -0,0 +1,131 @@
+from typing import List, Optional
+
+import pytest
+import spacy
+
+from src.api.utils.nlp import cascade_engine
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.cascade_engine import CascadeEngine, split_sentences
+from src.api.utils.nlp.spacy_engine import SpacyEngine
+
+
+class RecordingEngine(NLPEngine):
+    """Geeft het eerste hoofdletterwoord na 'heer' als PERSON terug."""
+
+    def __init__(self, label: str = "PERSON") -> None:
+        self.seen: List[str] = []
+        self.label = label
+
+    def analyze(
+        self, text: str, entities: Optional[List] = None, language: str = "nl"
+    ) -> list:
+        self.seen.append(text)
+        words = text.split()
+        if "heer" not in words:
+            return []
+        name = words[words.index("heer") + 1].rstrip(".")
+        start = text.index(name)
+        return [
+            {
+                "entity_type": self.label,
+                "start": start,
+                "end": start + len(name),
+                "score": 0.99,
+                "text": name,
+            }
+        ]
+
+
+@pytest.fixture
+def escalation() -> RecordingEngine:
+    return RecordingEngine()
+
+
+@pytest.fixture
+def engine(
+    monkeypatch: pytest.MonkeyPatch, escalation: RecordingEngine
+) -> CascadeEngine:
+    nlp = spacy.blank("nl")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns(
+        [
+            {"label": "GPE", "pattern": "Utrecht"},
+            {"label": "NORP", "pattern": "Bakker"},
+            {"label": "PERSON", "pattern": "Pietersen"},
+        ]
+    )
+    spacy_engine = SpacyEngine.__new__(SpacyEngine)
+    spacy_engine.nlp = nlp
+
+    class FakeModelManager:
+        def get(self, nlp_engine: str, model_name: str) -> NLPEngine:
+            return spacy_engine if nlp_engine == "spacy" else escalation
+
+    monkeypatch.setattr(cascade_engine, "model_manager", FakeModelManager())
+    return CascadeEngine("fake", "fake", "transformers")
+
+
+def test_split_sentences_returns_offsets() -> None:
+    text = "Eerste zin. Tweede zin!\nDerde"
+    assert [text[s:e] for s, e in split_sentences(text)] == [
+        "Eerste zin.",
+        " Tweede zin!",
+        "Derde",
+    ]
+
+
+def test_only_suspicious_sentences_are_escalated(
+    engine: CascadeEngine, escalation: RecordingEngine
+) -> None:
+    text = "Hij woont in Utrecht. De brief is van de heer Jansen."
+    results = engine.analyze(text)
+
+    assert escalation.seen == [" De brief is van de heer Jansen."]
+    assert [(r["text"], r["entity_type"]) for r in results] == [
+        ("Utrecht", "GPE"),
+        ("Jansen", "PERSON"),
+    ]
+    assert text[results[1]["start"] : results[1]["end"]] == "Jansen"
+    assert 0 < engine.last_escalation_fraction < 1
+
+
+def test_transformer_result_replaces_uncertain_spacy_entity(
+    engine: CascadeEngine,
+) -> None:
+    text = "Namens de heer Bakker."
+    results = engine.analyze(text)
+    assert [(r["text"], r["entity_type"]) for r in results] == [("Bakker", "PERSON")]
+
+
+def test_nothing_is_escalated_without_suspicious_sentences(
+    engine: CascadeEngine, escalation: RecordingEngine
+) -> None:
+    assert engine.analyze("het regent vandaag in Utrecht.")[0]["text"] == "Utrecht"
+    assert escalation.seen == []
+    assert engine.last_escalation_fraction == 0.0
+
+
+def test_filtered_transformer_label_keeps_spacy_entity(
+    engine: CascadeEngine, escalation: RecordingEngine
+) -> None:
+    # Een PER van het transformers-model valt buiten het filter en mag spaCy's
+    # PERSON dus niet vervangen
+    escalation.label = "PER"
+    text = "Aan de heer Pietersen en Bakker."
+    results = engine.analyze(text, entities=["PERSON"])
+    assert escalation.seen == [text]
+    assert [(r["text"], r["entity_type"]) for r in results] == [("Pietersen", "PERSON")]
+
+
+def test_replace_overlapping_removes_every_overlapped_result() -> None:
+    def span(start: int, end: int) -> dict:
+        return {"entity_type": "X", "start": start, "end": end}
+
+    results = [span(0, 5), span(6, 9), span(10, 30), span(31, 35), span(40, 45)]
+    # Ongesorteerd, en de lange vervanging overlapt meer dan één resultaat
+    replacements = [span(33, 34), span(2, 20)]
+    assert cascade_engine._replace_overlapping(results, replacements) == [
+        span(40, 45),
+        span(2, 20),
+        span(33, 34),
+    ]
@@ -0,0 +1,94 @@
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from src.api.utils.deadline import ClientDisconnected, Deadline, DeadlineExceeded
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.scheduler import InferenceScheduler
+from src.api.utils.pdf_xmp import anonymize_pdf, extract_text_from_pdf
+
+
+class CountingDeadline(Deadline):
+    """Verloopt na een vast aantal controles, onafhankelijk van de klok."""
+
+    def __init__(self, checks: int) -> None:
+        super().__init__(60)
+        self.checks = checks
+
+    @property
+    def expired(self) -> bool:
+        self.checks -= 1
+        return self.checks < 0
+
+
+def test_deadline_without_timeout_only_stops_on_cancel() -> None:
+    deadline = Deadline(0)
+    assert deadline.remaining() is None
+    deadline.check("test")
+    deadline.cancel()
+    with pytest.raises(ClientDisconnected) as exc_info:
+        deadline.check("test")
+    assert exc_info.value.status_code == 499
+
+
+def test_expired_deadline_raises_504() -> None:
+    deadline = Deadline(0.001)
+    time.sleep(0.01)
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        deadline.check("extract")
+    assert exc_info.value.status_code == 504
+    assert exc_info.value.stage == "extract"
+
+
+def test_extraction_stops_between_pages(tmp_path: Path, make_pdf) -> None:
+    source = tmp_path / "in.pdf"
+    make_pdf(5, path=source)
+    assert "Pagina 5" in extract_text_from_pdf(source, Deadline(60))
+    with pytest.raises(DeadlineExceeded):
+        extract_text_from_pdf(source, CountingDeadline(checks=2))
+
+
+def test_cancelled_redaction_writes_no_output(tmp_path: Path, make_pdf) -> None:
+    source, target = tmp_path / "in.pdf", tmp_path / "out.pdf"
+    make_pdf(3, path=source)
+    deadline = Deadline(60)
+    deadline.cancel()
+    with pytest.raises(ClientDisconnected):
+        anonymize_pdf(
+            str(source), str(target), {"Jan Jansen": "person"}, "key", deadline=deadline
+        )
+    assert not target.exists()
+
+
+class SlowEngine(NLPEngine):
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+        self.release = threading.Event()
+
+    def analyze(
+        self, text: str, entities: Optional[List] = None, language: str = "nl"
+    ) -> list:
+        return self.analyze_batch([text], entities, language)[0]
+
+    def analyze_batch(
+        self, texts: List[str], entities: Optional[List] = None, language: str = "nl"
+    ) -> List[list]:
+        self.release.wait(5)
+        self.texts.extend(texts)
+        return [[] for _ in texts]
+
+
+def test_scheduler_skips_requests_whose_deadline_passed() -> None:
+    engine = SlowEngine()
+    scheduler = InferenceScheduler(lambda: engine, "slow", max_batch_size=1)
+    # Het eerste verzoek houdt de worker bezig, het tweede verloopt in de wachtrij
+    first = scheduler.submit("eerste")
+    with pytest.raises(DeadlineExceeded):
+        scheduler.analyze("tweede", deadline=Deadline(0.05))
+    engine.release.set()
+    assert first.result(timeout=5) == []
+    assert scheduler.submit("derde").result(timeout=5) == []
+    assert engine.texts == ["eerste", "derde"]
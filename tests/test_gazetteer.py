@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.api.utils.gazetteer import (
+    AhoCorasickAutomaton,
+    GazetteerRecognizer,
+    build_automaton,
+)
+
+
+def automaton(*terms: tuple[str, str]) -> AhoCorasickAutomaton:
+    result = AhoCorasickAutomaton()
+    for term, entity_type in terms:
+        result.add(term, entity_type)
+    return result.build()
+
+
+def found(text: str, matches) -> list[tuple[str, str]]:
+    return sorted((text[start:end], entity_type) for start, end, entity_type in matches)
+
+
+def test_matches_on_normalized_tokens() -> None:
+    text = "Brief van JANSEN  & Zn. aan de heer Müller."
+    ac = automaton(("Jansen & Zn", "ORGANIZATION"), ("Muller", "PERSON"))
+    assert found(text, ac.search(text)) == [
+        ("JANSEN  & Zn", "ORGANIZATION"),
+        ("Müller", "PERSON"),
+    ]
+
+
+def test_only_whole_tokens_match() -> None:
+    ac = automaton(("Jan", "PERSON"))
+    assert list(ac.search("Janssen en Marjan")) == []
+
+
+def test_overlapping_and_nested_terms_are_all_found() -> None:
+    text = "Gemeente Den Haag Centrum"
+    ac = automaton(
+        ("Den Haag", "LOCATION"),
+        ("Gemeente Den Haag", "ORGANIZATION"),
+        ("Haag Centrum", "LOCATION"),
+    )
+    assert found(text, ac.search(text)) == [
+        ("Den Haag", "LOCATION"),
+        ("Gemeente Den Haag", "ORGANIZATION"),
+        ("Haag Centrum", "LOCATION"),
+    ]
+
+
+def test_failure_links_continue_after_partial_match() -> None:
+    text = "de heer van der berg"
+    ac = automaton(("van der veen", "PERSON"), ("der berg", "PERSON"))
+    assert found(text, ac.search(text)) == [("der berg", "PERSON")]
+
+
+def test_file_is_compiled_once_and_cached(tmp_path: Path) -> None:
+    terms = tmp_path / "namen.txt"
+    terms.write_text(
+        "# bekende namen\nPieter de Vries\nORGANIZATION\tStichting Voorbeeld\n\n",
+        encoding="utf-8",
+    )
+    cache_dir = tmp_path / "cache"
+
+    first = build_automaton(str(terms), "PERSON", str(cache_dir))
+    assert len(first) == 2
+    assert len(list(cache_dir.iterdir())) == 1
+
+    cached = build_automaton(str(terms), "PERSON", str(cache_dir))
+    text = "Pieter de Vries werkt bij Stichting Voorbeeld."
+    assert found(text, cached.search(text)) == found(text, first.search(text))
+
+    # Een gewijzigd bestand krijgt een nieuwe cache
+    terms.write_text("Karel Appel\n", encoding="utf-8")
+    changed = build_automaton(str(terms), "PERSON", str(cache_dir))
+    assert len(changed) == 1
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_recognizer_filters_on_requested_entities() -> None:
+    recognizer = GazetteerRecognizer(
+        automaton=automaton(("Karel Appel", "PERSON"), ("Rijksmuseum", "ORGANIZATION"))
+    )
+    assert recognizer.supported_entities == ["ORGANIZATION", "PERSON"]
+    results = recognizer.analyze("Karel Appel in het Rijksmuseum", ["PERSON"])
+    assert [(r.entity_type, r.start, r.end) for r in results] == [("PERSON", 0, 11)]
+
+
+def test_invalid_cache_is_rebuilt(tmp_path: Path) -> None:
+    terms = tmp_path / "namen.txt"
+    terms.write_text("Jan Jansen\nJansen Bouw\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    build_automaton(str(terms), "PERSON", str(cache_dir))
+    (cache,) = cache_dir.iterdir()
+
+    # Een faallink die naar zichzelf wijst, zou het zoeken laten vastlopen
+    data = json.loads(cache.read_text(encoding="utf-8"))
+    data["fail"][2] = 2
+    cache.write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(ValueError):
+        AhoCorasickAutomaton.from_dict(data)
+
+    rebuilt = build_automaton(str(terms), "PERSON", str(cache_dir))
+    text = "Aan Jan Jansen"
+    assert found(text, rebuilt.search(text)) == [("Jan Jansen", "PERSON")]
@@ -0,0 +1,109 @@
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.config import settings
+from src.api.main import app
+from src.api.services import warmup
+from src.api.services.warmup import ModelLoadState, WarmupState, warmup_state
+
+# Zonder context manager draait de lifespan (en dus de warmup) niet.
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_warmup_state() -> Iterator[None]:
+    yield
+    warmup_state.ready = False
+    warmup_state.failed = False
+    warmup_state.attempts = 0
+    warmup_state.error = None
+    warmup_state.started_at = None
+    warmup_state.finished_at = None
+    warmup_state.models.clear()
+
+
+def test_liveness_does_not_depend_on_warmup() -> None:
+    resp = client.get("/api/v1/health/live")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "alive"}
+
+
+def test_legacy_health_endpoint_unchanged() -> None:
+    resp = client.get("/api/v1/health")
+    assert resp.status_code == 200
+    assert resp.json() == {"ping": "pong"}
+
+
+def test_readiness_is_unavailable_until_warmup_finished() -> None:
+    warmup_state.started_at = 0.0
+    warmup_state.models["spacy"] = ModelLoadState(nlp_engine="spacy", state="loading")
+
+    resp = client.get("/api/v1/health/ready")
+    assert resp.status_code == 503
+    data = resp.json()
+    assert data["ready"] is False
+    assert data["models"]["spacy"]["state"] == "loading"
+    assert "queue_depth" in data
+
+
+def test_readiness_reports_models_and_warmup_duration() -> None:
+    warmup_state.started_at = 10.0
+    warmup_state.finished_at = 12.5
+    warmup_state.models["spacy"] = ModelLoadState(
+        nlp_engine="spacy", state="loaded", load_seconds=2.1
+    )
+    warmup_state.ready = True
+
+    resp = client.get("/api/v1/health/ready")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["ready"] is True
+    assert data["warmup_duration_seconds"] == 2.5
+    assert data["models"]["spacy"] == {
+        "state": "loaded",
+        "load_seconds": 2.1,
+        "error": None,
+    }
+    assert data["queue_depth"] == 0
+
+
+def test_metrics_endpoint_returns_snapshot() -> None:
+    resp = client.get("/api/v1/metrics")
+    assert resp.status_code == 200
+    assert set(resp.json()) == {"counters", "gauges", "summaries"}
+
+
+def test_warmup_is_retried_after_a_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def flaky(state: WarmupState, engines: list) -> None:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("tijdelijk")
+
+    monkeypatch.setattr(warmup, "_warmup_once", flaky)
+    monkeypatch.setattr(settings, "WARMUP_RETRY_BACKOFF_SECONDS", 0)
+    state = WarmupState()
+    warmup.run_warmup(state)
+
+    assert state.ready is True and state.failed is False
+    assert state.attempts == 2 and state.error is None
+
+
+def test_liveness_fails_after_all_warmup_attempts_failed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def broken(state: WarmupState, engines: list) -> None:
+        raise RuntimeError("model ontbreekt")
+
+    monkeypatch.setattr(warmup, "_warmup_once", broken)
+    monkeypatch.setattr(settings, "WARMUP_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "WARMUP_RETRY_BACKOFF_SECONDS", 0)
+    warmup.run_warmup(warmup_state)
+
+    assert warmup_state.attempts == 2 and warmup_state.ready is False
+    resp = client.get("/api/v1/health/live")
+    assert resp.status_code == 503
+    assert resp.json() == {"status": "warmup_failed", "error": "model ontbreekt"}
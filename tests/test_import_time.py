@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Budget voor het importeren van de app met alleen SpaCy ingeschakeld. Ruim genoeg
+# voor trage CI-runners; torch/transformers importeren alleen al kost meer dan dit.
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "8"))
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.api.main  # noqa: F401
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "modules": sorted(m for m in ("torch", "transformers") if m in sys.modules),
+}))
+"""
+
+
+def _import_app(tmp_path: Path) -> dict:
+    env = {
+        **os.environ,
+        "DEFAULT_NLP_ENGINE": "spacy",
+        "PRELOAD_NLP_ENGINES": "spacy",
+        "DATA_DIR": str(tmp_path),
+        "LOG_DIR": str(tmp_path),
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'import_probe.db'}",
+    }
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        pytest.fail(f"Importing the app failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_app_import_does_not_load_torch_or_transformers(tmp_path: Path) -> None:
+    result = _import_app(tmp_path)
+    assert result["modules"] == [], (
+        "Heavy modules imported at startup with only SpaCy enabled: "
+        f"{result['modules']}"
+    )
+
+
+def test_app_import_within_time_budget(tmp_path: Path) -> None:
+    result = _import_app(tmp_path)
+    assert result["elapsed"] < IMPORT_TIME_BUDGET_SECONDS, (
+        f"Importing the app took {result['elapsed']:.2f}s "
+        f"(budget {IMPORT_TIME_BUDGET_SECONDS:.1f}s)"
+    )
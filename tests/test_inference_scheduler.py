@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import pytest
+
+from src.api.utils.metrics import metrics
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.scheduler import InferenceScheduler
+
+
+class FakeEngine(NLPEngine):
+    """Vindt elk woord met een hoofdletter als PER en houdt de batches bij."""
+
+    def __init__(self, fail_batches: bool = False) -> None:
+        self.batches: List[int] = []
+        self.fail_batches = fail_batches
+        self._lock = threading.Lock()
+
+    def analyze(
+        self, text: str, entities: Optional[List] = None, language: str = "nl"
+    ) -> list:
+        results = []
+        offset = 0
+        for word in text.split(" "):
+            if word[:1].isupper():
+                results.append(
+                    {
+                        "entity_type": "PER" if word != "Utrecht" else "LOC",
+                        "start": offset,
+                        "end": offset + len(word),
+                        "score": "",
+                        "text": word,
+                    }
+                )
+            offset += len(word) + 1
+        return [r for r in results if entities is None or r["entity_type"] in entities]
+
+    def analyze_batch(
+        self, texts: List[str], entities: Optional[List] = None, language: str = "nl"
+    ) -> List[list]:
+        with self._lock:
+            self.batches.append(len(texts))
+        if self.fail_batches:
+            raise RuntimeError("batch failed")
+        return [self.analyze(text, entities, language) for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics() -> None:
+    metrics.reset()
+
+
+def test_concurrent_requests_are_batched_and_scattered() -> None:
+    engine = FakeEngine()
+    scheduler = InferenceScheduler(
+        lambda: engine, name="fake", max_batch_size=8, max_wait_ms=200
+    )
+    texts = [f"tekst {i} van Persoon{i}" for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(scheduler.analyze, texts))
+
+    assert [r[0]["text"] for r in results] == [f"Persoon{i}" for i in range(8)]
+    assert sum(engine.batches) == 8
+    assert max(engine.batches) > 1
+    snapshot = metrics.snapshot()["summaries"]
+    assert snapshot["inference_batch_size{engine=fake}"]["count"] == len(engine.batches)
+    assert snapshot["inference_queue_wait_ms{engine=fake}"]["count"] == 8
+
+
+def test_batch_never_exceeds_max_batch_size() -> None:
+    engine = FakeEngine()
+    scheduler = InferenceScheduler(
+        lambda: engine, name="fake", max_batch_size=3, max_wait_ms=50
+    )
+    futures = [scheduler.submit(f"Naam{i}") for i in range(10)]
+    assert [f.result(timeout=5)[0]["text"] for f in futures] == [
+        f"Naam{i}" for i in range(10)
+    ]
+    assert max(engine.batches) <= 3
+
+
+def test_entities_are_filtered_per_request() -> None:
+    engine = FakeEngine()
+    scheduler = InferenceScheduler(lambda: engine, name="fake", max_wait_ms=50)
+    per = scheduler.submit("Jan woont in Utrecht", entities=["PER"])
+    loc = scheduler.submit("Jan woont in Utrecht", entities=["LOC"])
+    assert [r["text"] for r in per.result(timeout=5)] == ["Jan"]
+    assert [r["text"] for r in loc.result(timeout=5)] == ["Utrecht"]
+
+
+def test_failed_batch_falls_back_to_single_requests() -> None:
+    engine = FakeEngine(fail_batches=True)
+    scheduler = InferenceScheduler(lambda: engine, name="fake", max_wait_ms=10)
+    assert scheduler.analyze("Jan woont hier")[0]["text"] == "Jan"
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+from src.api.utils.lanes import WorkLane
+from src.api.utils.metrics import metrics
+
+
+def test_busy_bulk_lane_does_not_delay_interactive_lane() -> None:
+    interactive = WorkLane("test-interactive", workers=1)
+    bulk = WorkLane("test-bulk", workers=1)
+    release = threading.Event()
+
+    async def scenario() -> str:
+        # Twee PDF-taken: één bezet de bulk-thread, de ander wacht
+        jobs = [asyncio.create_task(bulk.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert bulk.stats()["running"] == 1 and bulk.stats()["queued"] == 1
+
+        result = await asyncio.wait_for(interactive.run(lambda: "klaar"), timeout=1)
+        release.set()
+        await asyncio.gather(*jobs)
+        return result
+
+    assert asyncio.run(scenario()) == "klaar"
+    assert bulk.stats() == {"workers": 1, "queued": 0, "running": 0}
+
+
+def test_queue_wait_is_reported_per_lane() -> None:
+    lane = WorkLane("test-wait", workers=1)
+
+    async def scenario() -> None:
+        await asyncio.gather(*(lane.run(sum, [i, 1]) for i in range(3)))
+
+    asyncio.run(scenario())
+    summary = metrics.snapshot()["summaries"]["lane_queue_wait_ms{lane=test-wait}"]
+    assert summary["count"] == 3
+
+
+def test_cancelled_waiting_task_leaves_the_queue() -> None:
+    lane = WorkLane("test-cancel", workers=1)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        running = asyncio.create_task(lane.run(release.wait, 5))
+        waiting = asyncio.create_task(lane.run(lambda: None))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.sleep(0)
+        assert lane.stats()["queued"] == 0
+        release.set()
+        await running
+
+    asyncio.run(scenario())
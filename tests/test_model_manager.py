@@ -0,0 +1,151 @@
+from typing import List, Optional
+
+import pytest
+
+from src.api.utils.nlp import manager as manager_module
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.manager import ModelManager
+
+MB = 1024 * 1024
+
+
+class FakeEngine(NLPEngine):
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+
+    def analyze(
+        self, text: str, entities: Optional[List] = None, language: str = "nl"
+    ) -> list:
+        return []
+
+
+@pytest.fixture
+def fake_loading(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """Laat load_nlp_engine een nep-engine geven die ``sizes[model]`` MB 'kost'."""
+    state = {"rss": 0, "sizes": {}, "loads": []}
+
+    def fake_load(config_dict: dict) -> NLPEngine:
+        model = config_dict["model_name"]
+        state["loads"].append(model)
+        state["rss"] += state["sizes"].get(model, 100) * MB
+        return FakeEngine(model)
+
+    monkeypatch.setattr(manager_module, "load_nlp_engine", fake_load)
+    monkeypatch.setattr(manager_module, "current_rss_bytes", lambda: state["rss"])
+    return state
+
+
+def test_engine_is_loaded_once_and_reused(fake_loading: dict) -> None:
+    manager = ModelManager(budget_bytes=0, idle_ttl=0)
+    first = manager.get("spacy", "a")
+    second = manager.get("spacy", "a")
+    assert first is second
+    assert fake_loading["loads"] == ["a"]
+
+
+def test_least_recently_used_model_is_evicted_over_budget(fake_loading: dict) -> None:
+    fake_loading["sizes"].update({"a": 300, "b": 300, "c": 300})
+    manager = ModelManager(budget_bytes=700 * MB, idle_ttl=0)
+
+    manager.get("spacy", "a")
+    manager.get("transformers", "b")
+    manager.get("spacy", "a")  # a is nu recenter gebruikt dan b
+    manager.get("spacy", "c")
+
+    resident = {m["model_name"] for m in manager.stats()["models"]}
+    assert resident == {"a", "c"}
+    assert manager.stats()["resident_mb"] == 600
+
+
+def test_model_larger_than_budget_stays_resident(fake_loading: dict) -> None:
+    fake_loading["sizes"]["big"] = 900
+    manager = ModelManager(budget_bytes=500 * MB, idle_ttl=0)
+    manager.get("transformers", "big")
+    assert [m["model_name"] for m in manager.stats()["models"]] == ["big"]
+
+
+def test_idle_models_are_unloaded(
+    fake_loading: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(manager_module.time, "monotonic", lambda: now[0])
+    manager = ModelManager(budget_bytes=0, idle_ttl=60)
+    manager._reaper = object()  # type: ignore[assignment]  # geen achtergrondthread
+
+    manager.get("spacy", "a")
+    now[0] += 30
+    manager.get("spacy", "b")
+    now[0] += 45  # a is 75s idle, b 45s
+
+    assert manager.evict_idle() == [("spacy", "a")]
+    assert [m["model_name"] for m in manager.stats()["models"]] == ["b"]
+
+    # Opnieuw opvragen laadt het model opnieuw
+    manager.get("spacy", "a")
+    assert fake_loading["loads"] == ["a", "b", "a"]
+
+
+def test_stats_report_sizes_in_recency_order(fake_loading: dict) -> None:
+    fake_loading["sizes"].update({"a": 150, "b": 250})
+    manager = ModelManager(budget_bytes=1024 * MB, idle_ttl=0)
+    manager.get("spacy", "a")
+    manager.get("spacy", "b")
+
+    stats = manager.stats()
+    assert stats["budget_mb"] == 1024
+    assert [(m["model_name"], m["size_mb"]) for m in stats["models"]] == [
+        ("b", 250),
+        ("a", 150),
+    ]
+
+
+def test_pinned_model_is_never_unloaded(
+    fake_loading: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(manager_module.time, "monotonic", lambda: now[0])
+    fake_loading["sizes"].update({"default": 300, "b": 300})
+    manager = ModelManager(
+        budget_bytes=500 * MB, idle_ttl=60, pinned=[("spacy", "default")]
+    )
+    manager._reaper = object()  # type: ignore[assignment]
+
+    manager.get("spacy", "default")
+    manager.get("transformers", "b")  # over budget: b blijft, default ook
+    now[0] += 120
+
+    assert manager.evict_idle() == [("transformers", "b")]
+    assert [m["model_name"] for m in manager.stats()["models"]] == ["default"]
+
+
+def test_unknown_engine_is_rejected_before_eviction(fake_loading: dict) -> None:
+    fake_loading["sizes"]["a"] = 300
+    manager = ModelManager(budget_bytes=400 * MB, idle_ttl=0)
+    manager.get("spacy", "a")
+
+    with pytest.raises(ValueError):
+        manager.get("bogus", "a")
+    assert [m["model_name"] for m in manager.stats()["models"]] == ["a"]
+    assert ("bogus", "a") not in manager._load_locks
+    assert fake_loading["loads"] == ["a"]
+
+
+def test_nested_loads_are_not_counted_twice(
+    fake_loading: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manager = ModelManager(budget_bytes=0, idle_ttl=0, pinned=())
+    fake_load = manager_module.load_nlp_engine
+
+    def load_with_submodel(config_dict: dict) -> NLPEngine:
+        # Zoals de cascade: laadt zijn spaCy-model via dezelfde manager
+        if config_dict["nlp_engine"] == "cascade":
+            manager.get("spacy", "sub")
+            fake_loading["rss"] += 10 * MB
+            return FakeEngine(config_dict["model_name"])
+        return fake_load(config_dict)
+
+    monkeypatch.setattr(manager_module, "load_nlp_engine", load_with_submodel)
+    manager.get("cascade", "top")
+
+    sizes = {m["model_name"]: m["size_mb"] for m in manager.stats()["models"]}
+    assert sizes == {"sub": 100, "top": 10}
@@ -0,0 +1,133 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.crud import get_document
+from src.api.dependencies import SessionLocal
+from src.api.main import app
+from src.api.services import text_analyzer
+from src.api.utils.metrics import metrics
+from src.api.utils.pdf_xmp import PdfAnalysis
+
+client = TestClient(app)
+
+
+def upload(pdf: bytes) -> dict:
+    resp = client.post(
+        "/api/v1/documents/upload",
+        files=[("files", ("dossier.pdf", pdf, "application/pdf"))],
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["files"][0]
+
+
+def stored_entities(document_id: str) -> list:
+    with SessionLocal() as db:
+        document = get_document(db, document_id)
+        assert document is not None
+        return json.loads(str(document.pii_entities))
+
+
+def test_reupload_only_analyzes_changed_pages(fake_analyzer, make_pdf) -> None:
+    case = uuid.uuid4().hex  # eigen pagina's, los van de andere tests
+    pages = [f"Zaak {case} pagina {i}: Jan Jansen" for i in range(3)]
+    upload(make_pdf(pages))
+    assert len(fake_analyzer.texts) == 1  # geen bekende pagina's: in één keer
+
+    fake_analyzer.texts.clear()
+    before = metrics.snapshot()["counters"].get(
+        "pdf_pages_analyzed_total{result=reused}", 0
+    )
+    changed = pages[:2] + [f"Zaak {case} pagina 2: gewijzigd", f"Zaak {case} nieuw"]
+    doc = upload(make_pdf(changed))
+
+    # De gewijzigde en de nieuwe pagina samen, zoals bij een eerste upload
+    assert [t.split() for t in fake_analyzer.texts] == [" ".join(changed[2:]).split()]
+    assert doc["pii_entities"] == [{"entity_type": "PERSON", "text": "Jan Jansen"}]
+    after = metrics.snapshot()["counters"]["pdf_pages_analyzed_total{result=reused}"]
+    assert after - before == 2
+
+    # Anonimiseren hergebruikt de analyse van alle pagina's van het document
+    fake_analyzer.texts.clear()
+    resp = client.post(
+        f"/api/v1/documents/{doc['id']}/anonymize",
+        json={"pii_entities_to_anonymize": ["PERSON"]},
+    )
+    assert resp.status_code == 200, resp.text
+    assert fake_analyzer.texts == []
+    assert len(resp.json()["pii_entities"]) == 2
+
+
+def test_reupload_finds_cross_page_name_like_first_upload(
+    fake_analyzer, make_pdf
+) -> None:
+    case = uuid.uuid4().hex
+    pages = [f"Zaak {case} eind: Jan", "Jansen begin", f"Zaak {case} 3: Jan Jansen"]
+    first = upload(make_pdf(pages))
+    entities = stored_entities(first["id"])
+    assert [e["text"].split() for e in entities] == [["Jan", "Jansen"]] * 2
+
+    fake_analyzer.texts.clear()
+    again = upload(make_pdf(pages))
+
+    assert fake_analyzer.texts == []
+    assert stored_entities(again["id"]) == entities
+
+    # Pagina 2 gewijzigd: pagina 1 en 2 samen opnieuw, pagina 3 hergebruikt
+    fake_analyzer.texts.clear()
+    changed = upload(make_pdf(pages[:1] + ["Jansen gewijzigd"] + pages[2:]))
+
+    assert len(fake_analyzer.texts) == 1
+    assert "Zaak" in fake_analyzer.texts[0] and "gewijzigd" in fake_analyzer.texts[0]
+    assert [e["text"].split() for e in stored_entities(changed["id"])] == [
+        ["Jan", "Jansen"]
+    ] * 2
+
+
+def test_changed_analyzer_configuration_analyzes_again(
+    fake_analyzer, make_pdf, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pages = [f"Zaak {uuid.uuid4().hex}: Jan Jansen"]
+    upload(make_pdf(pages))
+    fake_analyzer.texts.clear()
+
+    # Bijv. een gewijzigde allow-list: de opgeslagen analyse geldt niet meer
+    monkeypatch.setattr(text_analyzer, "_fingerprints", {})
+    monkeypatch.setattr(text_analyzer, "_file_digest", lambda path: "changed")
+    upload(make_pdf(pages))
+
+    assert [t.strip() for t in fake_analyzer.texts] == pages
+
+
+def test_split_over_pages_keeps_page_offsets() -> None:
+    pages = ["ab Jan", "Jan Jansen"]
+    entities = [
+        {"entity_type": "PERSON", "start": 7, "end": 17, "text": "Jan Jansen"},
+        {"entity_type": "PERSON", "start": 3, "end": 10, "text": "Jan\nJan"},
+    ]
+    analysis = PdfAnalysis.from_pages(pages, entities)
+
+    assert analysis.text == "ab Jan\nJan Jansen"
+    # Over de paginagrens: op beide pagina's, met de hash van de andere pagina
+    assert analysis.pages[0].entities == [
+        {
+            "entity_type": "PERSON",
+            "start": 3,
+            "end": 10,
+            "text": "Jan\nJan",
+            "next_page": analysis.pages[1].content_hash,
+        }
+    ]
+    assert analysis.pages[1].entities == [
+        {"entity_type": "PERSON", "start": 0, "end": 10, "text": "Jan Jansen"},
+        {
+            "entity_type": "PERSON",
+            "start": -4,
+            "end": 3,
+            "text": "Jan\nJan",
+            "prev_page": analysis.pages[0].content_hash,
+        },
+    ]
+    assert analysis.pages[0].content_hash != analysis.pages[1].content_hash
@@ -0,0 +1,118 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import pymupdf
+import pytest
+
+from src.api.config import settings
+from src.api.utils import pdf_parallel
+from src.api.utils.pdf_xmp import (
+    analyze_pdf,
+    anonymize_pdf,
+    extract_annotations,
+    extract_text_from_pdf,
+)
+
+
+@pytest.fixture
+def parallel(monkeypatch: pytest.MonkeyPatch, fake_analyzer) -> Iterator[None]:
+    monkeypatch.setattr(settings, "PDF_PARALLEL_PAGE_THRESHOLD", 4)
+    monkeypatch.setattr(settings, "PDF_PARALLEL_RANGE_PAGES", 3)
+    monkeypatch.setattr(settings, "PDF_PARALLEL_WORKERS", 2)
+    # fork: de workers erven de nep-analyzer van dit proces
+    pool = ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("fork"))
+    monkeypatch.setattr(pdf_parallel, "_pool", pool)
+    yield
+    pool.shutdown()
+
+
+def test_page_ranges() -> None:
+    assert pdf_parallel.page_ranges(7, 3) == [(0, 3), (3, 6), (6, 7)]
+    assert pdf_parallel.page_ranges(0, 3) == []
+
+
+def test_small_documents_are_not_split(parallel) -> None:
+    assert not pdf_parallel.should_parallelize(3)
+    assert pdf_parallel.should_parallelize(4)
+
+
+def test_parallel_analysis_matches_full_text(
+    tmp_path: Path, parallel, fake_analyzer, make_pdf
+) -> None:
+    source = tmp_path / "in.pdf"
+    make_pdf(8, every=3, path=source)
+    events: list = []
+
+    text, entities = analyze_pdf(source, on_progress=events.append)
+
+    assert text == extract_text_from_pdf(source)
+    assert entities == fake_analyzer.analyze_text(text)
+    analyzed = [e for e in events if e["stage"] == "analyze"]
+    assert [e["page"] for e in analyzed] == list(range(1, 9))
+    assert [len(e["entities"]) for e in analyzed] == [1, 0, 0, 1, 0, 0, 1, 0]
+    assert analyzed[3]["entities"][0]["start"] == entities[1]["start"]
+
+
+def test_parallel_redaction_is_stitched_into_one_document(
+    tmp_path: Path, parallel, make_pdf
+) -> None:
+    source, target = tmp_path / "in.pdf", tmp_path / "out.pdf"
+    make_pdf(8, every=3, title="Dossier", path=source)
+    events: list = []
+
+    occurrences = anonymize_pdf(
+        str(source),
+        str(target),
+        {"Jan Jansen": "person"},
+        "secret",
+        on_progress=events.append,
+    )
+
+    assert [o["id"] for o in occurrences] == ["ann0", "ann1", "ann2"]
+    assert [o["page"] for o in occurrences] == [1, 4, 7]
+    redacted = [e for e in events if e["stage"] == "redact"]
+    assert sorted(e["page"] for e in redacted) == list(range(1, 9))
+    assert {e["pages"] for e in redacted} == {8}
+    with pymupdf.open(str(target)) as doc:
+        assert doc.page_count == 8
+        assert doc.metadata["title"] == "Dossier"
+        assert "Jan Jansen" not in "".join(page.get_text() for page in doc)
+        assert "Pagina 8" in doc[7].get_text()
+
+    key = hashlib.sha256(b"secret").digest()
+    annotations = extract_annotations(str(target), decryption_key=key)
+    assert [a["entity"] for a in annotations] == ["Jan Jansen"] * 3
+
+
+def crash_once(marker: str, value: int) -> int:
+    # Eerste aanroep: het workerproces valt weg, zoals bij te weinig geheugen
+    if not os.path.exists(marker):
+        Path(marker).touch()
+        os._exit(1)
+    return value * 2
+
+
+def test_broken_pool_is_replaced(
+    tmp_path: Path, parallel, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    broken = pdf_parallel._get_pool()
+    monkeypatch.setattr(
+        pdf_parallel,
+        "ProcessPoolExecutor",
+        lambda **kwargs: ProcessPoolExecutor(
+            2, mp_context=multiprocessing.get_context("fork")
+        ),
+    )
+    marker = str(tmp_path / "crashed")
+
+    results = pdf_parallel._run_ranges(
+        crash_once, [(marker, i) for i in range(4)], None, "test"
+    )
+
+    assert results == [0, 2, 4, 6]
+    assert pdf_parallel._pool is not None and pdf_parallel._pool is not broken
+    pdf_parallel._pool.shutdown()
@@ -0,0 +1,98 @@
+import asyncio
+import io
+import json
+from pathlib import Path
+
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from src.api.dependencies import SessionLocal
+from src.api.main import app
+from src.api.routers.documents import upload_document_stream
+from src.api.utils.pdf_xmp import anonymize_pdf
+from src.api.utils.progress import format_event
+
+client = TestClient(app)
+
+
+def test_redaction_reports_every_page_and_embedding(tmp_path: Path, make_pdf) -> None:
+    source = tmp_path / "in.pdf"
+    make_pdf(3, every=2, path=source)
+    events: list = []
+
+    anonymize_pdf(
+        str(source),
+        str(tmp_path / "out.pdf"),
+        {"Jan Jansen": "person"},
+        "secret",
+        on_progress=events.append,
+    )
+
+    assert [(e["stage"], e.get("page")) for e in events] == [
+        ("redact", 1),
+        ("redact", 2),
+        ("redact", 3),
+        ("embed", None),
+    ]
+    assert [e.get("redactions") for e in events[:3]] == [1, 0, 1]
+    assert events[-1]["occurrences"] == 2
+
+
+def test_sse_format() -> None:
+    event = {"stage": "analyze", "page": 1}
+    assert format_event(event) == '{"stage": "analyze", "page": 1}\n'
+    assert format_event(event, sse=True).startswith("event: analyze\ndata: {")
+
+
+def test_upload_stream_sends_entities_per_page(fake_analyzer, make_pdf) -> None:
+    resp = client.post(
+        "/api/v1/documents/upload/stream",
+        files=[("files", ("doc.pdf", make_pdf(3, every=2), "application/pdf"))],
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    stages = [e["stage"] for e in events]
+    assert stages == ["file"] + ["extract", "analyze"] * 3 + ["document", "done"]
+
+    analyzed = [e for e in events if e["stage"] == "analyze"]
+    assert [len(e["entities"]) for e in analyzed] == [1, 0, 1]
+    # Offsets verwijzen naar de volledige tekst van het document
+    assert analyzed[2]["entities"][0]["start"] > analyzed[0]["entities"][0]["start"]
+    document = events[-2]["document"]
+    assert document["pii_entities"] == [{"entity_type": "PERSON", "text": "Jan Jansen"}]
+
+    resp = client.post(
+        f"/api/v1/documents/{document['id']}/anonymize/stream",
+        json={"pii_entities_to_anonymize": ["PERSON"]},
+        headers={"Accept": "text/event-stream"},
+    )
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    names = [
+        line.split(": ", 1)[1]
+        for line in resp.text.splitlines()
+        if line.startswith("event: ")
+    ]
+    assert names[-2:] == ["embed", "done"]
+    assert names.count("redact") == 3
+
+
+def test_upload_stream_reads_uploads_before_the_handler_returns(
+    fake_analyzer, make_pdf
+) -> None:
+    upload = UploadFile(io.BytesIO(make_pdf(1)), filename="doc.pdf")
+    request = Request({"type": "http", "method": "POST", "headers": []})
+
+    async def scenario() -> list:
+        response = await upload_document_stream(
+            request, files=[upload], session_factory=SessionLocal
+        )
+        # Zoals FastAPI: de upload (en de sessie van get_db) is al gesloten
+        # voordat de body van de stream gelezen wordt
+        await upload.close()
+        return [json.loads(chunk) async for chunk in response.body_iterator]
+
+    events = asyncio.run(scenario())
+    assert [e["stage"] for e in events][-2:] == ["document", "done"]
@@ -0,0 +1,170 @@
+import time
+from pathlib import Path
+
+import pymupdf
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.database import Base
+from src.api.main import app
+from src.api.services.pseudonyms import (
+    PseudonymStore,
+    SessionFactory,
+    UnknownSessionError,
+)
+from src.api.utils.anonymizer import anonymize_text
+from src.api.utils.pdf_xmp import anonymize_pdf, entity_type_per_text
+
+
+@pytest.fixture
+def session_factory() -> SessionFactory:
+    """Eigen in-memory database, los van de andere tests."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def store(session_factory: SessionFactory) -> PseudonymStore:
+    return PseudonymStore(session_factory=session_factory)
+
+
+def test_same_value_gets_same_pseudonym(store: PseudonymStore) -> None:
+    session = store.session()
+    assert session.pseudonym("PERSON", "Jan Jansen") == "PERSON_1"
+    assert session.pseudonym("PERSON", "Piet") == "PERSON_2"
+    assert session.pseudonym("PERSON", "jan  jansen") == "PERSON_1"
+    assert session.pseudonym("LOCATION", "Utrecht") == "LOCATION_1"
+    assert len(session) == 3
+
+
+def test_pseudonyms_are_consistent_across_texts_in_a_session(
+    store: PseudonymStore,
+) -> None:
+    session = store.session()
+    first = anonymize_text(
+        "Jan belt Piet.",
+        [
+            {"entity_type": "PERSON", "start": 0, "end": 3},
+            {"entity_type": "PERSON", "start": 9, "end": 13},
+        ],
+        "pseudonymize",
+        session=session,
+    )
+    second = anonymize_text(
+        "Piet antwoordt.",
+        [{"entity_type": "PERSON", "start": 0, "end": 4}],
+        "pseudonymize",
+        session=store.session(session.session_id),
+    )
+    assert first == "<PERSON_1> belt <PERSON_2>."
+    assert second == "<PERSON_2> antwoordt."
+
+
+def test_sessions_are_shared_between_workers(session_factory: SessionFactory) -> None:
+    # Twee stores op dezelfde database, zoals twee workers
+    worker_a = PseudonymStore(session_factory=session_factory)
+    worker_b = PseudonymStore(session_factory=session_factory)
+    session_id = worker_a.session().session_id
+    assert worker_a.pseudonym(session_id, "PERSON", "Jan") == "PERSON_1"
+    assert worker_b.pseudonym(session_id, "PERSON", "Piet") == "PERSON_2"
+    assert worker_b.pseudonym(session_id, "PERSON", "JAN") == "PERSON_1"
+
+
+def test_values_are_not_stored_in_plain_text(
+    store: PseudonymStore, session_factory: SessionFactory
+) -> None:
+    store.session().pseudonym("PERSON", "Jan Jansen")
+    with session_factory() as db:
+        dump = "\n".join(db.connection().connection.iterdump())
+    assert "jan jansen" not in dump.lower()
+
+
+def test_unknown_session_is_rejected(store: PseudonymStore) -> None:
+    with pytest.raises(UnknownSessionError):
+        store.session("door-de-client-verzonnen")
+    assert len(store) == 0
+    # Door de server gekozen ids (zoals het document-id) mogen wel nieuw zijn
+    assert store.session("document-id", create=True).session_id == "document-id"
+
+
+def test_store_evicts_least_recently_used_session(
+    session_factory: SessionFactory,
+) -> None:
+    store = PseudonymStore(
+        max_sessions=2, ttl_seconds=0, session_factory=session_factory
+    )
+    a = store.session().session_id
+    b = store.session().session_id
+    store.pseudonym(a, "PERSON", "Jan")
+    store.session()
+    assert len(store) == 3  # opruimen gebeurt niet per verzoek
+    store.evict()
+    assert len(store) == 2
+    assert store.drop(b) is False
+    assert store.pseudonym(a, "PERSON", "Jan") == "PERSON_1"
+
+
+def test_store_expires_idle_sessions(session_factory: SessionFactory) -> None:
+    store = PseudonymStore(
+        max_sessions=10, ttl_seconds=0.05, session_factory=session_factory
+    )
+    session_id = store.session().session_id
+    store.pseudonym(session_id, "PERSON", "Jan")
+    time.sleep(0.1)
+    # Al vervallen, ook voordat de reaper de sessie verwijderd heeft
+    with pytest.raises(UnknownSessionError):
+        store.session(session_id)
+    store.session()
+    store.evict()
+    assert len(store) == 1
+
+
+def test_session_without_id_gets_generated_id(store: PseudonymStore) -> None:
+    assert store.session().session_id != store.session().session_id
+
+
+def test_api_rejects_unknown_session_before_analysis() -> None:
+    resp = TestClient(app).post(
+        "/api/v1/anonymize",
+        json={
+            "text": "Jan Jansen",
+            "anonymization_strategy": "pseudonymize",
+            "session_id": "onbekend",
+        },
+    )
+    assert resp.status_code == 404, resp.text
+
+
+def test_pdf_uses_value_masks(tmp_path: Path) -> None:
+    source = tmp_path / "in.pdf"
+    target = tmp_path / "out.pdf"
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), "Jan Jansen en Piet Pietersen")
+    doc.save(str(source))
+    doc.close()
+
+    occurrences = anonymize_pdf(
+        str(source),
+        str(target),
+        {"Jan Jansen": "person", "Piet Pietersen": "person"},
+        "key",
+        value_masks={"Jan Jansen": "[PERSON_1]", "Piet Pietersen": "[PERSON_2]"},
+    )
+    assert [o["entity_mask"] for o in occurrences] == ["[PERSON_1]", "[PERSON_2]"]
+
+
+def test_text_found_as_two_types_gets_one_deterministic_type() -> None:
+    entities = [
+        {"entity_type": "LOCATION", "text": "Jansen"},
+        {"entity_type": "PERSON", "text": "Jansen"},
+        {"entity_type": "LOCATION", "text": "Utrecht"},
+    ]
+    expected = {"Jansen": "PERSON", "Utrecht": "LOCATION"}
+    assert entity_type_per_text(entities) == expected
+    assert entity_type_per_text(entities[::-1]) == expected
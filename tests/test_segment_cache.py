@@ -0,0 +1,137 @@
+import re
+from typing import List, Optional
+
+import pytest
+from presidio_analyzer import RecognizerResult
+
+from src.api.config import settings
+from src.api.services import text_analyzer
+from src.api.services.text_analyzer import ModularTextAnalyzer
+from src.api.utils.metrics import metrics
+from src.api.utils.nlp.base import NLPEngine
+from src.api.utils.nlp.segment_cache import segment_cache, split_segments
+
+BOILERPLATE = (
+    "Geachte heer of mevrouw,\n\n"
+    "Hierbij ontvangt u het besluit op uw aanvraag. Tegen dit besluit kunt u "
+    "binnen zes weken bezwaar maken bij de gemeente Utrecht.\n\n"
+)
+
+
+class CountingEngine(NLPEngine):
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+
+    def analyze(
+        self, text: str, entities: Optional[List] = None, language: str = "nl"
+    ) -> list:
+        self.texts.append(text)
+        return [
+            {
+                "entity_type": "PERSON" if m.group() != "Utrecht" else "LOCATION",
+                "start": m.start(),
+                "end": m.end(),
+                "score": 0.85,
+                "text": m.group(),
+            }
+            for m in re.finditer(r"Jan Jansen|Piet de Vries|Utrecht", text)
+        ]
+
+
+class PatternAnalyzer:
+    """Vindt een zaaknummer dat over een alineagrens loopt."""
+
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+
+    def analyze(self, text: str, entities: None, language: str) -> list:
+        self.texts.append(text)
+        m = re.search(r"Z-\d+\n\n\d+", text)
+        return [RecognizerResult("CASE_NUMBER", m.start(), m.end(), 0.9)] if m else []
+
+
+@pytest.fixture
+def engine(monkeypatch: pytest.MonkeyPatch) -> CountingEngine:
+    fake = CountingEngine()
+
+    class FakeModelManager:
+        def get(self, nlp_engine: str, model_name: str) -> NLPEngine:
+            return fake
+
+    monkeypatch.setattr(text_analyzer, "model_manager", FakeModelManager())
+    monkeypatch.setattr(settings, "INFERENCE_MAX_BATCH_SIZE", 1)
+    monkeypatch.setattr(segment_cache, "max_entries", 1000)  # standaard uit
+    metrics.reset()
+    segment_cache.clear()
+    return fake
+
+
+@pytest.fixture
+def analyzer(engine: CountingEngine) -> ModularTextAnalyzer:
+    instance = ModularTextAnalyzer.__new__(ModularTextAnalyzer)
+    instance.engine_type = "fake"
+    instance.model_name = "fake"
+    instance.analyzer = PatternAnalyzer()  # type: ignore[assignment]
+    return instance
+
+
+def test_split_segments_at_paragraphs_and_long_sentences() -> None:
+    text = "  Eerste alinea.\n\n\n Tweede. Nog een zin!\n \nDerde"
+    assert [text[s:e] for s, e in split_segments(text, 0)] == [
+        "Eerste alinea.",
+        "Tweede. Nog een zin!",
+        "Derde",
+    ]
+    assert [text[s:e] for s, e in split_segments(text, 10)] == [
+        "Eerste alinea.",  # langer, maar één zin
+        "Tweede.",
+        "Nog een zin!",
+        "Derde",
+    ]
+    assert split_segments(" \n\n ", 10) == []
+
+
+def test_only_new_paragraphs_are_analyzed(
+    analyzer: ModularTextAnalyzer, engine: CountingEngine
+) -> None:
+    first = BOILERPLATE + "Met vriendelijke groet,\nJan Jansen"
+    second = BOILERPLATE + "Met vriendelijke groet,\nPiet de Vries"
+
+    analyzer.analyze_text(first, entities=None, priority="bulk")
+    engine.texts.clear()
+    results = analyzer.analyze_text(second, entities=None, priority="bulk")
+
+    assert engine.texts == ["Met vriendelijke groet,\nPiet de Vries"]
+    # Offsets in de volledige tekst, ook voor de resultaten uit de cache
+    assert {(r["text"], second[r["start"] : r["end"]]) for r in results} == {
+        ("Utrecht", "Utrecht"),
+        ("Piet de Vries", "Piet de Vries"),
+    }
+    counters = metrics.snapshot()["counters"]
+    assert counters["analysis_segment_cache_total{result=hit}"] == 2
+    assert counters["analysis_segment_cache_total{result=miss}"] == 4
+    assert metrics.snapshot()["gauges"][
+        "analysis_segment_cache_hit_rate"
+    ] == pytest.approx(2 / 6, abs=1e-3)
+
+
+def test_patterns_see_the_full_text(analyzer: ModularTextAnalyzer) -> None:
+    text = "Zaak Z-2024\n\n0042 van Jan Jansen"
+    results = analyzer.analyze_text(text, entities=None, priority="bulk")
+
+    assert analyzer.analyzer.texts == [text]  # type: ignore[attr-defined]
+    assert {r["entity_type"]: r["text"] for r in results} == {
+        "CASE_NUMBER": "Z-2024\n\n0042",
+        "PERSON": "Jan Jansen",
+    }
+
+
+def test_cache_off_analyzes_full_text(
+    analyzer: ModularTextAnalyzer,
+    engine: CountingEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(segment_cache, "max_entries", 0)
+    analyzer.analyze_text(BOILERPLATE, entities=None, priority="bulk")
+    analyzer.analyze_text(BOILERPLATE, entities=None, priority="bulk")
+    assert engine.texts == [BOILERPLATE, BOILERPLATE]
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+import spacy
+
+from src.api.utils.nlp.spacy_engine import (
+    excluded_components,
+    load_spacy_pipeline,
+)
+
+
+@pytest.fixture
+def model_path(tmp_path: Path) -> str:
+    """Klein Nederlands model met dezelfde componentnamen als nl_core_news."""
+    nlp = spacy.blank("nl")
+    nlp.add_pipe("sentencizer", name="senter")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns([{"label": "PER", "pattern": "Jan Jansen"}])
+    nlp.to_disk(tmp_path / "model")
+    return str(tmp_path / "model")
+
+
+def test_full_profile_excludes_nothing() -> None:
+    assert excluded_components("full") == []
+
+
+def test_ner_only_keeps_only_ner() -> None:
+    excluded = excluded_components("ner-only")
+    assert "ner" not in excluded
+    assert {"tok2vec", "parser", "lemmatizer", "morphologizer"} <= set(excluded)
+
+
+def test_ner_lemma_keeps_lemmatizer_dependencies() -> None:
+    assert set(excluded_components("ner+lemma")) == {"parser", "senter"}
+
+
+def test_unknown_profile_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        excluded_components("ner+parser")
+
+
+def test_profile_gives_same_entities_with_fewer_components(model_path: str) -> None:
+    full = load_spacy_pipeline(model_path, "full")
+    trimmed = load_spacy_pipeline(model_path, "ner-only")
+    assert full.pipe_names == ["senter", "ner"]
+    assert trimmed.pipe_names == ["ner"]
+
+    text = "Jan Jansen woont in Utrecht."
+    assert [e.text for e in trimmed(text).ents] == [e.text for e in full(text).ents]
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from src.api.utils.spans import merge_spans
+
+
+def span(start: int, end: int, entity_type: str, score: object = 0.5) -> dict:
+    return {"entity_type": entity_type, "start": start, "end": end, "score": score}
+
+
+def assert_no_overlap(results: list[dict]) -> None:
+    for previous, current in zip(results, results[1:]):
+        assert previous["end"] <= current["start"]
+
+
+def test_exact_duplicates_are_removed() -> None:
+    results = [span(0, 10, "DATE_TIME"), span(0, 10, "DATE_TIME")]
+    assert merge_spans(results, policy="score") == [span(0, 10, "DATE_TIME")]
+
+
+def test_same_date_from_two_patterns_keeps_one() -> None:
+    results = [span(5, 15, "DATE_TIME", 0.6), span(5, 15, "DATE_TIME", 0.5)]
+    assert merge_spans(results, policy="score") == [span(5, 15, "DATE_TIME", 0.6)]
+
+
+def test_nested_ner_hit_loses_to_pattern_by_priority() -> None:
+    results = [span(10, 14, "PERSON", ""), span(0, 30, "EMAIL", 1.0)]
+    merged = merge_spans(results, policy="priority", type_priority=["EMAIL", "PERSON"])
+    assert merged == [span(0, 30, "EMAIL", 1.0)]
+
+
+def test_length_policy_prefers_longest_span() -> None:
+    results = [span(0, 4, "PERSON", 0.9), span(0, 12, "PERSON", 0.4)]
+    assert merge_spans(results, policy="length") == [span(0, 12, "PERSON", 0.4)]
+
+
+def test_score_policy_treats_missing_scores_as_zero() -> None:
+    results = [span(0, 12, "PERSON", ""), span(5, 9, "LOCATION", 0.3)]
+    assert merge_spans(results, policy="score") == [span(5, 9, "LOCATION", 0.3)]
+
+
+def test_non_overlapping_spans_are_kept_in_order() -> None:
+    results = [span(20, 25, "IBAN"), span(0, 5, "PERSON"), span(5, 10, "EMAIL")]
+    assert [r["start"] for r in merge_spans(results)] == [0, 5, 20]
+
+
+def test_unknown_policy_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        merge_spans([span(0, 1, "PERSON")], policy="first")
+
+
+@pytest.mark.parametrize("policy", ["score", "length", "priority"])
+def test_random_input_never_overlaps(policy: str) -> None:
+    rng = random.Random(42)
+    results = []
+    for _ in range(500):
+        start = rng.randrange(0, 1000)
+        results.append(
+            span(start, start + rng.randrange(1, 30), rng.choice(["PERSON", "EMAIL"]))
+        )
+    merged = merge_spans(results, policy=policy)
+    assert merged
+    assert_no_overlap(merged)
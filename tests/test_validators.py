@@ -0,0 +1,84 @@
+import pytest
+
+from src.api.config import settings
+from src.api.utils.patterns import (
+    DutchBSNRecognizer,
+    DutchIBANRecognizer,
+    DutchPhoneNumberRecognizer,
+)
+from src.api.utils.validators import (
+    is_valid_bsn,
+    is_valid_iban,
+    is_valid_nl_phone,
+    is_valid_nl_vat,
+)
+
+
+@pytest.mark.parametrize(
+    "value, valid",
+    [
+        ("123456782", True),
+        ("123-456-782", True),
+        ("111222333", True),
+        ("123456789", False),
+        ("000000000", False),
+        ("12345678", False),
+    ],
+)
+def test_bsn_eleven_proof(value: str, valid: bool) -> None:
+    assert is_valid_bsn(value) is valid
+
+
+@pytest.mark.parametrize(
+    "value, valid",
+    [
+        ("NL91ABNA0417164300", True),
+        ("NL91 ABNA 0417 1643 00", True),
+        ("BE68539007547034", True),
+        ("NL91ABNA0417164301", False),
+        ("NL91ABNA041716430", False),
+        ("XX00", False),
+    ],
+)
+def test_iban_mod_97(value: str, valid: bool) -> None:
+    assert is_valid_iban(value) is valid
+
+
+def test_vat_number() -> None:
+    assert is_valid_nl_vat("NL000099998B57")
+    assert not is_valid_nl_vat("NL000099998B58")
+
+
+@pytest.mark.parametrize(
+    "value, valid",
+    [
+        ("0612345678", True),
+        ("+31 6 12345678", True),
+        ("0031-20-1234567", True),
+        ("0012345678", False),
+    ],
+)
+def test_phone_structure(value: str, valid: bool) -> None:
+    assert is_valid_nl_phone(value) is valid
+
+
+def test_invalid_bsn_is_dropped_and_valid_bsn_boosted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CHECKSUM_INVALID_ACTION", "drop")
+    text = "BSN 123456782 en 123456789"
+    results = DutchBSNRecognizer().analyze(text, ["BSN"])
+    assert [(text[r.start : r.end], r.score) for r in results] == [("123456782", 1.0)]
+
+
+def test_invalid_iban_is_downscored(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECKSUM_INVALID_ACTION", "downscore")
+    monkeypatch.setattr(settings, "CHECKSUM_INVALID_SCORE", 0.1)
+    text = "IBAN NL91ABNA0417164301"
+    results = DutchIBANRecognizer().analyze(text, ["IBAN"])
+    assert results and all(r.score == 0.1 for r in results)
+
+
+def test_valid_phone_keeps_its_pattern_score() -> None:
+    results = DutchPhoneNumberRecognizer().analyze("bel 0612345678", ["PHONE_NUMBER"])
+    assert [r.score for r in results] == [0.6]